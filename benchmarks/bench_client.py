@@ -0,0 +1,293 @@
+# bench_client.py
+# @author:  DonnC <https://github.com/DonnC>
+# @created: Oct 2026
+#
+# per call client overhead of every endpoint, against the in-process FakeHotServer
+#
+#   python benchmarks/bench_client.py --output results.json
+#   python benchmarks/bench_client.py --quick
+#
+# results are json so runs can be compared between releases
+
+import argparse
+import asyncio
+import json
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+
+import hotrecharge
+from hotrecharge.HRCodec import defaultCodec
+from hotrecharge.HotRechargeExcHandler import ApiExceptionHandler
+
+CONFIG = hotrecharge.HRAuthConfig(access_code="bench", access_password="bench", reference="bench")
+
+METER = "37132268561"
+NUMBER = "0771111111"
+
+
+def summarise(samples: list) -> dict:
+    samples = sorted(samples)
+    pick = lambda q: samples[min(len(samples) - 1, int(q * len(samples)))]
+
+    return {
+        "n": len(samples),
+        "mean_us": round(statistics.fmean(samples) * 1e6, 2),
+        "p50_us": round(pick(0.50) * 1e6, 2),
+        "p95_us": round(pick(0.95) * 1e6, 2),
+        "p99_us": round(pick(0.99) * 1e6, 2),
+    }
+
+
+def timed(fn, iterations: int) -> list:
+    samples = []
+
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+
+    return samples
+
+
+def endpointCalls(api, state: dict) -> dict:
+    # endpoint method name -> zero argument call
+    return {
+        "walletBalance": lambda: api.walletBalance(),
+        "zesaWalletBalance": lambda: api.zesaWalletBalance(),
+        "getDataBundles": lambda: api.getDataBundles(),
+        "getEVDs": lambda: api.getEVDs(),
+        "rechargePinless": lambda: api.rechargePinless(amount=1, number=NUMBER),
+        "dataBundleRecharge": lambda: api.dataBundleRecharge(product_code="DWB15", number=NUMBER),
+        "rechargeEVD": lambda: api.rechargeEVD(brand_id=24, pin_value=0.5, number=NUMBER),
+        "rechargeZesa": lambda: api.rechargeZesa(amount=50, notify_contact=NUMBER, meter_number=METER),
+        "checkZesaCustomer": lambda: api.checkZesaCustomer(METER, use_cache=False),
+        "queryTransactionReference": lambda: api.queryTransactionReference(state["reference"]),
+        "queryZesaTransaction": lambda: api.queryZesaTransaction(state["recharge_id"]),
+    }
+
+
+def seedState(api) -> dict:
+    # a known agent reference and zesa recharge id for the query endpoints
+    recharge = api.rechargePinless(amount=1, number=NUMBER)
+    zesa = api.rechargeZesa(amount=50, notify_contact=NUMBER, meter_number=METER)
+
+    return {"reference": recharge["AgentReference"], "recharge_id": zesa["RechargeID"]}
+
+
+def benchLatency(server, iterations: int, return_model) -> list:
+    """
+    single call latency of every endpoint, one client, one thread
+    """
+    results = []
+
+    with hotrecharge.HotRecharge(CONFIG, base_url=server.url, return_model=return_model) as api:
+        calls = endpointCalls(api, seedState(api))
+
+        for name, call in calls.items():
+            # warm the connection pool and caches
+            for _ in range(min(20, iterations)):
+                call()
+
+            results.append({"bench": "latency", "endpoint": name, "return_model": return_model, **summarise(timed(call, iterations))})
+
+    return results
+
+
+def benchOverhead(server, iterations: int) -> list:
+    """
+    client side cost without the network: headers, payload encoding, response decoding and processing
+    """
+    results = []
+    api = hotrecharge.HotRecharge(CONFIG, base_url=server.url)
+    bundles = server.bundles
+
+    payload = {"amount": 1, "targetMobile": NUMBER, "CustomerSMS": "%AMOUNT% recharged"}
+    success = {"ReplyCode": 2, "ReplyMsg": "ok", "AgentReference": "x", "WalletBalance": 100.0, "Amount": 1}
+    error = {"ReplyCode": 208, "ReplyMsg": "Insufficient balance", "AgentReference": "x"}
+    bundles_body = api.codec.dumps({"ReplyCode": 2, "AgentReference": "x", "Bundles": bundles})
+    success_body = api.codec.dumps(success)
+
+    def processError():
+        try:
+            api._processResponse(200, dict(error), api._RECHARGE_PINLESS)
+
+        except hotrecharge.HotRechargeException:
+            pass
+
+    steps = {
+        "requestHeaders": lambda: api._requestHeaders(),
+        "dumpsPayload": lambda: api.codec.dumps(payload),
+        "loadsRecharge": lambda: api.codec.loads(success_body),
+        "loadsBundles": lambda: api.codec.loads(bundles_body),
+        "processSuccess": lambda: api._processResponse(200, dict(success), api._RECHARGE_PINLESS),
+        "processError": processError,
+        "classifyError": lambda: ApiExceptionHandler.classify(error, 200),
+    }
+
+    for name, step in steps.items():
+        results.append({"bench": "overhead", "step": name, "codec": api.codec.name, **summarise(timed(step, iterations))})
+
+    api.close()
+
+    return results
+
+
+def benchThreads(server, requests: int, threads: int) -> dict:
+    """
+    sustained throughput of one shared client under a thread pool
+    """
+    with hotrecharge.HotRecharge(CONFIG, base_url=server.url, pool_maxsize=threads) as api:
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            start = time.perf_counter()
+            list(pool.map(lambda _: api.walletBalance(), range(requests)))
+            elapsed = time.perf_counter() - start
+
+    return {"bench": "throughput", "mode": "threads", "workers": threads, "requests": requests,
+            "seconds": round(elapsed, 4), "rps": round(requests / elapsed, 1)}
+
+
+def benchAsyncio(server, requests: int, concurrency: int) -> dict:
+    """
+    sustained throughput of one `AsyncHotRecharge` client with bounded concurrency
+    """
+    async def run():
+        async with hotrecharge.AsyncHotRecharge(CONFIG, base_url=server.url) as api:
+            slots = asyncio.Semaphore(concurrency)
+
+            async def call():
+                async with slots:
+                    await api.walletBalance()
+
+            start = time.perf_counter()
+            await asyncio.gather(*(call() for _ in range(requests)))
+            return time.perf_counter() - start
+
+    elapsed = asyncio.run(run())
+
+    return {"bench": "throughput", "mode": "asyncio", "workers": concurrency, "requests": requests,
+            "seconds": round(elapsed, 4), "rps": round(requests / elapsed, 1)}
+
+
+def benchMemory(bundle_count: int) -> list:
+    """
+    memory held per `getDataBundles` response in each `return_model` mode
+    """
+    bundles = [
+        {"BundleId": i, "BrandId": 18 + i % 3, "Network": ["Econet", "NetOne", "Telecel"][i % 3],
+         "ProductCode": f"B{i}", "Amount": round(0.5 + i % 50, 2), "Name": f"Bundle {i}",
+         "Description": f"{i % 10 + 1}GB bundle", "Validity": 7 + i % 24}
+        for i in range(bundle_count)
+    ]
+    results = []
+
+    with hotrecharge.FakeHotServer(bundles=bundles) as server:
+        for return_model in (False, True, "typed"):
+            with hotrecharge.HotRecharge(CONFIG, base_url=server.url, return_model=return_model) as api:
+                api.getDataBundles()
+
+                tracemalloc.start()
+                before = tracemalloc.take_snapshot()
+                response = api.getDataBundles()
+
+                if return_model == "typed":
+                    # typed models wrap nested bundles on first access
+                    response.Bundles
+
+                after = tracemalloc.take_snapshot()
+                tracemalloc.stop()
+
+                held = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+                results.append({"bench": "memory", "endpoint": "getDataBundles", "bundles": bundle_count,
+                                "return_model": return_model, "bytes": held,
+                                "bytes_per_bundle": round(held / bundle_count, 1)})
+
+                del response
+
+    return results
+
+
+def benchErrors(iterations: int) -> list:
+    """
+    end to end cost of api errors against successes
+    """
+    results = []
+
+    with hotrecharge.FakeHotServer(errors={"walletBalance": {208: 1.0}}) as server:
+        with hotrecharge.HotRecharge(CONFIG, base_url=server.url) as api:
+            def failing():
+                try:
+                    api.walletBalance()
+
+                except hotrecharge.InsufficientBalance:
+                    pass
+
+            timed(failing, min(20, iterations))
+            results.append({"bench": "errors", "endpoint": "walletBalance", "reply_code": 208, **summarise(timed(failing, iterations))})
+
+            timed(api.zesaWalletBalance, min(20, iterations))
+            results.append({"bench": "errors", "endpoint": "zesaWalletBalance", "reply_code": 2, **summarise(timed(api.zesaWalletBalance, iterations))})
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="hot-recharge client benchmarks")
+    parser.add_argument("--iterations", type=int, default=500, help="calls per latency / overhead sample")
+    parser.add_argument("--requests", type=int, default=2000, help="calls per throughput run")
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--bundles", type=int, default=5000, help="bundles in the memory benchmark response")
+    parser.add_argument("--quick", action="store_true", help="small run for a smoke check")
+    parser.add_argument("--output", help="write results to this json file instead of stdout")
+    args = parser.parse_args()
+
+    if args.quick:
+        args.iterations, args.requests, args.bundles = 50, 200, 500
+
+    results = []
+
+    with hotrecharge.FakeHotServer(wallet=1e9, zesa_wallet=1e9, stock={(24, 0.5): 10 ** 9}) as server:
+        results += benchOverhead(server, args.iterations * 10)
+
+        for return_model in (False, True, "typed"):
+            results += benchLatency(server, args.iterations, return_model)
+
+        results.append(benchThreads(server, args.requests, args.threads))
+
+        try:
+            results.append(benchAsyncio(server, args.requests, args.concurrency))
+
+        except ImportError as err:
+            results.append({"bench": "throughput", "mode": "asyncio", "skipped": str(err)})
+
+    results += benchMemory(args.bundles)
+    results += benchErrors(args.iterations)
+
+    report = {
+        "meta": {
+            "hotrecharge": hotrecharge.__version__,
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "codec": defaultCodec().name,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "args": vars(args),
+        },
+        "results": results,
+    }
+
+    if args.output:
+        with open(args.output, "w") as fh:
+            json.dump(report, fh, indent=2)
+
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+
+if __name__ == "__main__":
+    main()
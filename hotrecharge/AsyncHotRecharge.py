@@ -0,0 +1,492 @@
+"""
+    @author:    DonnC <https://github.com/DonnC>
+    @created:   Oct 2026
+
+    HotRecharge asyncio api class
+"""
+
+import asyncio
+import time
+from munch import Munch
+
+try:
+    import aiohttp
+except ImportError:  # pragma: no cover - optional dependency
+    aiohttp = None
+
+from .HRConfig import HRAuthConfig
+from .HotRechargeBase import HotRechargeBase
+from .HRReference import ReferenceGenerator
+from .HRBulk import asyncBulkRecharge
+from .HRCatalog import BundleCatalog
+from .HRBalance import CachedBalance
+from .HRSingleFlight import AsyncSingleFlight
+from .HRCache import LRUTTLCache
+from .HRCodec import JsonCodec
+from .HRRateLimiter import RateLimiter
+from .HRRetry import RetryPolicy
+from .HRMetrics import ClientMetrics
+from .HRHooks import RequestHooks
+from .HRJournal import TransactionJournal
+from .HRIdempotency import IdempotencyGuard
+from .HotRechargeException import DuplicateReference, RequestTimeout, TransactionNotFound, TransactionStateUnknown
+
+
+class AsyncHotRecharge(HotRechargeBase):
+    """
+    Hot Recharge Python Api Library, asyncio flavour
+
+    same endpoints, auth config, `return_model` and api exceptions as `HotRecharge`
+    but every endpoint is a coroutine sharing one async connection pool
+
+    >>> async with hotrecharge.AsyncHotRecharge(config) as api:
+            balance = await api.walletBalance()
+
+    needs the optional `aiohttp` dependency
+
+    >>> pip install hot-recharge[async]
+    """
+
+    def __init__(
+        self,
+        config: HRAuthConfig,
+        use_random_ref: bool = True,
+        return_model: bool = False,
+        reference_generator: ReferenceGenerator = None,
+        balance_max_age: float = 60,
+        coalesce_reads: bool = False,
+        codec: JsonCodec = None,
+        rate_limiter: RateLimiter = None,
+        retry_policy: RetryPolicy = None,
+        connect_timeout: float = 10,
+        read_timeout: float = 30,
+        base_url: str = None,
+        metrics: ClientMetrics = None,
+        hooks: RequestHooks = None,
+        journal: TransactionJournal = None,
+        idempotency: IdempotencyGuard = None,
+        pool_maxsize: int = 100,
+        pool_maxsize_per_host: int = 0,
+        zesa_customer_cache: LRUTTLCache = None,
+    ):
+        """[AsyncHotRecharge]
+
+        Args:
+            `config` (HRAuthConfig): config class object to hold auth credentials
+            `use_random_ref` (bool, optional): see `HotRecharge`. Defaults to True.
+            `return_model` (bool, optional): see `HotRecharge`. Defaults to False.
+            `reference_generator` (ReferenceGenerator, optional): see `HotRecharge`.
+            `balance_max_age` (float, optional): see `HotRecharge`. Defaults to 60.
+            `coalesce_reads` (bool, optional): see `HotRecharge`. Defaults to False.
+            `codec` (JsonCodec, optional): see `HotRecharge`.
+            `rate_limiter` (RateLimiter, optional): see `HotRecharge`, calls wait with `asyncio.sleep`.
+            `retry_policy` (RetryPolicy, optional): see `HotRecharge`, backoffs wait with `asyncio.sleep`.
+            `connect_timeout` (float, optional): see `HotRecharge`. Defaults to 10.
+            `read_timeout` (float, optional): see `HotRecharge`. Defaults to 30.
+            `base_url` (str, optional): see `HotRecharge`.
+            `metrics` (ClientMetrics, optional): see `HotRecharge`.
+            `hooks` (RequestHooks, optional): see `HotRecharge`, hooks run on the event loop.
+            `journal` (TransactionJournal, optional): see `HotRecharge`, recover with `journal.recoverAsync(api)`.
+            `idempotency` (IdempotencyGuard, optional): see `HotRecharge`.
+            `pool_maxsize` (int, optional): max number of simultaneous connections in the pool. Defaults to 100.
+            `pool_maxsize_per_host` (int, optional): max number of simultaneous connections per host,
+                0 -> no per host limit. Defaults to 0.
+            `zesa_customer_cache` (LRUTTLCache, optional): see `HotRecharge`. Defaults to None.
+        """
+        if aiohttp is None:
+            raise ImportError("AsyncHotRecharge requires `aiohttp`, install it with `pip install hot-recharge[async]`")
+
+        super().__init__(
+            config,
+            use_random_ref=use_random_ref,
+            return_model=return_model,
+            reference_generator=reference_generator,
+            balance_max_age=balance_max_age,
+            coalesce_reads=coalesce_reads,
+            codec=codec,
+            rate_limiter=rate_limiter,
+            retry_policy=retry_policy,
+            connect_timeout=connect_timeout,
+            read_timeout=read_timeout,
+            base_url=base_url,
+            metrics=metrics,
+            hooks=hooks,
+            journal=journal,
+            idempotency=idempotency,
+        )
+        self.__pool_maxsize = pool_maxsize
+        self.__pool_maxsize_per_host = pool_maxsize_per_host
+        self.__session = None
+        self.__flights = AsyncSingleFlight()
+        self.__zesa_customer_cache = zesa_customer_cache
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    async def close(self) -> None:
+        """
+        close the underlying http session and release all pooled connections
+        :return: None
+        """
+        if self.__session is not None:
+            await self.__session.close()
+            self.__session = None
+
+    def __getSession(self):
+        # aiohttp sessions must be created inside a running event loop
+        if self.__session is None or self.__session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.__pool_maxsize,
+                limit_per_host=self.__pool_maxsize_per_host,
+            )
+
+            self.__session = aiohttp.ClientSession(connector=connector)
+
+        return self.__session
+
+    # surfaced as `RequestTimeout`
+    __TIMEOUT_ERRORS = (asyncio.TimeoutError,)
+
+    # request never reached the api, safe to resend
+    __NOT_SENT_ERRORS = (aiohttp.ClientConnectorError,) if aiohttp else ()
+
+    # request may or may not have been processed by the api
+    __AMBIGUOUS_ERRORS = (aiohttp.ClientError, asyncio.TimeoutError, ValueError) if aiohttp else ()
+
+    async def __request(
+        self, method: str, endpoint: str, payload: dict = None, reference: str = None, order_key: str = None
+    ) -> dict or Munch:
+        try:
+            return await self.__dispatch(method, endpoint, payload, reference, order_key)
+
+        except self.__TIMEOUT_ERRORS as err:
+            raise RequestTimeout(f"{self._endpointName(endpoint)} timed out: {err}") from err
+
+    async def __dispatch(
+        self, method: str, endpoint: str, payload: dict = None, reference: str = None, order_key: str = None
+    ) -> dict or Munch:
+        if not self._isRead(method, endpoint):
+            if order_key is not None:
+                return await self.__writeOnce(method, endpoint, payload, reference, order_key)
+
+            return await self.__write(method, endpoint, payload, reference)
+
+        if self.coalesce_reads and reference is None:
+            return await self.__flights.do(
+                self._flightKey(method, endpoint, payload),
+                lambda: self.__read(method, endpoint, payload),
+            )
+
+        return await self.__read(method, endpoint, payload, reference)
+
+    async def __read(self, method: str, endpoint: str, payload: dict = None, reference: str = None) -> dict or Munch:
+        # reads are safe to resend, each retry gets a fresh reference
+        attempts = self.retry_policy.attempts(True) if self.retry_policy else 1
+
+        for attempt in range(1, attempts + 1):
+            try:
+                return await self.__send(method, endpoint, payload, reference if attempt == 1 else None)
+
+            except self.__AMBIGUOUS_ERRORS as err:
+                if attempt == attempts:
+                    raise
+
+                error = err
+
+            await self.__backoff(endpoint, attempt, error)
+
+    async def __writeOnce(self, method: str, endpoint: str, payload: dict, reference: str, order_key: str) -> dict or Munch:
+        # one recharge per order key, see `IdempotencyGuard`
+        if self.idempotency is None:
+            raise ValueError("order_key needs a client created with an `idempotency` guard")
+
+        async def send(reference: str, resend: bool):
+            if resend:
+                # an earlier attempt of this order may have gone through
+                response = await self.__reconcile(endpoint, reference)
+
+                if response is not None:
+                    return response
+
+            return await self.__write(method, endpoint, payload, reference)
+
+        return await self.idempotency.doAsync(
+            order_key,
+            send,
+            self._resolveReference(reference),
+            self._orderFingerprint(endpoint, payload),
+            lambda data: self._wrapResponse(endpoint, data),
+        )
+
+    async def __write(self, method: str, endpoint: str, payload: dict = None, reference: str = None) -> dict or Munch:
+        # a journaled recharge is recorded before it is sent and its outcome after
+        if self.journal is None:
+            return await self.__attempts(method, endpoint, payload, reference)
+
+        reference = self._resolveReference(reference)
+        self.journal.started(endpoint, reference, payload)
+
+        try:
+            response = await self.__attempts(method, endpoint, payload, reference)
+
+        except Exception as err:
+            self._journalFinished(reference, error=err, sent=not isinstance(err, self.__NOT_SENT_ERRORS))
+            raise
+
+        self._journalFinished(reference, response)
+
+        return response
+
+    async def __attempts(self, method: str, endpoint: str, payload: dict = None, reference: str = None) -> dict or Munch:
+        # recharges keep one reference across attempts, see `HotRecharge`
+        if self.retry_policy is None:
+            return await self.__send(method, endpoint, payload, reference)
+
+        reference = self._resolveReference(reference)
+        attempts = self.retry_policy.attempts(False)
+
+        for attempt in range(1, attempts + 1):
+            try:
+                return await self.__send(method, endpoint, payload, reference)
+
+            except self.__NOT_SENT_ERRORS as err:
+                if attempt == attempts:
+                    raise
+
+                error = err
+
+            except self.__AMBIGUOUS_ERRORS + (DuplicateReference,) as err:
+                # a duplicate reference on a resend means an earlier attempt got through
+                if isinstance(err, DuplicateReference) and attempt == 1:
+                    raise
+
+                response = await self.__reconcile(endpoint, reference, err)
+
+                if response is not None:
+                    return response
+
+                if attempt == attempts:
+                    raise
+
+                error = err
+
+            await self.__backoff(endpoint, attempt, error, reference)
+
+    async def __backoff(self, endpoint: str, attempt: int, error: Exception, reference: str = None) -> None:
+        name = self._endpointName(endpoint)
+        self._retryStarted(name, attempt, error, reference)
+
+        try:
+            await self.retry_policy.sleepAsync(attempt, self._deadlineRemaining())
+
+        finally:
+            self._retryFinished(name)
+
+    async def __reconcile(self, endpoint: str, reference: str, error: Exception = None) -> dict or Munch or None:
+        # look up a recharge that failed mid-flight, None -> confirmed absent, safe to resend
+        try:
+            query = await self.queryTransactionReference(reference)
+
+        except TransactionNotFound:
+            return None
+
+        except Exception as err:
+            after = "" if error is None else f" after `{error}`"
+            raise TransactionStateUnknown(
+                f"state of transaction {reference} is unknown{after}, lookup failed: {err}",
+                reference=reference,
+            ) from error
+
+        return self._reconciledResponse(endpoint, query)
+
+    async def __send(self, method: str, endpoint: str, payload: dict = None, reference: str = None) -> dict or Munch:
+        # send request over the shared async pool and process api response
+        name = self._endpointName(endpoint)
+        connect, read, remaining = self._requestTimeout()
+
+        if self.rate_limiter is not None:
+            if await self.rate_limiter.acquireAsync(name, remaining):
+                # waited for a slot, less of the deadline is left
+                connect, read, remaining = self._requestTimeout()
+
+        url = f"{self.__base_url__}{endpoint}"
+
+        data = self.codec.dumps(payload) if payload is not None else None
+
+        headers = self._requestHeaders(reference)
+
+        # unlike `requests`, aiohttp can bound the whole call to the deadline
+        timeout = aiohttp.ClientTimeout(total=remaining, sock_connect=connect, sock_read=read)
+
+        sent_at = time.monotonic()
+        status_code = None
+        reply = None
+        call = self._callStarted(name, method, endpoint, headers["x-agent-reference"], data)
+
+        try:
+            async with self.__getSession().request(method, url, headers=headers, data=data, timeout=timeout) as resp:
+                status_code = resp.status
+                reply = self.codec.loads(await resp.read())
+
+                response = self._processResponse(resp.status, reply, endpoint, sent_at)
+
+        except Exception as err:
+            self._callFinished(call, status_code, reply, err)
+            raise
+
+        self._callFinished(call, status_code, reply)
+
+        return response
+
+    async def walletBalance(self) -> dict or Munch:
+        """
+        Get agent wallet balance, see `HotRecharge.walletBalance`
+        """
+        return await self.__request("GET", self._WALLET_BALANCE)
+
+    async def cachedBalance(self, zesa: bool = False, max_age: float = None) -> CachedBalance:
+        """
+        last known wallet balance, fetched only when older than `max_age`, see `HotRecharge.cachedBalance`
+        """
+        cached = self._cachedBalance(zesa, max_age)
+
+        if cached is None:
+            await (self.zesaWalletBalance() if zesa else self.walletBalance())
+            cached = self.balance_tracker.get(self.balance_tracker.ZESA if zesa else self.balance_tracker.AIRTIME)
+
+        return cached
+
+    async def queryTransactionReference(self, agent_reference) -> dict or Munch:
+        """
+        Query a transaction for reconciliation, see `HotRecharge.queryTransactionReference`
+        """
+        return await self.__request("GET", f"{self._QUERY_TRANSACTION}{agent_reference}")
+
+    async def rechargePinless(self, amount, number, brandID=None, mesg=None, reference=None, order_key=None) -> dict or Munch:
+        """
+        recharge airtime to `number`, see `HotRecharge.rechargePinless`
+        """
+        payload = dict()
+        payload["amount"] = amount
+
+        if brandID:
+            payload["BrandID"] = brandID
+
+        if mesg:
+            payload["CustomerSMS"] = mesg
+
+        payload["targetMobile"] = number
+
+        return await self.__request("POST", self._RECHARGE_PINLESS, payload, reference, order_key)
+
+    async def dataBundleRecharge(
+        self, product_code, number, amount=None, mesg=None, reference=None, catalog: BundleCatalog = None, order_key=None
+    ) -> dict or Munch:
+        """
+        recharge data bundles to `number`, see `HotRecharge.dataBundleRecharge`
+        """
+        if catalog is not None:
+            catalog.validate(product_code)
+
+        payload = dict()
+        payload["ProductCode"] = product_code
+
+        if amount:
+            payload["Amount"] = amount
+
+        if mesg:
+            payload["CustomerSMS"] = mesg
+
+        payload["TargetMobile"] = number
+
+        return await self.__request("POST", self._RECHARGE_DATA, payload, reference, order_key)
+
+    async def rechargeEVD(self, brand_id, pin_value, number, quantity=1, reference=None, order_key=None) -> dict or Munch:
+        """
+        recharge evd to `number`, see `HotRecharge.rechargeEVD`
+        """
+        payload = dict()
+        payload["BrandID"] = str(brand_id)
+        payload["Denomination"] = str(pin_value)
+        payload["Quantity"] = str(quantity)
+        payload["TargetNumber"] = number
+
+        return await self.__request("POST", self._RECHARGE_EVD, payload, reference, order_key)
+
+    async def getDataBundles(self) -> dict or Munch:
+        """
+        get available data bundles, see `HotRecharge.getDataBundles`
+        """
+        return await self.__request("GET", self._GET_DATA_BUNDLE)
+
+    async def getEVDs(self) -> dict or Munch:
+        """
+        query evds (electronic vouchers), see `HotRecharge.getEVDs`
+        """
+        return await self.__request("GET", self._QUERY_EVD)
+
+    async def rechargeZesa(self, amount, notify_contact, meter_number, mesg=None, reference=None, order_key=None) -> dict or Munch:
+        """
+        recharge zesa, see `HotRecharge.rechargeZesa`
+        """
+        payload = dict()
+        payload["Amount"] = amount
+        payload["meterNumber"] = meter_number
+
+        if mesg:
+            payload["CustomerSMS"] = mesg
+
+        payload["TargetNumber"] = notify_contact
+
+        return await self.__request("POST", self._RECHARGE_ZESA, payload, reference, order_key)
+
+    async def checkZesaCustomer(self, meter_number, use_cache: bool = True) -> dict or Munch:
+        """
+        check zesa customer before a zesa recharge, see `HotRecharge.checkZesaCustomer`
+        """
+        cache = self.__zesa_customer_cache if use_cache else None
+
+        if cache is not None:
+            cached = cache.get(str(meter_number))
+
+            if cached is not None:
+                return cached
+
+        payload = {
+            "MeterNumber": meter_number,
+        }
+
+        response = await self.__request("POST", self._ZESA_CUSTOMER, payload)
+
+        if self.__zesa_customer_cache is not None:
+            self.__zesa_customer_cache.set(str(meter_number), response)
+
+        return response
+
+    async def zesaWalletBalance(self) -> dict or Munch:
+        """
+        Get agent zesa wallet balance, see `HotRecharge.zesaWalletBalance`
+        """
+        return await self.__request("GET", self._ZESA_BALANCE)
+
+    async def queryZesaTransaction(self, recharge_id) -> dict or Munch:
+        """
+        Query a zesa transaction for reconciliation, see `HotRecharge.queryZesaTransaction`
+        """
+        payload = {"RechargeId": str(recharge_id)}
+
+        return await self.__request("POST", self._QUERY_ZESA, payload)
+
+    def bulkRecharge(self, orders, max_concurrency: int = 100, deadline: float = None):
+        """
+        recharge many orders concurrently, see `HotRecharge.bulkRecharge`
+
+        returns an async generator, `orders` can be a sync or async iterable
+
+        >>> async for result in api.bulkRecharge(orders, max_concurrency=200):
+                print(result)
+        """
+        return asyncBulkRecharge(self, orders, max_concurrency=max_concurrency, deadline=deadline)
@@ -0,0 +1,75 @@
+"""
+    @author:    DonnC <https://github.com/DonnC>
+    @created:   Oct 2026
+
+    passive wallet balance tracking from api responses
+"""
+
+import threading
+import time
+
+
+class CachedBalance:
+    """
+    last known wallet balance
+
+    `wallet`: `airtime` or `zesa`
+    `balance`: `WalletBalance` as returned by the api
+    `updated_at`: unix time the balance was received
+    `age`: seconds since the balance was received
+    """
+
+    __slots__ = ("wallet", "balance", "updated_at", "_sent_at", "_received_at")
+
+    def __init__(self, wallet: str, balance, sent_at: float):
+        self.wallet = wallet
+        self.balance = balance
+        self.updated_at = time.time()
+        self._sent_at = sent_at
+        self._received_at = time.monotonic()
+
+    @property
+    def age(self) -> float:
+        return time.monotonic() - self._received_at
+
+    def __repr__(self):
+        return f"<CachedBalance: {self.wallet}={self.balance}, age={self.age:.1f}s>"
+
+
+class BalanceTracker:
+    """
+    keeps the latest `WalletBalance` per wallet from every successful response
+
+    concurrent responses can arrive out of order, a balance only replaces the
+    current one if its request was sent after the current one's request
+    """
+
+    AIRTIME = "airtime"
+    ZESA = "zesa"
+
+    def __init__(self):
+        self.__balances = {}
+        self.__lock = threading.Lock()
+
+    def update(self, wallet: str, balance, sent_at: float = None) -> None:
+        sent_at = time.monotonic() if sent_at is None else sent_at
+
+        with self.__lock:
+            current = self.__balances.get(wallet)
+
+            if current is None or sent_at >= current._sent_at:
+                self.__balances[wallet] = CachedBalance(wallet, balance, sent_at)
+
+    def get(self, wallet: str = AIRTIME) -> CachedBalance or None:
+        return self.__balances.get(wallet)
+
+    def fresh(self, wallet: str, max_age: float) -> CachedBalance or None:
+        """
+        cached balance if it is at most `max_age` seconds old, else None
+        """
+        cached = self.__balances.get(wallet)
+
+        if cached is not None and cached.age <= max_age:
+            return cached
+
+        return None
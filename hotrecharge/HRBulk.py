@@ -0,0 +1,185 @@
+"""
+    @author:    DonnC <https://github.com/DonnC>
+    @created:   Oct 2026
+
+    bulk recharge helpers, fan out many orders with bounded concurrency
+"""
+
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from itertools import islice
+
+from .HRTimeout import CallLimits, callLimits, currentLimits
+
+
+class BulkResult:
+    """
+    outcome of a single bulk order
+
+    `order`: the order dict as passed in
+    `reference`: agent reference the order was sent with
+    `response`: api response (dict or Munch) on success, else None
+    `error`: raised exception (usually a `HotRechargeException`) on failure, else None
+    """
+
+    __slots__ = ("order", "reference", "response", "error")
+
+    def __init__(self, order: dict, reference: str, response=None, error: Exception = None):
+        self.order = order
+        self.reference = reference
+        self.response = response
+        self.error = error
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def __repr__(self):
+        if self.ok:
+            return f"<BulkResult: {self.reference}, ok>"
+
+        return f"<BulkResult: {self.reference}, {type(self.error).__name__}: {self.error}>"
+
+
+def _orderCall(api, order: dict):
+    """
+    map an order dict to the endpoint method and kwargs that fulfil it
+
+    orders with a `product_code` are data bundles, anything else is pinless airtime.
+    an `order_key` sends the order once per key, see `IdempotencyGuard`
+
+    >>> {'amount': 1.5, 'number': '077xxxxxxx', 'brandID': None, 'mesg': None}
+    >>> {'product_code': 'DWB15', 'number': '077xxxxxxx', 'amount': None, 'mesg': None, 'order_key': 'order-1001'}
+    """
+    if order.get("product_code"):
+        return api.dataBundleRecharge, {
+            "product_code": order["product_code"],
+            "number": order["number"],
+            "amount": order.get("amount"),
+            "mesg": order.get("mesg"),
+            "order_key": order.get("order_key"),
+        }
+
+    return api.rechargePinless, {
+        "amount": order["amount"],
+        "number": order["number"],
+        "brandID": order.get("brandID"),
+        "mesg": order.get("mesg"),
+        "order_key": order.get("order_key"),
+    }
+
+
+def _bulkLimits(deadline: float = None) -> CallLimits:
+    """
+    limits every order of a run is made under, the caller's `api.timeouts()` block
+    tightened by the run `deadline`. worker threads do not inherit the caller's context, so they are passed on
+    """
+    outer = currentLimits() or CallLimits()
+    return outer.merged(None, None if deadline is None else time.monotonic() + deadline)
+
+
+def _runOrder(api, order: dict, reference: str, limits: CallLimits) -> BulkResult:
+    method, kwargs = _orderCall(api, order)
+
+    try:
+        with callLimits(limits.timeout, expires_at=limits.expires_at):
+            return BulkResult(order, reference, response=method(reference=reference, **kwargs))
+
+    except Exception as err:
+        return BulkResult(order, reference, error=err)
+
+
+def bulkRecharge(api, orders, max_concurrency: int = 8, deadline: float = None):
+    """
+    run `orders` through `api` on a thread pool, yielding a `BulkResult` per order as each completes
+
+    at most `max_concurrency` orders are in flight and orders are only pulled
+    from `orders` as slots free up, so it can be a lazy generator.
+    orders still unsent when the run `deadline` (seconds) passes fail fast with `RequestTimeout`
+    """
+    if max_concurrency < 1:
+        raise ValueError("max_concurrency must be at least 1")
+
+    orders = iter(orders)
+    limits = _bulkLimits(deadline)
+
+    def submit(pool, order):
+        reference = order.get("reference") or api._newReference()
+        return pool.submit(_runOrder, api, order, reference, limits)
+
+    with ThreadPoolExecutor(max_workers=max_concurrency) as pool:
+        pending = {submit(pool, order) for order in islice(orders, max_concurrency)}
+
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+
+            for future in done:
+                yield future.result()
+
+            for order in islice(orders, len(done)):
+                pending.add(submit(pool, order))
+
+
+async def asyncBulkRecharge(api, orders, max_concurrency: int = 100, deadline: float = None):
+    """
+    asyncio flavour of `bulkRecharge`, `orders` can be a sync or async iterable
+    """
+    if max_concurrency < 1:
+        raise ValueError("max_concurrency must be at least 1")
+
+    limits = _bulkLimits(deadline)
+
+    async def arun(order, reference):
+        method, kwargs = _orderCall(api, order)
+
+        try:
+            with callLimits(limits.timeout, expires_at=limits.expires_at):
+                return BulkResult(order, reference, response=await method(reference=reference, **kwargs))
+
+        except Exception as err:
+            return BulkResult(order, reference, error=err)
+
+    if hasattr(orders, "__aiter__"):
+        source = orders.__aiter__()
+
+        async def nextOrder():
+            try:
+                return await source.__anext__()
+
+            except StopAsyncIteration:
+                return None
+
+    else:
+        source = iter(orders)
+
+        async def nextOrder():
+            return next(source, None)
+
+    def submit(order):
+        reference = order.get("reference") or api._newReference()
+        return asyncio.ensure_future(arun(order, reference))
+
+    pending = set()
+
+    for _ in range(max_concurrency):
+        order = await nextOrder()
+
+        if order is None:
+            break
+
+        pending.add(submit(order))
+
+    while pending:
+        done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+
+        for task in done:
+            yield task.result()
+
+        for _ in range(len(done)):
+            order = await nextOrder()
+
+            if order is None:
+                break
+
+            pending.add(submit(order))
@@ -0,0 +1,229 @@
+"""
+    @author:    DonnC <https://github.com/DonnC>
+    @created:   Oct 2026
+
+    in-memory caches for rarely changing api responses
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+
+class _CacheEntry:
+    __slots__ = ("value", "stored_at")
+
+    def __init__(self, value, stored_at: float):
+        self.value = value
+        self.stored_at = stored_at
+
+
+class CatalogCache:
+    """
+    ttl cache with stale-while-revalidate for catalog endpoints (`getDataBundles`, `getEVDs`)
+
+    `ttl`: seconds a loaded catalog is fresh and served straight from memory. Defaults to 300
+    `stale_ttl`: extra seconds an expired catalog is still served while it is refreshed
+        in the background, past that callers wait for a reload. Defaults to `ttl`
+
+    >>> api = hotrecharge.HotRecharge(config, catalog_cache=hotrecharge.CatalogCache(ttl=600))
+
+    >>> api.getDataBundles()    # network
+    >>> api.getDataBundles()    # memory
+
+    cached responses are shared between callers, treat them as read only
+    """
+
+    def __init__(self, ttl: float = 300, stale_ttl: float = None):
+        self.ttl = ttl
+        self.stale_ttl = ttl if stale_ttl is None else stale_ttl
+
+        self.__entries = {}
+        self.__lock = threading.Lock()
+        self.__loading = {}
+        self.__refreshing = set()
+        # bumped by `invalidate()`, a load started before it must not store its result
+        self.__generation = 0
+
+    def get(self, key: str, loader):
+        """
+        get `key` from cache, calling `loader()` to load it when missing or expired
+        """
+        now = time.monotonic()
+        entry = self.__entries.get(key)
+
+        if entry is not None:
+            age = now - entry.stored_at
+
+            if age < self.ttl:
+                return entry.value
+
+            if age < self.ttl + self.stale_ttl:
+                self.__refreshInBackground(key, loader)
+                return entry.value
+
+        return self.__load(key, loader)
+
+    def invalidate(self, key: str = None) -> None:
+        """
+        drop `key` from cache, or everything if no key is given
+        """
+        with self.__lock:
+            self.__generation += 1
+
+            if key is None:
+                self.__entries.clear()
+
+            else:
+                self.__entries.pop(key, None)
+
+    def __store(self, key: str, value, generation: int) -> None:
+        # keep a loaded value unless the cache was invalidated while it loaded
+        with self.__lock:
+            if generation == self.__generation:
+                self.__entries[key] = _CacheEntry(value, time.monotonic())
+
+    def __load(self, key: str, loader):
+        # one loader per key, concurrent callers wait for it instead of loading again
+        with self.__lock:
+            key_lock = self.__loading.setdefault(key, threading.Lock())
+
+        with key_lock:
+            entry = self.__entries.get(key)
+
+            if entry is not None and time.monotonic() - entry.stored_at < self.ttl:
+                return entry.value
+
+            generation = self.__generation
+            value = loader()
+            self.__store(key, value, generation)
+
+            return value
+
+    def __refreshInBackground(self, key: str, loader):
+        with self.__lock:
+            if key in self.__refreshing:
+                return
+
+            self.__refreshing.add(key)
+            generation = self.__generation
+
+        def refresh():
+            try:
+                self.__store(key, loader(), generation)
+
+            except Exception:
+                # keep serving stale data, the next call past ttl retries the refresh
+                pass
+
+            finally:
+                with self.__lock:
+                    self.__refreshing.discard(key)
+
+        threading.Thread(target=refresh, name=f"hotrecharge-cache-{key}", daemon=True).start()
+
+
+class CacheStats:
+    """
+    hit / miss counters of a `LRUTTLCache`
+    """
+
+    __slots__ = ("hits", "misses", "evictions", "expirations")
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def toDict(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "hit_ratio": self.hit_ratio,
+        }
+
+    def __repr__(self):
+        return f"<CacheStats: hits={self.hits}, misses={self.misses}, hit_ratio={self.hit_ratio:.2f}>"
+
+
+class LRUTTLCache:
+    """
+    size bounded least-recently-used cache whose entries expire after a ttl
+
+    `maxsize`: max number of entries, least recently used ones are evicted first. Defaults to 10000
+    `ttl`: seconds an entry is fresh. Defaults to 86400 (a day)
+
+    >>> cache = hotrecharge.LRUTTLCache(maxsize=50000, ttl=7 * 86400)
+    >>> api = hotrecharge.HotRecharge(config, zesa_customer_cache=cache)
+
+    >>> cache.stats
+    """
+
+    def __init__(self, maxsize: int = 10000, ttl: float = 86400):
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.stats = CacheStats()
+
+        self.__entries = OrderedDict()
+        self.__lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.__entries)
+
+    def __contains__(self, key):
+        return self.get(key, count=False) is not None
+
+    def get(self, key, default=None, count: bool = True):
+        """
+        fresh value of `key` or `default`
+        """
+        with self.__lock:
+            entry = self.__entries.get(key)
+
+            if entry is not None:
+                if time.monotonic() - entry.stored_at < self.ttl:
+                    self.__entries.move_to_end(key)
+
+                    if count:
+                        self.stats.hits += 1
+
+                    return entry.value
+
+                del self.__entries[key]
+                self.stats.expirations += 1
+
+            if count:
+                self.stats.misses += 1
+
+            return default
+
+    def set(self, key, value) -> None:
+        with self.__lock:
+            self.__entries[key] = _CacheEntry(value, time.monotonic())
+            self.__entries.move_to_end(key)
+
+            while len(self.__entries) > self.maxsize:
+                self.__entries.popitem(last=False)
+                self.stats.evictions += 1
+
+    def invalidate(self, key=None) -> None:
+        """
+        drop `key` from cache, or everything if no key is given
+        """
+        with self.__lock:
+            if key is None:
+                self.__entries.clear()
+
+            else:
+                self.__entries.pop(key, None)
@@ -0,0 +1,191 @@
+"""
+    @author:    DonnC <https://github.com/DonnC>
+    @created:   Oct 2026
+
+    indexed data bundle catalog built from `api.getDataBundles()`
+"""
+
+import re
+from bisect import bisect_left, bisect_right
+
+from .HotRechargeException import InvalidProductCode
+
+_DATA_SIZE = re.compile(r"(\d+(?:\.\d+)?)\s*(GB|MB)", re.IGNORECASE)
+
+
+def bundleDataMB(bundle) -> float or None:
+    """
+    data size of a bundle in MB, parsed from its `Name` or `Description` e.g `Daily 250MB`
+    :return: size in MB or None if the bundle does not state one
+    """
+    for field in ("Name", "Description"):
+        match = _DATA_SIZE.search(str(bundle.get(field) or ""))
+
+        if match:
+            size = float(match.group(1))
+            return size * 1024 if match.group(2).upper() == "GB" else size
+
+    return None
+
+
+class _NetworkIndex:
+    # per network bundles sorted by price and by data size, with running best values
+    # so range and "best value" queries are a binary search
+
+    def __init__(self, bundles: list):
+        sizes = {id(b): bundleDataMB(b) for b in bundles}
+
+        self.by_amount = sorted(bundles, key=lambda b: float(b["Amount"]))
+        self.amounts = [float(b["Amount"]) for b in self.by_amount]
+
+        # most data seen so far in price order -> best bundle within a budget
+        self.best_upto = []
+        best, best_mb = None, None
+
+        for bundle in self.by_amount:
+            mb = sizes[id(bundle)]
+
+            if mb is not None and (best_mb is None or mb > best_mb):
+                best, best_mb = bundle, mb
+
+            self.best_upto.append(best)
+
+        self.by_mb = sorted((b for b in bundles if sizes[id(b)] is not None), key=lambda b: sizes[id(b)])
+        self.mbs = [sizes[id(b)] for b in self.by_mb]
+
+        # cheapest bundle from here to the biggest -> cheapest with at least N MB
+        self.cheapest_from = [None] * len(self.by_mb)
+        cheapest = None
+
+        for i in range(len(self.by_mb) - 1, -1, -1):
+            bundle = self.by_mb[i]
+
+            if cheapest is None or float(bundle["Amount"]) < float(cheapest["Amount"]):
+                cheapest = bundle
+
+            self.cheapest_from[i] = cheapest
+
+
+class BundleCatalog:
+    """
+    data bundles indexed for constant time lookups by `ProductCode`, `BundleId` and `BrandId`
+    and sorted per `Network` by `Amount` for price range and best value queries
+
+    >>> catalog = api.bundleCatalog()
+
+    >>> catalog.byProductCode('DWB15')
+    >>> catalog.priceRange('Econet', low=1, high=5)
+    >>> catalog.cheapest('Econet', min_mb=1024)
+    >>> catalog.bestValue('NetOne', budget=3.0)
+
+    bundles are the dicts (or Munch objects) of the api response, network names are matched case insensitively
+    """
+
+    def __init__(self, bundles: list):
+        self.bundles = list(bundles)
+        self.source = None
+
+        self.__by_product_code = {}
+        self.__by_bundle_id = {}
+        self.__by_brand_id = {}
+        per_network = {}
+
+        for bundle in self.bundles:
+            self.__by_product_code[bundle["ProductCode"]] = bundle
+            self.__by_bundle_id[bundle["BundleId"]] = bundle
+            self.__by_brand_id.setdefault(bundle["BrandId"], []).append(bundle)
+            per_network.setdefault(str(bundle["Network"]).lower(), []).append(bundle)
+
+        self.__networks = {network: _NetworkIndex(bundles) for network, bundles in per_network.items()}
+
+    @classmethod
+    def fromResponse(cls, response) -> "BundleCatalog":
+        """
+        build a catalog from a `getDataBundles()` response, dict or Munch
+        """
+        catalog = cls(response.get("Bundles") or [])
+        catalog.source = response
+
+        return catalog
+
+    def __len__(self):
+        return len(self.bundles)
+
+    def __iter__(self):
+        return iter(self.bundles)
+
+    def __contains__(self, product_code):
+        return product_code in self.__by_product_code
+
+    def __repr__(self):
+        return f"<BundleCatalog: {len(self.bundles)} bundles, networks={self.networks}>"
+
+    @property
+    def networks(self) -> list:
+        return list(self.__networks)
+
+    def byProductCode(self, product_code: str):
+        return self.__by_product_code.get(product_code)
+
+    def byBundleId(self, bundle_id):
+        return self.__by_bundle_id.get(bundle_id)
+
+    def byBrandId(self, brand_id) -> list:
+        return list(self.__by_brand_id.get(brand_id, []))
+
+    def validate(self, product_code: str):
+        """
+        get bundle for `product_code` or raise `InvalidProductCode` without calling the api
+        """
+        bundle = self.__by_product_code.get(product_code)
+
+        if bundle is None:
+            raise InvalidProductCode(f"unknown data bundle product code: {product_code}")
+
+        return bundle
+
+    def __network(self, network: str) -> _NetworkIndex:
+        return self.__networks.get(str(network).lower())
+
+    def priceRange(self, network: str, low: float = None, high: float = None) -> list:
+        """
+        bundles on `network` priced between `low` and `high` inclusive, cheapest first
+        """
+        index = self.__network(network)
+
+        if index is None:
+            return []
+
+        start = 0 if low is None else bisect_left(index.amounts, float(low))
+        end = len(index.amounts) if high is None else bisect_right(index.amounts, float(high))
+
+        return index.by_amount[start:end]
+
+    def cheapest(self, network: str, min_mb: float = None):
+        """
+        cheapest bundle on `network` with at least `min_mb` MB of data, None if there is none
+        """
+        index = self.__network(network)
+
+        if index is None:
+            return None
+
+        if min_mb is None:
+            return index.by_amount[0] if index.by_amount else None
+
+        i = bisect_left(index.mbs, float(min_mb))
+
+        return index.cheapest_from[i] if i < len(index.cheapest_from) else None
+
+    def bestValue(self, network: str, budget: float):
+        """
+        bundle on `network` with the most data for at most `budget`, None if nothing fits
+        """
+        index = self.__network(network)
+
+        if index is None:
+            return None
+
+        i = bisect_right(index.amounts, float(budget))
+
+        return index.best_upto[i - 1] if i else None
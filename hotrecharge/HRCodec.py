@@ -0,0 +1,104 @@
+"""
+    @author:    DonnC <https://github.com/DonnC>
+    @created:   Oct 2026
+
+    json codecs for request payloads and api responses
+"""
+
+import json
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+try:
+    import ujson
+except ImportError:  # pragma: no cover - optional dependency
+    ujson = None
+
+
+class JsonCodec:
+    """
+    base class for json codecs, payloads are encoded to bytes and responses
+    decoded straight from the raw response bytes
+
+    subclass and override `dumps()` / `loads()` to plug in another library
+
+    >>> api = hotrecharge.HotRecharge(config, codec=MyCodec())
+    """
+
+    name = None
+
+    def dumps(self, obj) -> bytes:
+        raise NotImplementedError
+
+    def loads(self, data: bytes):
+        raise NotImplementedError
+
+    def __repr__(self):
+        return f"<{type(self).__name__}: {self.name}>"
+
+
+class StdlibJsonCodec(JsonCodec):
+    """
+    python `json` module, always available
+    """
+
+    name = "json"
+
+    def dumps(self, obj) -> bytes:
+        return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+    def loads(self, data: bytes):
+        # json.loads detects the utf encoding of bytes itself, no text decode needed
+        return json.loads(data)
+
+
+class OrjsonCodec(JsonCodec):
+    """
+    `orjson`, fastest option, encodes straight to bytes
+    """
+
+    name = "orjson"
+
+    def __init__(self):
+        if orjson is None:
+            raise ImportError("OrjsonCodec requires `orjson`, install it with `pip install hot-recharge[speedups]`")
+
+    def dumps(self, obj) -> bytes:
+        return orjson.dumps(obj)
+
+    def loads(self, data: bytes):
+        return orjson.loads(data)
+
+
+class UjsonCodec(JsonCodec):
+    """
+    `ujson`, faster than the stdlib where `orjson` is not available
+    """
+
+    name = "ujson"
+
+    def __init__(self):
+        if ujson is None:
+            raise ImportError("UjsonCodec requires `ujson`, install it with `pip install ujson`")
+
+    def dumps(self, obj) -> bytes:
+        return ujson.dumps(obj).encode("utf-8")
+
+    def loads(self, data: bytes):
+        return ujson.loads(data)
+
+
+def defaultCodec() -> JsonCodec:
+    """
+    fastest installed codec: orjson, then ujson, then the stdlib
+    """
+    if orjson is not None:
+        return OrjsonCodec()
+
+    if ujson is not None:
+        return UjsonCodec()
+
+    return StdlibJsonCodec()
@@ -0,0 +1,543 @@
+"""
+    @author:    DonnC <https://github.com/DonnC>
+    @created:   Oct 2026
+
+    local stand-in for the hot recharge agents api, for load and integration testing
+
+    >>> python -m hotrecharge.HRFakeServer --port 8080 --latency 0.05
+"""
+
+import argparse
+import itertools
+import json
+import math
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+
+def fixedLatency(seconds: float):
+    """
+    every request takes `seconds`
+    """
+    return lambda rng: seconds
+
+
+def uniformLatency(low: float, high: float):
+    """
+    request latency uniformly spread between `low` and `high` seconds
+    """
+    return lambda rng: rng.uniform(low, high)
+
+
+def lognormalLatency(median: float, sigma: float = 0.5, cap: float = None):
+    """
+    long tailed request latency around `median` seconds, like real upstreams
+    """
+    mu = math.log(median)
+
+    def latency(rng):
+        seconds = rng.lognormvariate(mu, sigma)
+        return seconds if cap is None else min(cap, seconds)
+
+    return latency
+
+
+DEFAULT_BUNDLES = [
+    {"BundleId": 1, "BrandId": 18, "Network": "Econet", "ProductCode": "DWB15", "Amount": 1.5,
+     "Name": "Weekly Data 250MB", "Description": "250MB weekly bundle", "Validity": 7},
+    {"BundleId": 2, "BrandId": 18, "Network": "Econet", "ProductCode": "DMB5", "Amount": 5.0,
+     "Name": "Monthly Data 1GB", "Description": "1GB monthly bundle", "Validity": 30},
+    {"BundleId": 3, "BrandId": 24, "Network": "NetOne", "ProductCode": "OWB2", "Amount": 2.0,
+     "Name": "One Fi 500MB", "Description": "500MB weekly bundle", "Validity": 7},
+    {"BundleId": 4, "BrandId": 25, "Network": "Telecel", "ProductCode": "TMB3", "Amount": 3.0,
+     "Name": "Telecel 1GB", "Description": "1GB monthly bundle", "Validity": 30},
+]
+
+DEFAULT_STOCK = {(24, 0.5): 500, (24, 1.0): 500, (24, 5.0): 100}
+
+ERROR_MESSAGES = {
+    4: "Pending ZESA verification",
+    206: "Prepaid platform failure",
+    208: "Insufficient balance",
+    209: "Out of pin stock",
+    210: "Prepaid platform failure",
+    216: "Duplicate request",
+    217: "Invalid contact",
+    218: "Authorization error",
+    219: "Web service error",
+    220: "Authorization error",
+    221: "Balance request error",
+    222: "Recharge amount limit",
+    401: "Authorization has been denied for this request.",
+    429: "Duplicate agent reference",
+    800: "Transaction not found",
+}
+
+
+class FakeHotServer:
+    """
+    threaded http server answering every `agents/*` endpoint the clients use with realistic json
+
+    state is kept in memory: airtime and zesa wallets are debited by recharges, evd stock
+    runs out, agent references are remembered (reused ones get http 429, `query-transaction` finds them)
+    and zesa recharges can go pending (reply code 4) until polled `zesa_pending_polls` times
+
+    `latency`: callable `rng -> seconds`, or endpoint method name -> callable, see `lognormalLatency`. Defaults to none
+    `errors`: reply code -> probability injected on every endpoint, or endpoint method name -> {code: probability},
+        e.g {'rechargePinless': {208: 0.05, 206: 0.01}, 'getEVDs': {429: 0.1}}
+    `wallet`, `zesa_wallet`: opening balances. Default to 10000
+    `discount`: agent discount on airtime recharges. Defaults to 0.05
+    `stock`: (brand id, pin value) -> evd pins in stock
+    `bundles`: data bundles served by `get-data-bundles`
+    `zesa_pending_rate`: probability a zesa recharge goes pending. Defaults to 0
+    `zesa_pending_polls`: `query-zesa-transaction` polls before a pending recharge resolves. Defaults to 2
+    `access_code`: when set, requests with another `x-access-code` get http 401
+    `seed`: random seed for reproducible latency and errors
+
+    >>> with hotrecharge.FakeHotServer(latency=hotrecharge.lognormalLatency(0.08)) as server:
+            api = hotrecharge.HotRecharge(config, base_url=server.url)
+            api.walletBalance()
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency=None,
+        errors: dict = None,
+        wallet: float = 10000,
+        zesa_wallet: float = 10000,
+        discount: float = 0.05,
+        stock: dict = None,
+        bundles: list = None,
+        zesa_pending_rate: float = 0,
+        zesa_pending_polls: int = 2,
+        access_code: str = None,
+        seed: int = None,
+    ):
+        self.latency = latency
+        self.errors = errors or {}
+        self.wallet = float(wallet)
+        self.zesa_wallet = float(zesa_wallet)
+        self.discount = discount
+        self.stock = {(int(brand), float(value)): count for (brand, value), count in (stock or DEFAULT_STOCK).items()}
+        self.bundles = list(bundles or DEFAULT_BUNDLES)
+        self.zesa_pending_rate = zesa_pending_rate
+        self.zesa_pending_polls = zesa_pending_polls
+        self.access_code = access_code
+
+        self.transactions = {}
+        self.zesa_transactions = {}
+        self.requests = 0
+        self.forced = []
+
+        self.__rng = random.Random(seed)
+        self.__ids = itertools.count(100000)
+        self.__lock = threading.Lock()
+        self.__thread = None
+
+        self.__server = ThreadingHTTPServer((host, port), self.__handler())
+        self.__server.daemon_threads = True
+
+    def __repr__(self):
+        return f"<FakeHotServer: {self.url}, {self.requests} requests>"
+
+    @property
+    def url(self) -> str:
+        """
+        root url to pass as the client `base_url`
+        """
+        host, port = self.__server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def start(self):
+        """
+        serve in a background thread
+        """
+        if self.__thread is None:
+            self.__thread = threading.Thread(target=self.__server.serve_forever, daemon=True)
+            self.__thread.start()
+
+        return self
+
+    def stop(self) -> None:
+        self.__server.shutdown()
+        self.__server.server_close()
+        self.__thread = None
+
+    def serveForever(self) -> None:
+        self.__server.serve_forever()
+
+    def injectError(self, code: int, endpoint: str = None, count: int = 1) -> None:
+        """
+        answer the next `count` requests (to `endpoint` method name, or any endpoint) with reply code `code`
+        """
+        with self.__lock:
+            self.forced.append([endpoint, code, count])
+
+    # ---------------------------------------------------------------- internals
+
+    def __handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            # headers and body go out in separate writes, nagle + delayed acks would add ~40ms per call
+            disable_nagle_algorithm = True
+
+            def log_message(self, *args):
+                pass
+
+            def __handle(self):
+                length = int(self.headers.get("content-length") or 0)
+                body = self.rfile.read(length) if length else b""
+
+                status, response = server._dispatch(self.command, self.path, dict(self.headers), body)
+                data = json.dumps(response).encode("utf-8")
+
+                try:
+                    self.send_response(status)
+                    self.send_header("content-type", "application/json; charset=utf-8")
+                    self.send_header("content-length", str(len(data)))
+                    self.end_headers()
+                    self.wfile.write(data)
+
+                except (BrokenPipeError, ConnectionResetError):
+                    # the client timed out and hung up
+                    self.close_connection = True
+
+            do_GET = __handle
+            do_POST = __handle
+
+        return Handler
+
+    __ROUTES = {
+        ("POST", "agents/recharge-pinless"): "rechargePinless",
+        ("POST", "agents/recharge-data"): "dataBundleRecharge",
+        ("POST", "agents/recharge-evd"): "rechargeEVD",
+        ("POST", "agents/recharge-zesa"): "rechargeZesa",
+        ("POST", "agents/check-customer-zesa"): "checkZesaCustomer",
+        ("POST", "agents/query-zesa-transaction"): "queryZesaTransaction",
+        ("GET", "agents/wallet-balance"): "walletBalance",
+        ("GET", "agents/wallet-balance-zesa"): "zesaWalletBalance",
+        ("GET", "agents/get-data-bundles"): "getDataBundles",
+        ("GET", "agents/query-evd"): "getEVDs",
+        ("GET", "agents/query-transaction"): "queryTransactionReference",
+    }
+
+    def __latency(self, name: str) -> float:
+        latency = self.latency.get(name) if isinstance(self.latency, dict) else self.latency
+
+        if latency is None:
+            return 0.0
+
+        with self.__lock:
+            return latency(self.__rng)
+
+    def __injected(self, name: str) -> int or None:
+        # a forced error first, then the configured error rates
+        with self.__lock:
+            for forced in self.forced:
+                if forced[0] in (None, name):
+                    forced[2] -= 1
+
+                    if forced[2] <= 0:
+                        self.forced.remove(forced)
+
+                    return forced[1]
+
+            rates = self.errors.get(name, self.errors)
+            roll = self.__rng.random()
+
+            for code, probability in rates.items():
+                if isinstance(probability, dict):
+                    # another endpoint's rates
+                    continue
+
+                if roll < probability:
+                    return int(code)
+
+                roll -= probability
+
+        return None
+
+    @staticmethod
+    def _error(code: int, reference: str = None) -> tuple:
+        message = ERROR_MESSAGES.get(code, "Error")
+
+        if code in (401, 429):
+            return code, {"Message": message}
+
+        return 200, {"ReplyCode": code, "ReplyMsg": message, "AgentReference": reference}
+
+    def _dispatch(self, method: str, path: str, headers: dict, body: bytes) -> tuple:
+        parts = urlsplit(path)
+        endpoint = parts.path.split("/api/v1/", 1)[-1].strip("/")
+        name = self.__ROUTES.get((method, endpoint))
+        headers = {key.lower(): value for key, value in headers.items()}
+        reference = headers.get("x-agent-reference")
+
+        with self.__lock:
+            self.requests += 1
+
+        delay = self.__latency(name)
+
+        if delay > 0:
+            time.sleep(delay)
+
+        if name is None:
+            return 404, {"Message": f"No HTTP resource was found that matches {path}"}
+
+        if self.access_code is not None and headers.get("x-access-code") != self.access_code:
+            return self._error(401)
+
+        code = self.__injected(name)
+
+        if code is not None:
+            return self._error(code, reference)
+
+        payload = json.loads(body) if body else {}
+        query = {key: values[0] for key, values in parse_qs(parts.query).items()}
+
+        with self.__lock:
+            if name.startswith("recharge") or name == "dataBundleRecharge":
+                if reference in self.transactions:
+                    return self._error(429)
+
+            status, response = getattr(self, f"_{name}")(payload, query, reference)
+
+            if name.startswith("recharge") or name == "dataBundleRecharge":
+                # failed recharges are remembered too, `query-transaction` reports their outcome
+                self.transactions[reference] = response
+
+            return status, response
+
+    # ---------------------------------------------------------------- endpoints, called under the lock
+
+    def __ok(self, reference: str, **fields) -> tuple:
+        response = {"ReplyCode": 2, "ReplyMsg": "Transaction successful", "AgentReference": reference}
+        response.update(fields)
+        return 200, response
+
+    def __debit(self, reference: str, amount: float, zesa: bool = False):
+        # None when the wallet is short
+        balance = self.zesa_wallet if zesa else self.wallet
+        cost = round(amount * (1 - (0 if zesa else self.discount)), 2)
+
+        if cost > balance:
+            return None
+
+        if zesa:
+            self.zesa_wallet = round(balance - cost, 2)
+
+        else:
+            self.wallet = round(balance - cost, 2)
+
+        return {
+            "Amount": amount,
+            "Discount": round(amount - cost, 2),
+            "InitialBalance": balance,
+            "FinalBalance": round(balance - cost, 2),
+            "WalletBalance": round(balance - cost, 2),
+            "RechargeID": next(self.__ids),
+        }
+
+    def _walletBalance(self, payload, query, reference):
+        return self.__ok(reference, WalletBalance=self.wallet)
+
+    def _zesaWalletBalance(self, payload, query, reference):
+        return self.__ok(reference, WalletBalance=self.zesa_wallet)
+
+    def _getDataBundles(self, payload, query, reference):
+        return self.__ok(reference, Bundles=self.bundles)
+
+    def _getEVDs(self, payload, query, reference):
+        in_stock = [
+            {"BrandId": brand, "BrandName": "NetOne", "PinValue": value, "Stock": count}
+            for (brand, value), count in sorted(self.stock.items())
+        ]
+        return self.__ok(reference, InStock=in_stock)
+
+    def _rechargePinless(self, payload, query, reference):
+        amount = float(payload.get("amount") or 0)
+        number = str(payload.get("targetMobile") or "")
+
+        if not number.startswith("0") or len(number) < 10:
+            return self._error(217, reference)
+
+        debit = self.__debit(reference, amount)
+
+        if debit is None:
+            return self._error(208, reference)
+
+        return self.__ok(reference, Data=0, SMS=0, Window="", **debit)
+
+    def _dataBundleRecharge(self, payload, query, reference):
+        code = payload.get("ProductCode")
+        bundle = next((bundle for bundle in self.bundles if bundle["ProductCode"] == code), None)
+
+        if bundle is None:
+            return self._error(206, reference)
+
+        debit = self.__debit(reference, float(payload.get("Amount") or bundle["Amount"]))
+
+        if debit is None:
+            return self._error(208, reference)
+
+        return self.__ok(reference, Data=bundle["Name"], SMS=0, Window="", **debit)
+
+    def _rechargeEVD(self, payload, query, reference):
+        key = (int(payload.get("BrandID")), float(payload.get("Denomination")))
+        quantity = int(payload.get("Quantity") or 1)
+
+        if self.stock.get(key, 0) < quantity:
+            return self._error(209, reference)
+
+        debit = self.__debit(reference, key[1] * quantity)
+
+        if debit is None:
+            return self._error(208, reference)
+
+        self.stock[key] -= quantity
+        expiry = time.strftime("%m/%d/%Y", time.localtime(time.time() + 365 * 86400))
+        pins = [
+            f"{self.__rng.randrange(10 ** 15, 10 ** 16)},{self.__rng.randrange(10 ** 11, 10 ** 12)}"
+            f"|{key[0]},{key[1]:.2f},{expiry}"
+            for _ in range(quantity)
+        ]
+
+        return self.__ok(reference, Pins=pins, **debit)
+
+    def __customer(self, meter: str) -> dict:
+        return {
+            "CustomerName": f"CUSTOMER {meter[-4:]}",
+            "Address": f"{int(meter[-3:] or 0)} SAMORA MACHEL AVE HARARE",
+            "MeterNumber": meter,
+            "Reference": f"ZR{meter[-6:]}",
+        }
+
+    def _checkZesaCustomer(self, payload, query, reference):
+        meter = str(payload.get("MeterNumber") or "")
+
+        if len(meter) != 11 or not meter.isdigit():
+            return self._error(206, reference)
+
+        return self.__ok(reference, Meter=meter, CustomerInfo=self.__customer(meter))
+
+    def __zesaResponse(self, reference: str, meter: str, debit: dict) -> dict:
+        net = round(debit["Amount"] * 0.94, 2)
+        token = {
+            "Token": "".join(str(self.__rng.randrange(10)) for _ in range(20)),
+            "Units": round(net / 0.12, 1),
+            "NetAmount": net,
+            "Levy": round(debit["Amount"] * 0.06, 2),
+            "Arrears": 0.0,
+            "TaxAmount": 0.0,
+            "ZesaReference": f"ZT{debit['RechargeID']}",
+        }
+        customer = self.__customer(meter)
+
+        return {
+            "ReplyCode": 2,
+            "ReplyMsg": "Transaction successful",
+            "AgentReference": reference,
+            "Meter": meter,
+            "AccountName": customer["CustomerName"],
+            "Address": customer["Address"],
+            "Tokens": [token],
+            "CustomerInfo": customer,
+            **debit,
+        }
+
+    def _rechargeZesa(self, payload, query, reference):
+        meter = str(payload.get("meterNumber") or "")
+
+        if len(meter) != 11 or not meter.isdigit():
+            return self._error(206, reference)
+
+        debit = self.__debit(reference, float(payload.get("Amount") or 0), zesa=True)
+
+        if debit is None:
+            return self._error(208, reference)
+
+        response = self.__zesaResponse(reference, meter, debit)
+        transaction = {"response": response, "polls": 0, "pending": False}
+        self.zesa_transactions[str(debit["RechargeID"])] = transaction
+
+        if self.__rng.random() < self.zesa_pending_rate:
+            transaction["pending"] = True
+            return 200, {
+                "ReplyCode": 4,
+                "ReplyMsg": ERROR_MESSAGES[4],
+                "AgentReference": reference,
+                "RechargeID": debit["RechargeID"],
+                "WalletBalance": debit["WalletBalance"],
+            }
+
+        return 200, response
+
+    def _queryZesaTransaction(self, payload, query, reference):
+        transaction = self.zesa_transactions.get(str(payload.get("RechargeId")))
+
+        if transaction is None:
+            return self._error(800, reference)
+
+        if transaction["pending"]:
+            transaction["polls"] += 1
+
+            if transaction["polls"] <= self.zesa_pending_polls:
+                return self._error(4, reference)
+
+            transaction["pending"] = False
+
+        return 200, dict(transaction["response"], AgentReference=reference)
+
+    def _queryTransactionReference(self, payload, query, reference):
+        original = self.transactions.get(query.get("agentReference"))
+
+        if original is None:
+            return self._error(800, reference)
+
+        return self.__ok(reference, OriginalAgentReference=original, RawReply=json.dumps(original))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="local stand-in for the hot recharge agents api")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--latency", type=float, default=0, help="median latency in seconds, lognormal")
+    parser.add_argument("--error-rate", type=float, default=0, help="share of requests failing with reply code 206")
+    parser.add_argument("--zesa-pending-rate", type=float, default=0)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    server = FakeHotServer(
+        host=args.host,
+        port=args.port,
+        latency=lognormalLatency(args.latency) if args.latency else None,
+        errors={206: args.error_rate} if args.error_rate else None,
+        zesa_pending_rate=args.zesa_pending_rate,
+        seed=args.seed,
+    )
+
+    print(f"fake hot recharge api on {server.url}, pass base_url='{server.url}'")
+
+    try:
+        server.serveForever()
+
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
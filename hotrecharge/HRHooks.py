@@ -0,0 +1,226 @@
+"""
+    @author:    DonnC <https://github.com/DonnC>
+    @created:   Oct 2026
+
+    request lifecycle hooks and optional opentelemetry spans around every api call
+"""
+
+import logging
+import time
+
+try:
+    from opentelemetry import trace as otel_trace
+    from opentelemetry.trace import SpanKind, Status, StatusCode
+except ImportError:  # pragma: no cover - optional dependency
+    otel_trace = None
+
+logger = logging.getLogger(__name__)
+
+
+class RequestEvent:
+    """
+    what hooks get to see of one api call
+
+    `endpoint`: client method name e.g 'rechargePinless'
+    `method`, `path`: http method and api path
+    `reference`: `x-agent-reference` the request is sent with
+    `payload_size`: request body bytes
+    `timestamp`: wall clock time the request was sent
+    `sent_at`: `time.monotonic()` the request was sent at
+    `elapsed`: seconds until the response was processed, set after the call
+    `status_code`: http status, `reply`: parsed api reply, `error`: exception the call failed with, set after the call
+    `attempt`: attempt number, `on_retry` only
+    `span`: tracing span when `OpenTelemetryHooks` are used
+    `context`: free dict for hooks to carry state from `before_request` to `after_response`
+    """
+
+    __slots__ = (
+        "endpoint",
+        "method",
+        "path",
+        "reference",
+        "payload_size",
+        "timestamp",
+        "sent_at",
+        "elapsed",
+        "status_code",
+        "reply",
+        "error",
+        "attempt",
+        "span",
+        "context",
+    )
+
+    def __init__(
+        self,
+        endpoint: str,
+        method: str = None,
+        path: str = None,
+        reference: str = None,
+        payload_size: int = 0,
+        sent_at: float = None,
+        attempt: int = None,
+        error: Exception = None,
+    ):
+        self.endpoint = endpoint
+        self.method = method
+        self.path = path
+        self.reference = reference
+        self.payload_size = payload_size
+        self.timestamp = time.time()
+        self.sent_at = sent_at
+        self.elapsed = None
+        self.status_code = None
+        self.reply = None
+        self.error = error
+        self.attempt = attempt
+        self.span = None
+        self.context = {}
+
+    def __repr__(self):
+        return f"<RequestEvent: {self.endpoint}, {self.reference}, elapsed={self.elapsed}>"
+
+    @property
+    def reply_code(self):
+        if isinstance(self.reply, dict) and self.reply.get("ReplyCode") is not None:
+            return int(self.reply["ReplyCode"])
+
+        return None
+
+
+class RequestHooks:
+    """
+    callbacks run around every api call a client sends, each called with a `RequestEvent`
+
+    `before_request`: the request is about to be sent
+    `after_response`: a successful reply was processed
+    `on_error`: the call failed, with an api exception (`event.reply` holds the reply) or a transport error
+    `on_retry`: a failed attempt is about to be retried, see `RetryPolicy`
+
+    hooks run inline on the calling thread / event loop, keep them fast.
+    an exception raised by a hook is logged and never fails the api call
+
+    >>> hooks = hotrecharge.RequestHooks(
+            after_response=lambda event: log.info('%s %s %.3fs', event.endpoint, event.reference, event.elapsed)
+        )
+    >>> api = hotrecharge.HotRecharge(config, hooks=hooks)
+
+    >>> @hooks.on('on_error')
+        def failed(event):
+            log.warning('%s %s failed: %s', event.endpoint, event.reference, event.error)
+    """
+
+    EVENTS = ("before_request", "after_response", "on_error", "on_retry")
+
+    def __init__(self, before_request=None, after_response=None, on_error=None, on_retry=None):
+        self.__callbacks = {name: [] for name in self.EVENTS}
+
+        for name, callback in zip(self.EVENTS, (before_request, after_response, on_error, on_retry)):
+            if callback is not None:
+                self.on(name, callback)
+
+    def __repr__(self):
+        return f"<{type(self).__name__}: { {name: len(callbacks) for name, callbacks in self.__callbacks.items()} }>"
+
+    def on(self, event: str, callback=None):
+        """
+        register `callback` for `event`, usable as a decorator
+        """
+        if event not in self.__callbacks:
+            raise ValueError(f"unknown hook event '{event}', expected one of {self.EVENTS}")
+
+        if callback is None:
+            return lambda fn: self.on(event, fn)
+
+        self.__callbacks[event].append(callback)
+
+        return callback
+
+    def emit(self, event: str, request: RequestEvent) -> None:
+        for callback in self.__callbacks[event]:
+            try:
+                callback(request)
+
+            except Exception:
+                logger.exception("hotrecharge %s hook %r failed", event, callback)
+
+
+class OpenTelemetryHooks(RequestHooks):
+    """
+    `RequestHooks` that wrap every api call in an opentelemetry client span
+
+    spans are named `hotrecharge <endpoint>` and carry the endpoint, agent reference, payload size,
+    http status and reply code, failures are recorded on the span. retries are added as
+    `hotrecharge.retry` events to the span current at the time, e.g your recharge pipeline span.
+    the span is set on `event.span` so other hooks can add attributes
+
+    needs the optional `opentelemetry-api` dependency
+
+    >>> pip install hot-recharge[tracing]
+
+    >>> api = hotrecharge.HotRecharge(config, hooks=hotrecharge.OpenTelemetryHooks())
+    """
+
+    def __init__(self, tracer=None, before_request=None, after_response=None, on_error=None, on_retry=None):
+        if otel_trace is None:
+            raise ImportError("OpenTelemetryHooks requires `opentelemetry-api`, install it with `pip install hot-recharge[tracing]`")
+
+        super().__init__()
+
+        self.tracer = tracer or otel_trace.get_tracer("hotrecharge")
+
+        # the span starts before the user hooks run and ends after them, so those see `event.span`
+        self.on("before_request", self.__startSpan)
+        self.on("on_retry", self.__retryEvent)
+
+        for name, callback in zip(self.EVENTS, (before_request, after_response, on_error, on_retry)):
+            if callback is not None:
+                self.on(name, callback)
+
+    def emit(self, event: str, request: RequestEvent) -> None:
+        super().emit(event, request)
+
+        if event in ("after_response", "on_error"):
+            self.__endSpan(request)
+
+    def __startSpan(self, event: RequestEvent) -> None:
+        event.span = self.tracer.start_span(
+            f"hotrecharge {event.endpoint}",
+            kind=SpanKind.CLIENT,
+            attributes={
+                "hotrecharge.endpoint": event.endpoint,
+                "hotrecharge.agent_reference": event.reference or "",
+                "hotrecharge.payload_size": event.payload_size,
+                "http.request.method": event.method or "",
+                "url.path": event.path or "",
+            },
+        )
+
+    def __endSpan(self, event: RequestEvent) -> None:
+        span = event.span
+
+        if span is None:
+            return
+
+        if event.status_code is not None:
+            span.set_attribute("http.response.status_code", event.status_code)
+
+        if event.reply_code is not None:
+            span.set_attribute("hotrecharge.reply_code", event.reply_code)
+
+        if event.error is not None:
+            span.record_exception(event.error)
+            span.set_status(Status(StatusCode.ERROR, f"{type(event.error).__name__}: {event.error}"))
+
+        span.end()
+
+    def __retryEvent(self, event: RequestEvent) -> None:
+        otel_trace.get_current_span().add_event(
+            "hotrecharge.retry",
+            {
+                "hotrecharge.endpoint": event.endpoint,
+                "hotrecharge.agent_reference": event.reference or "",
+                "hotrecharge.attempt": event.attempt,
+                "exception.type": type(event.error).__name__,
+            },
+        )
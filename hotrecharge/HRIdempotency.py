@@ -0,0 +1,486 @@
+"""
+    @author:    DonnC <https://github.com/DonnC>
+    @created:   Oct 2026
+
+    idempotency guard, one recharge per caller supplied order key
+"""
+
+import asyncio
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from .HRCodec import JsonCodec, defaultCodec
+from .HRTimeout import deadlineRemaining
+from .HotRechargeException import (
+    DuplicateReference,
+    HotRechargeException,
+    IdempotencyConflict,
+    PendingZesaTransaction,
+    RequestTimeout,
+    TransactionStateUnknown,
+)
+
+IN_FLIGHT = "in_flight"
+DONE = "done"
+UNKNOWN = "unknown"
+
+# the recharge may have gone through, the order keeps its reference
+_AMBIGUOUS = (TransactionStateUnknown, RequestTimeout, PendingZesaTransaction, DuplicateReference)
+
+
+class _Order:
+    # state of one order key
+    __slots__ = (
+        "key", "state", "reference", "fingerprint", "result", "data", "error", "expires_at", "claimed_at", "done", "future"
+    )
+
+    def __init__(self, key: str, state: str, reference: str, fingerprint: str = None, data=None, expires_at: float = None):
+        self.key = key
+        self.state = state
+        self.reference = reference
+        self.fingerprint = fingerprint
+        self.result = None
+        self.data = data
+        self.error = None
+        self.expires_at = expires_at
+        self.claimed_at = None
+        self.done = threading.Event()
+        self.future = None
+
+    def toDict(self) -> dict:
+        return {
+            "state": self.state,
+            "reference": self.reference,
+            "fingerprint": self.fingerprint,
+            "response": self.data,
+            "expires_at": self.expires_at,
+            "claimed_at": self.claimed_at,
+        }
+
+
+class IdempotencyStore:
+    """
+    base class for persistent order key stores, records are dicts with `state`, `reference`,
+    `fingerprint`, `response`, `expires_at` and `claimed_at`
+
+    subclass and override `get()`, `claim()`, `put()` and `delete()` to keep order keys in your own database.
+    `claim()` must be atomic for processes sharing the store to send each order once
+    """
+
+    def get(self, key: str) -> dict or None:
+        raise NotImplementedError
+
+    def claim(self, key: str, record: dict, previous: dict = None) -> bool:
+        """
+        store `record` only if the stored record of `key` is still `previous` (None -> no record),
+        False when another caller changed it first
+        """
+        raise NotImplementedError
+
+    def put(self, key: str, record: dict) -> None:
+        raise NotImplementedError
+
+    def delete(self, key: str) -> None:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        pass
+
+
+class SQLiteIdempotencyStore(IdempotencyStore):
+    """
+    order keys in a sqlite database, survives restarts and can be shared by processes on one host,
+    claims are atomic so only one process sends an order
+
+    `path`: database file
+    `codec`: json codec of the stored responses. Defaults to the fastest installed one
+    """
+
+    _COLUMNS = "state, reference, fingerprint, response, expires_at, claimed_at"
+
+    def __init__(self, path: str, codec: JsonCodec = None):
+        self.path = path
+        self.codec = codec or defaultCodec()
+
+        self.__lock = threading.Lock()
+        self.__db = sqlite3.connect(path, isolation_level=None, check_same_thread=False, timeout=30)
+        self.__db.execute("PRAGMA journal_mode=WAL")
+        self.__db.execute("PRAGMA synchronous=NORMAL")
+        self.__db.execute(
+            "CREATE TABLE IF NOT EXISTS orders (key TEXT PRIMARY KEY, state TEXT NOT NULL, reference TEXT, "
+            "fingerprint TEXT, response TEXT, expires_at REAL, claimed_at REAL)"
+        )
+
+    def __repr__(self):
+        return f"<SQLiteIdempotencyStore: {self.path}>"
+
+    def __row(self, key: str, record: dict) -> tuple:
+        response = record.get("response")
+        response = None if response is None else self.codec.dumps(response).decode("utf-8")
+
+        return (
+            record["state"],
+            record.get("reference"),
+            record.get("fingerprint"),
+            response,
+            record.get("expires_at"),
+            record.get("claimed_at"),
+            key,
+        )
+
+    def get(self, key: str) -> dict or None:
+        with self.__lock:
+            row = self.__db.execute(f"SELECT {self._COLUMNS} FROM orders WHERE key = ?", (key,)).fetchone()
+
+        if row is None:
+            return None
+
+        state, reference, fingerprint, response, expires_at, claimed_at = row
+
+        return {
+            "state": state,
+            "reference": reference,
+            "fingerprint": fingerprint,
+            "response": None if response is None else self.codec.loads(response),
+            "expires_at": expires_at,
+            "claimed_at": claimed_at,
+        }
+
+    def claim(self, key: str, record: dict, previous: dict = None) -> bool:
+        row = self.__row(key, record)
+
+        with self.__lock:
+            if previous is None:
+                cursor = self.__db.execute(
+                    f"INSERT INTO orders ({self._COLUMNS}, key) VALUES (?, ?, ?, ?, ?, ?, ?) ON CONFLICT (key) DO NOTHING",
+                    row,
+                )
+
+            else:
+                # compare and set, a claim stamps `claimed_at` so it tells records of the same state apart
+                cursor = self.__db.execute(
+                    "UPDATE orders SET state = ?, reference = ?, fingerprint = ?, response = ?, expires_at = ?, "
+                    "claimed_at = ? WHERE key = ? AND state = ? AND claimed_at IS ?",
+                    row + (previous["state"], previous.get("claimed_at")),
+                )
+
+            return cursor.rowcount == 1
+
+    def put(self, key: str, record: dict) -> None:
+        with self.__lock:
+            self.__db.execute(
+                f"INSERT OR REPLACE INTO orders ({self._COLUMNS}, key) VALUES (?, ?, ?, ?, ?, ?, ?)", self.__row(key, record)
+            )
+
+    def delete(self, key: str) -> None:
+        with self.__lock:
+            self.__db.execute("DELETE FROM orders WHERE key = ?", (key,))
+
+    def purge(self) -> int:
+        """
+        delete expired order keys, returns how many
+        """
+        with self.__lock:
+            return self.__db.execute("DELETE FROM orders WHERE expires_at < ?", (time.time(),)).rowcount
+
+    def close(self) -> None:
+        with self.__lock:
+            self.__db.close()
+
+
+class IdempotencyGuard:
+    """
+    at most one recharge per caller supplied order key
+
+    the first call for an order key sends the recharge, calls for the same key while it is in flight
+    wait for it and get the same response (or exception), later calls within `window` seconds get
+    the stored response without calling the api
+
+    the order key keeps the agent reference of its first attempt. when an attempt fails with the
+    outcome unknown (timeouts, transport errors, `TransactionStateUnknown`, pending zesa), the next call
+    first looks the reference up with `queryTransactionReference` and only sends the recharge again,
+    with the same reference, if the api has no record of it. a recharge the api rejected
+    (e.g `InsufficientBalance`) frees its order key
+
+    `window`: seconds an order key is remembered after its recharge completed. Defaults to 86400
+    `max_keys`: max completed order keys kept in memory, least recently used ones are dropped first,
+        orders in flight are kept apart and never dropped. Defaults to 100000
+    `store`: Optional `IdempotencyStore` keeping order keys across restarts and processes, e.g `SQLiteIdempotencyStore`
+    `in_flight_timeout`: seconds after which an order another process claimed but never finished, e.g it crashed,
+        is taken over. Keep it above your longest recharge call. Defaults to 300
+    `poll_interval`: seconds between store checks while another process has the order in flight. Defaults to 0.1
+
+    >>> guard = hotrecharge.IdempotencyGuard(window=3600, store=hotrecharge.SQLiteIdempotencyStore('orders.db'))
+    >>> api = hotrecharge.HotRecharge(config, idempotency=guard)
+
+    >>> # redelivered queue messages recharge the customer once
+    >>> api.rechargePinless(amount=1, number='0771234567', order_key=message.order_id)
+
+    an order key used again for a different recharge raises `IdempotencyConflict`
+    """
+
+    def __init__(
+        self,
+        window: float = 86400,
+        max_keys: int = 100000,
+        store: IdempotencyStore = None,
+        in_flight_timeout: float = 300,
+        poll_interval: float = 0.1,
+    ):
+        if max_keys < 1:
+            raise ValueError("max_keys must be at least 1")
+
+        self.window = window
+        self.max_keys = max_keys
+        self.store = store
+        self.in_flight_timeout = in_flight_timeout
+        self.poll_interval = poll_interval
+
+        self.__orders = OrderedDict()
+        self.__in_flight = {}
+        self.__lock = threading.Lock()
+
+    def __repr__(self):
+        return f"<IdempotencyGuard: {len(self)} order keys, window={self.window}>"
+
+    def __len__(self):
+        return len(self.__orders) + len(self.__in_flight)
+
+    def __lookup(self, key: str, now: float) -> _Order or None:
+        # order of `key` in memory, None when unseen or expired. under the lock
+        order = self.__in_flight.get(key)
+
+        if order is not None:
+            return order
+
+        order = self.__orders.get(key)
+
+        if order is None:
+            return None
+
+        if order.expires_at is not None and order.expires_at <= now:
+            del self.__orders[key]
+            return None
+
+        self.__orders.move_to_end(key)
+
+        return order
+
+    def __remember(self, order: _Order) -> None:
+        # keep a completed order, dropping the least recently used ones past `max_keys`. under the lock
+        self.__orders[order.key] = order
+        self.__orders.move_to_end(order.key)
+
+        while len(self.__orders) > self.max_keys:
+            self.__orders.popitem(last=False)
+
+    @staticmethod
+    def __conflict(key: str, fingerprint: str, stored: str) -> None:
+        if fingerprint and stored and fingerprint != stored:
+            raise IdempotencyConflict(f"order key '{key}' was used for a different recharge")
+
+    def __claim(self, key: str, reference: str, fingerprint: str = None) -> tuple:
+        # (order, leader, resend), the leader sends the recharge, `resend` -> an earlier attempt may have gone through.
+        # order None -> another process has it in flight, check again later
+        with self.__lock:
+            now = time.time()
+            order = self.__lookup(key, now)
+
+            if order is not None:
+                self.__conflict(key, fingerprint, order.fingerprint)
+
+                if order.state != UNKNOWN:
+                    return order, False, False
+
+            if self.store is None:
+                resend = order is not None
+                order = _Order(key, IN_FLIGHT, order.reference if resend else reference, fingerprint)
+                self.__in_flight[key] = order
+
+                return order, True, resend
+
+        # store i/o outside the lock, the store claim itself is atomic across threads and processes
+        order, resend = self.__claimStored(key, reference, fingerprint, now)
+
+        with self.__lock:
+            if order is None:
+                # claimed by another thread of this process meanwhile, wait for it in memory
+                order = self.__lookup(key, time.time())
+
+                if order is None or order.state == UNKNOWN:
+                    return None, False, False
+
+                return order, False, False
+
+            if order.state != IN_FLIGHT:
+                self.__remember(order)
+                return order, False, False
+
+            self.__in_flight[key] = order
+
+        return order, True, resend
+
+    def __claimStored(self, key: str, reference: str, fingerprint: str, now: float) -> tuple:
+        # (order, resend) claimed atomically in the store, the reference is on disk before the recharge is sent.
+        # a completed order comes back as is, None -> claimed by another process
+        stored = self.store.get(key)
+        resend = False
+
+        if stored is not None and not (stored["expires_at"] is not None and stored["expires_at"] <= now):
+            self.__conflict(key, fingerprint, stored["fingerprint"])
+
+            if stored["state"] == DONE:
+                order = _Order(key, DONE, stored["reference"], stored["fingerprint"], stored["response"], stored["expires_at"])
+                order.done.set()
+                return order, False
+
+            if stored["state"] == IN_FLIGHT and now - (stored["claimed_at"] or 0) < self.in_flight_timeout:
+                return None, False
+
+            # unknown outcome, or claimed by a process that died mid-flight
+            resend, reference = True, stored["reference"]
+
+        order = _Order(key, IN_FLIGHT, reference, fingerprint)
+        order.claimed_at = now
+
+        if not self.store.claim(key, order.toDict(), stored):
+            return None, False
+
+        return order, resend
+
+    def __finish(self, order: _Order, result=None, error: BaseException = None) -> None:
+        order.result = result
+        order.error = error
+        order.expires_at = time.time() + self.window
+
+        if error is None:
+            order.state = DONE
+            order.data = result.toDict() if hasattr(result, "toDict") else result
+
+        elif isinstance(error, HotRechargeException) and not isinstance(error, _AMBIGUOUS):
+            # rejected, nothing was recharged, the order can be placed again
+            order.state = None
+
+        else:
+            order.state = UNKNOWN
+
+        with self.__lock:
+            if self.__in_flight.get(order.key) is order:
+                del self.__in_flight[order.key]
+
+                if order.state is not None:
+                    self.__remember(order)
+
+        if self.store is not None:
+            if order.state is None:
+                self.store.delete(order.key)
+
+            else:
+                self.store.put(order.key, order.toDict())
+
+        order.done.set()
+
+        if order.future is not None and not order.future.done():
+            order.future.set_result(None)
+
+    def __pollDelay(self) -> float:
+        # sleep before checking the store again, a call deadline running out raises `RequestTimeout`
+        remaining = deadlineRemaining()
+
+        if remaining is not None and remaining <= 0:
+            raise RequestTimeout("call deadline exceeded waiting for an order in flight in another process")
+
+        return self.poll_interval if remaining is None else min(self.poll_interval, remaining)
+
+    @staticmethod
+    def __outcome(order: _Order, restore=None):
+        # response of a completed order, or the exception it failed with
+        if order.error is not None:
+            raise order.error
+
+        if order.result is None and order.data is not None:
+            order.result = restore(order.data) if restore is not None else order.data
+
+        return order.result
+
+    def do(self, key: str, fn, reference: str, fingerprint: str = None, restore=None):
+        """
+        run the recharge of order `key` once
+        :param fn: sends the recharge, called with (reference, resend)
+        :param reference: agent reference of a first attempt
+        :param fingerprint: Optional, identifies the recharge, a different one for the same key raises `IdempotencyConflict`
+        :param restore: Optional, turns a response loaded from the store back into what the client returns
+        """
+        order, leader, resend = self.__claim(key, reference, fingerprint)
+
+        while order is None:
+            # in flight in another process
+            time.sleep(self.__pollDelay())
+            order, leader, resend = self.__claim(key, reference, fingerprint)
+
+        if not leader:
+            if not order.done.wait(deadlineRemaining()):
+                raise RequestTimeout(f"call deadline exceeded waiting for order '{key}' in flight")
+
+            return self.__outcome(order, restore)
+
+        try:
+            result = fn(order.reference, resend)
+
+        except BaseException as err:
+            self.__finish(order, error=err)
+            raise
+
+        self.__finish(order, result)
+
+        return result
+
+    async def doAsync(self, key: str, fn, reference: str, fingerprint: str = None, restore=None):
+        """
+        `do()` where `fn` returns an awaitable
+        """
+        order, leader, resend = self.__claim(key, reference, fingerprint)
+
+        while order is None:
+            await asyncio.sleep(self.__pollDelay())
+            order, leader, resend = self.__claim(key, reference, fingerprint)
+
+        if not leader:
+            if order.future is not None:
+                # a cancelled or timed out follower must not cancel the shared call
+                await asyncio.wait({order.future}, timeout=deadlineRemaining())
+
+            elif not order.done.is_set():
+                # in flight on another thread
+                await asyncio.get_running_loop().run_in_executor(None, order.done.wait, deadlineRemaining())
+
+            if not order.done.is_set():
+                raise RequestTimeout(f"call deadline exceeded waiting for order '{key}' in flight")
+
+            return self.__outcome(order, restore)
+
+        order.future = asyncio.get_running_loop().create_future()
+
+        try:
+            result = await fn(order.reference, resend)
+
+        except BaseException as err:
+            self.__finish(order, error=err)
+            raise
+
+        self.__finish(order, result)
+
+        return result
+
+    def forget(self, key: str) -> None:
+        """
+        drop order `key`, the next call for it recharges again
+        """
+        with self.__lock:
+            self.__orders.pop(key, None)
+            self.__in_flight.pop(key, None)
+
+        if self.store is not None:
+            self.store.delete(key)
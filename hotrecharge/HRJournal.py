@@ -0,0 +1,582 @@
+"""
+    @author:    DonnC <https://github.com/DonnC>
+    @created:   Oct 2026
+
+    durable write-ahead journal of recharges, recovered after a crash
+"""
+
+import asyncio
+import os
+import sqlite3
+import threading
+import time
+
+from .HRCodec import JsonCodec, defaultCodec
+from .HRModels import ResponseModel
+from .HotRechargeException import (
+    HotRechargeException,
+    PendingZesaTransaction,
+    TransactionNotFound,
+    TransactionStateUnknown,
+)
+
+
+def _field(response, name: str):
+    # read a field from a dict, Munch or typed model response
+    if response is None:
+        return None
+
+    if isinstance(response, ResponseModel):
+        response = response.toDict()
+
+    return response.get(name) if isinstance(response, dict) else getattr(response, name, None)
+
+
+class JournalEntry:
+    """
+    one journaled recharge
+
+    `reference`: agent reference the recharge was sent with
+    `endpoint`: api path, e.g 'agents/recharge-pinless'
+    `payload`: request payload
+    `status`: 'sent' (no outcome recorded), 'unknown', 'pending' (zesa), or once resolved 'ok', 'failed', 'not_found'
+    `reply_code`, `recharge_id`, `error`: from the outcome, when known
+    `started_at`: wall clock time the recharge was journaled
+    """
+
+    __slots__ = ("reference", "endpoint", "payload", "status", "reply_code", "recharge_id", "error", "started_at")
+
+    def __init__(
+        self,
+        reference: str,
+        endpoint: str,
+        payload: dict = None,
+        status: str = "sent",
+        reply_code: int = None,
+        recharge_id=None,
+        error: str = None,
+        started_at: float = None,
+    ):
+        self.reference = reference
+        self.endpoint = endpoint
+        self.payload = payload
+        self.status = status
+        self.reply_code = reply_code
+        self.recharge_id = recharge_id
+        self.error = error
+        self.started_at = time.time() if started_at is None else started_at
+
+    def __repr__(self):
+        return f"<JournalEntry: {self.reference}, {self.endpoint}, {self.status}>"
+
+    def toDict(self) -> dict:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class TransactionJournal:
+    """
+    base class for write-ahead journals of recharges
+
+    a client given a journal records every write request (endpoint, agent reference, payload) before
+    it is sent and its outcome after. should the process die in between, the entry stays unresolved
+    and `recover()` establishes its outcome on the next start with `queryTransactionReference`, or
+    `queryZesaTransaction` for pending zesa recharges
+
+    outcomes, `'ok'` / `'failed'` / `'not_found'` are resolved, the rest stay pending:
+    `'sent'`: journaled, no outcome recorded, e.g the process died
+    `'unknown'`: failed mid-flight, the recharge may or may not have gone through
+    `'pending'`: zesa recharge pending, see `PendingZesaTransaction`
+
+    use `FileJournal` or `SQLiteJournal`, or subclass and override `_begin()`, `_end()`, `pending()` and `close()`
+
+    >>> journal = hotrecharge.FileJournal('recharges.journal')
+    >>> api = hotrecharge.HotRecharge(config, journal=journal)
+
+    >>> # on startup
+    >>> journal.recover(api, callback=lambda entry, response, error: print(entry.reference, entry.status))
+    """
+
+    RESOLVED = ("ok", "failed", "not_found")
+
+    def __repr__(self):
+        return f"<{type(self).__name__}: {len(self.pending())} pending>"
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def started(self, endpoint: str, reference: str, payload: dict = None) -> None:
+        """
+        journal a write request about to be sent
+        """
+        self._begin(JournalEntry(reference, endpoint, payload))
+
+    def finished(self, reference: str, response=None, error: Exception = None, sent: bool = True) -> str:
+        """
+        journal the outcome of a write request
+        :param response: processed api response, None when it failed
+        :param error: exception the request failed with
+        :param sent: False when the request is known to have never reached the api
+        :return: status recorded
+        """
+        status, reply_code, recharge_id = "ok", _field(response, "ReplyCode"), _field(response, "RechargeID")
+
+        if error is not None:
+            reply_code = recharge_id = None
+
+            if isinstance(error, PendingZesaTransaction):
+                status, recharge_id = "pending", _field(error.response, "RechargeID")
+
+            elif isinstance(error, TransactionStateUnknown):
+                status = "unknown"
+
+            elif isinstance(error, HotRechargeException):
+                # rejected by the api, or by the client before sending
+                status, reply_code = "failed", _field(error.response, "ReplyCode")
+
+            else:
+                status = "unknown" if sent else "failed"
+
+        self._end(reference, status, reply_code, recharge_id, None if error is None else f"{type(error).__name__}: {error}")
+
+        return status
+
+    def _begin(self, entry: JournalEntry) -> None:
+        raise NotImplementedError
+
+    def _end(self, reference: str, status: str, reply_code=None, recharge_id=None, error: str = None) -> None:
+        raise NotImplementedError
+
+    def pending(self) -> list:
+        """
+        unresolved `JournalEntry`s, oldest first
+        """
+        raise NotImplementedError
+
+    def close(self) -> None:
+        pass
+
+    def __recovered(self, api, entry: JournalEntry, query, error: Exception, callback) -> str:
+        # record what a recovery query established about `entry`
+        response = outcome = None
+
+        if error is None and entry.recharge_id is None:
+            try:
+                # the original response, a failed original raises its api exception
+                response = api._reconciledResponse(entry.endpoint, query)
+
+            except HotRechargeException as err:
+                outcome = err
+
+        elif error is None:
+            response = query
+
+        if isinstance(error, TransactionNotFound):
+            # never reached the api, safe to send again
+            status = "not_found"
+            self._end(entry.reference, status, error=f"{type(error).__name__}: {error}")
+
+        elif error is not None:
+            # the query itself failed and says nothing about the recharge, try again on the next recovery
+            status = entry.status
+
+        else:
+            status = self.finished(entry.reference, response, outcome)
+
+        entry.status = status
+
+        if callback is not None:
+            callback(entry, response, error or outcome)
+
+        return status
+
+    def __counts(self, counts: dict, status: str) -> None:
+        key = status if status in self.RESOLVED else "unresolved"
+        counts[key] = counts.get(key, 0) + 1
+
+    def recover(self, api, callback=None) -> dict:
+        """
+        establish the outcome of every unresolved entry with a `HotRecharge` client,
+        an entry whose query fails (other than `TransactionNotFound`) stays unresolved for the next recovery
+        :param api: a `HotRecharge` client
+        :param callback: Optional, called with (entry, response, error) for every entry,
+            `entry.status` 'not_found' means the recharge never reached the api and can be sent again
+        :return: counts by outcome, {'ok': 3, 'failed': 1, 'not_found': 1, 'unresolved': 0}
+        """
+        counts = dict.fromkeys(self.RESOLVED + ("unresolved",), 0)
+
+        for entry in self.pending():
+            try:
+                if entry.recharge_id is not None:
+                    query = api.queryZesaTransaction(entry.recharge_id)
+
+                else:
+                    query = api.queryTransactionReference(entry.reference)
+
+            except Exception as err:
+                self.__counts(counts, self.__recovered(api, entry, None, err, callback))
+
+            else:
+                self.__counts(counts, self.__recovered(api, entry, query, None, callback))
+
+        return counts
+
+    async def recoverAsync(self, api, callback=None) -> dict:
+        """
+        `recover()` with an `AsyncHotRecharge` client
+        """
+        counts = dict.fromkeys(self.RESOLVED + ("unresolved",), 0)
+
+        for entry in self.pending():
+            try:
+                if entry.recharge_id is not None:
+                    query = await api.queryZesaTransaction(entry.recharge_id)
+
+                else:
+                    query = await api.queryTransactionReference(entry.reference)
+
+            except asyncio.CancelledError:
+                raise
+
+            except Exception as err:
+                self.__counts(counts, self.__recovered(api, entry, None, err, callback))
+
+            else:
+                self.__counts(counts, self.__recovered(api, entry, query, None, callback))
+
+        return counts
+
+
+class FileJournal(TransactionJournal):
+    """
+    append-only journal file, one json line per record
+
+    every record is written straight to the os with a single `write()`, surviving a crash of the
+    process. `fsync()` is batched by a background thread every `fsync_interval` seconds, so a power
+    loss can lose at most that window of records while a journaled recharge costs a few microseconds
+
+    `path`: journal file, replayed on open, a torn last line of a crashed write is skipped
+    `fsync_interval`: seconds between batched fsyncs. 0 -> fsync every record, None -> leave it to the os. Defaults to 0.05
+    `codec`: json codec of the records. Defaults to the fastest installed one
+
+    resolved entries are kept as an audit trail, drop them with `compact()`.
+    one process per journal file
+    """
+
+    def __init__(self, path: str, fsync_interval: float = 0.05, codec: JsonCodec = None):
+        self.path = path
+        self.fsync_interval = fsync_interval
+        self.codec = codec or defaultCodec()
+
+        self.__lock = threading.Lock()
+        self.__entries = {}
+        self.__dirty = False
+        self.__closed = threading.Event()
+        self.__flusher = None
+
+        self.__fd = self.__open()
+
+        if fsync_interval:
+            self.__flusher = threading.Thread(target=self.__flushLoop, name="hotrecharge-journal", daemon=True)
+            self.__flusher.start()
+
+    def __open(self) -> int:
+        torn = False
+
+        if os.path.exists(self.path):
+            with open(self.path, "rb") as fh:
+                for line in fh:
+                    torn = not line.endswith(b"\n")
+                    self.__replay(line)
+
+        fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o600)
+
+        if torn:
+            # start a fresh line after a record torn by a crash
+            os.write(fd, b"\n")
+
+        return fd
+
+    def __replay(self, line: bytes) -> None:
+        try:
+            record = self.codec.loads(line)
+
+        except ValueError:
+            return
+
+        if not isinstance(record, dict) or "ref" not in record:
+            return
+
+        if record.get("op") == "begin":
+            self.__entries[record["ref"]] = JournalEntry(
+                record["ref"], record.get("endpoint"), record.get("payload"), started_at=record.get("ts")
+            )
+
+        else:
+            self.__apply(record["ref"], record.get("status"), record.get("reply_code"), record.get("recharge_id"), record.get("error"))
+
+    def __apply(self, reference: str, status: str, reply_code=None, recharge_id=None, error: str = None) -> None:
+        if status in self.RESOLVED:
+            self.__entries.pop(reference, None)
+            return
+
+        entry = self.__entries.get(reference)
+
+        if entry is not None:
+            entry.status = status
+            entry.reply_code = reply_code
+            entry.error = error
+
+            if recharge_id is not None:
+                entry.recharge_id = recharge_id
+
+    def __append(self, line: bytes) -> None:
+        # callers hold the lock, so a record reaches the file and `__entries` before `compact()` can run
+        if self.__closed.is_set():
+            raise ValueError(f"journal {self.path} is closed")
+
+        os.write(self.__fd, line)
+
+        if self.fsync_interval == 0:
+            os.fsync(self.__fd)
+
+        else:
+            self.__dirty = True
+
+    def __flushLoop(self) -> None:
+        while not self.__closed.wait(self.fsync_interval):
+            self.flush()
+
+    def flush(self) -> None:
+        """
+        fsync records written since the last fsync
+        """
+        with self.__lock:
+            if not self.__dirty or self.__closed.is_set():
+                return
+
+            self.__dirty = False
+            # a duplicate stays valid should `compact()` close and replace the journal fd meanwhile
+            fd = os.dup(self.__fd)
+
+        try:
+            # outside the lock so journaling goes on while the disk syncs
+            os.fsync(fd)
+
+        finally:
+            os.close(fd)
+
+    def _begin(self, entry: JournalEntry) -> None:
+        line = self.codec.dumps({
+            "op": "begin",
+            "ref": entry.reference,
+            "endpoint": entry.endpoint,
+            "payload": entry.payload,
+            "ts": entry.started_at,
+        }) + b"\n"
+
+        with self.__lock:
+            self.__append(line)
+            self.__entries[entry.reference] = entry
+
+    def _end(self, reference: str, status: str, reply_code=None, recharge_id=None, error: str = None) -> None:
+        line = self.codec.dumps({
+            "op": "end",
+            "ref": reference,
+            "status": status,
+            "reply_code": reply_code,
+            "recharge_id": recharge_id,
+            "error": error,
+            "ts": time.time(),
+        }) + b"\n"
+
+        with self.__lock:
+            self.__append(line)
+            self.__apply(reference, status, reply_code, recharge_id, error)
+
+    def pending(self) -> list:
+        with self.__lock:
+            entries = [JournalEntry(**entry.toDict()) for entry in self.__entries.values()]
+
+        return sorted(entries, key=lambda entry: entry.started_at or 0)
+
+    def compact(self) -> None:
+        """
+        rewrite the journal with only the unresolved entries
+        """
+        tmp = f"{self.path}.tmp"
+
+        with self.__lock:
+            with open(tmp, "wb") as fh:
+                for entry in self.__entries.values():
+                    fh.write(self.codec.dumps({
+                        "op": "begin",
+                        "ref": entry.reference,
+                        "endpoint": entry.endpoint,
+                        "payload": entry.payload,
+                        "ts": entry.started_at,
+                    }) + b"\n")
+
+                    if entry.status != "sent":
+                        fh.write(self.codec.dumps({
+                            "op": "end",
+                            "ref": entry.reference,
+                            "status": entry.status,
+                            "reply_code": entry.reply_code,
+                            "recharge_id": entry.recharge_id,
+                            "error": entry.error,
+                        }) + b"\n")
+
+                fh.flush()
+                os.fsync(fh.fileno())
+
+            # write then rename, a crash mid compaction leaves the old journal intact
+            os.replace(tmp, self.path)
+            os.close(self.__fd)
+            self.__fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o600)
+            self.__dirty = False
+
+    def close(self) -> None:
+        if self.__closed.is_set():
+            return
+
+        with self.__lock:
+            self.__closed.set()
+
+        if self.__flusher is not None:
+            self.__flusher.join()
+
+        with self.__lock:
+            os.fsync(self.__fd)
+            os.close(self.__fd)
+
+
+class SQLiteJournal(TransactionJournal):
+    """
+    journal in a sqlite database, one row per recharge, queryable with any sqlite tool
+
+    the database runs in wal mode, every record is committed before the call goes on so it survives a
+    crash of the process. commits are not fsynced (`synchronous=NORMAL`), a background thread runs a wal
+    checkpoint, which fsyncs the wal, every `fsync_interval` seconds, so a power loss can lose at most
+    that window of records
+
+    `path`: database file
+    `fsync_interval`: seconds between batched fsyncs. 0 -> fsync every commit (`synchronous=FULL`),
+        None -> only at sqlite's automatic checkpoints, every ~1000 wal pages. Defaults to 0.05
+    `codec`: json codec of the payloads. Defaults to the fastest installed one
+
+    >>> sqlite3 recharges.db "select reference, status from journal where status not in ('ok', 'failed', 'not_found')"
+    """
+
+    def __init__(self, path: str, fsync_interval: float = 0.05, codec: JsonCodec = None):
+        self.path = path
+        self.fsync_interval = fsync_interval
+        self.codec = codec or defaultCodec()
+
+        self.__lock = threading.Lock()
+        self.__db = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        self.__db.execute("PRAGMA journal_mode=WAL")
+        self.__db.execute(f"PRAGMA synchronous={'FULL' if fsync_interval == 0 else 'NORMAL'}")
+        self.__db.execute(
+            "CREATE TABLE IF NOT EXISTS journal ("
+            "reference TEXT PRIMARY KEY, endpoint TEXT, payload TEXT, status TEXT NOT NULL, reply_code INTEGER, "
+            "recharge_id, error TEXT, started_at REAL, finished_at REAL)"
+        )
+        self.__db.execute("CREATE INDEX IF NOT EXISTS journal_status ON journal (status)")
+
+        self.__dirty = False
+        self.__closed = threading.Event()
+        self.__flusher = None
+
+        # checkpoints run on their own connection, journaling goes on while the disk syncs
+        self.__flush_lock = threading.Lock()
+        self.__checkpointer = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+
+        if fsync_interval:
+            self.__flusher = threading.Thread(target=self.__flushLoop, name="hotrecharge-journal", daemon=True)
+            self.__flusher.start()
+
+    def __flushLoop(self) -> None:
+        while not self.__closed.wait(self.fsync_interval):
+            self.flush()
+
+    def flush(self) -> None:
+        """
+        checkpoint the wal, fsyncing records committed since the last one
+        """
+        with self.__lock:
+            if not self.__dirty or self.__closed.is_set():
+                return
+
+            self.__dirty = False
+
+        with self.__flush_lock:
+            if not self.__closed.is_set():
+                # passive, never waits for readers or writers of other connections
+                self.__checkpointer.execute("PRAGMA wal_checkpoint(PASSIVE)")
+
+    def _begin(self, entry: JournalEntry) -> None:
+        payload = None if entry.payload is None else self.codec.dumps(entry.payload).decode("utf-8")
+
+        with self.__lock:
+            self.__db.execute(
+                "INSERT OR REPLACE INTO journal (reference, endpoint, payload, status, started_at) VALUES (?, ?, ?, ?, ?)",
+                (entry.reference, entry.endpoint, payload, entry.status, entry.started_at),
+            )
+            self.__dirty = True
+
+    def _end(self, reference: str, status: str, reply_code=None, recharge_id=None, error: str = None) -> None:
+        with self.__lock:
+            self.__db.execute(
+                "UPDATE journal SET status = ?, reply_code = ?, recharge_id = COALESCE(?, recharge_id), error = ?, "
+                "finished_at = ? WHERE reference = ?",
+                (status, reply_code, recharge_id, error, time.time(), reference),
+            )
+            self.__dirty = True
+
+    def pending(self) -> list:
+        with self.__lock:
+            rows = self.__db.execute(
+                "SELECT reference, endpoint, payload, status, reply_code, recharge_id, error, started_at FROM journal "
+                f"WHERE status NOT IN ({', '.join('?' * len(self.RESOLVED))}) ORDER BY started_at",
+                self.RESOLVED,
+            ).fetchall()
+
+        return [
+            JournalEntry(
+                reference,
+                endpoint,
+                None if payload is None else self.codec.loads(payload),
+                status,
+                reply_code,
+                recharge_id,
+                error,
+                started_at,
+            )
+            for reference, endpoint, payload, status, reply_code, recharge_id, error, started_at in rows
+        ]
+
+    def compact(self) -> None:
+        """
+        delete resolved entries
+        """
+        with self.__lock:
+            self.__db.execute(f"DELETE FROM journal WHERE status IN ({', '.join('?' * len(self.RESOLVED))})", self.RESOLVED)
+
+    def close(self) -> None:
+        if self.__closed.is_set():
+            return
+
+        self.flush()
+        self.__closed.set()
+
+        if self.__flusher is not None:
+            self.__flusher.join()
+
+        with self.__flush_lock:
+            self.__checkpointer.close()
+
+        with self.__lock:
+            self.__db.close()
@@ -0,0 +1,200 @@
+"""
+    @author:    DonnC <https://github.com/DonnC>
+    @created:   Oct 2026
+
+    per endpoint client metrics, latency histograms, reply code / exception counters and gauges
+"""
+
+import threading
+from bisect import bisect_left
+
+from .HotRechargeException import HotRechargeException
+
+# seconds, upper bounds of the latency histogram buckets
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class _EndpointMetrics:
+    # everything recorded for one endpoint, only touched under the `ClientMetrics` lock
+    __slots__ = ("buckets", "count", "sum", "responses", "errors", "in_flight", "retrying", "retries")
+
+    def __init__(self, bucket_count: int):
+        self.buckets = [0] * (bucket_count + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.responses = {}
+        self.errors = {}
+        self.in_flight = 0
+        self.retrying = 0
+        self.retries = 0
+
+
+class ClientMetrics:
+    """
+    low overhead instrumentation of every api call a client sends
+
+    per endpoint (client method name) it keeps a latency histogram, a counter of replies by
+    `ReplyCode`, a counter of failures by exception class, an in flight gauge, a retrying gauge
+    (calls waiting out a retry backoff) and a retries counter. recording is a few dict updates under one lock
+
+    share one instance between clients to aggregate them
+
+    >>> metrics = hotrecharge.ClientMetrics()
+    >>> api = hotrecharge.HotRecharge(config, metrics=metrics)
+
+    >>> metrics.snapshot()['rechargePinless']['latency']['count']
+    >>> print(metrics.prometheus())
+    """
+
+    def __init__(self, buckets: tuple = DEFAULT_BUCKETS):
+        self.bucket_bounds = tuple(sorted(buckets))
+        self.__endpoints = {}
+        self.__lock = threading.Lock()
+
+    def __repr__(self):
+        return f"<ClientMetrics: {len(self.__endpoints)} endpoints>"
+
+    def __endpoint(self, name: str) -> _EndpointMetrics:
+        metrics = self.__endpoints.get(name)
+
+        if metrics is None:
+            metrics = self.__endpoints[name] = _EndpointMetrics(len(self.bucket_bounds))
+
+        return metrics
+
+    def started(self, endpoint: str) -> None:
+        with self.__lock:
+            self.__endpoint(endpoint).in_flight += 1
+
+    def finished(self, endpoint: str, seconds: float, reply_code=None, error: Exception = None) -> None:
+        """
+        record a finished call
+        :param seconds: time from sending the request to the processed response
+        :param reply_code: api `ReplyCode` (or http status for 401 / 429), None when no reply was received
+        :param error: exception the call failed with, None on success
+        """
+        bucket = bisect_left(self.bucket_bounds, seconds)
+
+        with self.__lock:
+            metrics = self.__endpoint(endpoint)
+            metrics.in_flight -= 1
+            metrics.buckets[bucket] += 1
+            metrics.count += 1
+            metrics.sum += seconds
+
+            if reply_code is not None:
+                metrics.responses[reply_code] = metrics.responses.get(reply_code, 0) + 1
+
+            if error is not None:
+                name = type(error).__name__
+                metrics.errors[name] = metrics.errors.get(name, 0) + 1
+
+    def retryStarted(self, endpoint: str) -> None:
+        with self.__lock:
+            metrics = self.__endpoint(endpoint)
+            metrics.retries += 1
+            metrics.retrying += 1
+
+    def retryFinished(self, endpoint: str) -> None:
+        with self.__lock:
+            self.__endpoint(endpoint).retrying -= 1
+
+    @staticmethod
+    def replyCode(response=None, error: Exception = None, status_code: int = None):
+        """
+        reply code label of a finished call, from the response or the api exception it raised
+        """
+        if error is not None:
+            response = error.response if isinstance(error, HotRechargeException) else None
+
+        if isinstance(response, dict) and response.get("ReplyCode") is not None:
+            return int(response["ReplyCode"])
+
+        return status_code
+
+    def reset(self) -> None:
+        with self.__lock:
+            self.__endpoints.clear()
+
+    def snapshot(self) -> dict:
+        """
+        point in time copy of every metric, safe to serialise
+
+        >>> {
+            'rechargePinless': {
+                'latency': {'buckets': {0.005: 0, ..., '+Inf': 120}, 'count': 120, 'sum': 9.81},
+                'responses': {2: 115, 208: 5},
+                'errors': {'InsufficientBalance': 5},
+                'in_flight': 3,
+                'retrying': 0,
+                'retries': 1,
+            }
+        }
+        """
+        with self.__lock:
+            snapshot = {}
+
+            for name, metrics in self.__endpoints.items():
+                cumulative, buckets = 0, {}
+
+                for bound, count in zip(self.bucket_bounds + ("+Inf",), metrics.buckets):
+                    cumulative += count
+                    buckets[bound] = cumulative
+
+                snapshot[name] = {
+                    "latency": {"buckets": buckets, "count": metrics.count, "sum": metrics.sum},
+                    "responses": dict(metrics.responses),
+                    "errors": dict(metrics.errors),
+                    "in_flight": metrics.in_flight,
+                    "retrying": metrics.retrying,
+                    "retries": metrics.retries,
+                }
+
+        return snapshot
+
+    def prometheus(self, prefix: str = "hotrecharge") -> str:
+        """
+        metrics in the prometheus text exposition format, serve it from your `/metrics` handler
+        """
+        snapshot = self.snapshot()
+        lines = []
+
+        def family(name: str, kind: str, help_text: str):
+            lines.append(f"# HELP {prefix}_{name} {help_text}")
+            lines.append(f"# TYPE {prefix}_{name} {kind}")
+
+        family("request_duration_seconds", "histogram", "api call latency by endpoint")
+
+        for endpoint, metrics in snapshot.items():
+            latency = metrics["latency"]
+
+            for bound, count in latency["buckets"].items():
+                lines.append(f'{prefix}_request_duration_seconds_bucket{{endpoint="{endpoint}",le="{bound}"}} {count}')
+
+            lines.append(f'{prefix}_request_duration_seconds_sum{{endpoint="{endpoint}"}} {latency["sum"]}')
+            lines.append(f'{prefix}_request_duration_seconds_count{{endpoint="{endpoint}"}} {latency["count"]}')
+
+        family("responses_total", "counter", "api replies by endpoint and reply code")
+
+        for endpoint, metrics in snapshot.items():
+            for code, count in metrics["responses"].items():
+                lines.append(f'{prefix}_responses_total{{endpoint="{endpoint}",reply_code="{code}"}} {count}')
+
+        family("errors_total", "counter", "failed api calls by endpoint and exception class")
+
+        for endpoint, metrics in snapshot.items():
+            for exception, count in metrics["errors"].items():
+                lines.append(f'{prefix}_errors_total{{endpoint="{endpoint}",exception="{exception}"}} {count}')
+
+        for name, kind, help_text in (
+            ("in_flight", "gauge", "api calls in flight by endpoint"),
+            ("retrying", "gauge", "api calls waiting out a retry backoff by endpoint"),
+            ("retries", "counter", "api call retries by endpoint"),
+        ):
+            metric = f"{name}_total" if kind == "counter" else name
+            family(metric, kind, help_text)
+
+            for endpoint, metrics in snapshot.items():
+                lines.append(f'{prefix}_{metric}{{endpoint="{endpoint}"}} {metrics[name]}')
+
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,192 @@
+"""
+    @author:    DonnC <https://github.com/DonnC>
+    @created:   Oct 2026
+
+    compact typed response models, returned with `return_model="typed"`
+"""
+
+
+class ResponseModel:
+    """
+    read only view over a parsed api response
+
+    unlike a Munch nothing is copied up front, attributes are read from the
+    response dict on access and nested objects (bundles, stock, tokens, customer info)
+    are only wrapped when first accessed
+
+    >>> model.AgentReference
+    >>> model['AgentReference']
+    >>> model.toDict()
+    """
+
+    __slots__ = ("_data", "_nested")
+
+    # field name -> model class of a nested object or list of objects
+    _children = {}
+
+    def __init__(self, data: dict):
+        self._data = data
+        self._nested = None
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            # unset slots / dunder lookups (copy, pickle) must not recurse into `_data`
+            raise AttributeError(name)
+
+        model = self._children.get(name)
+
+        if model is not None:
+            return self.__child(name, model)
+
+        try:
+            return self._data[name]
+
+        except KeyError:
+            raise AttributeError(f"{type(self).__name__} has no attribute '{name}'") from None
+
+    def __child(self, name: str, model):
+        if self._nested is None:
+            self._nested = {}
+
+        if name not in self._nested:
+            value = self._data.get(name)
+
+            if isinstance(value, list):
+                value = [model(item) if isinstance(item, dict) else item for item in value]
+
+            elif isinstance(value, dict):
+                value = model(value)
+
+            self._nested[name] = value
+
+        return self._nested[name]
+
+    def __getitem__(self, key):
+        return self._data[key]
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def __eq__(self, other):
+        if isinstance(other, ResponseModel):
+            return self._data == other._data
+
+        return self._data == other
+
+    def get(self, key, default=None):
+        return self._data.get(key, default)
+
+    def toDict(self) -> dict:
+        return self._data
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self._data!r})"
+
+
+class Bundle(ResponseModel):
+    __slots__ = ()
+
+    BundleId: int
+    BrandId: int
+    Network: str
+    ProductCode: str
+    Amount: float
+    Name: str
+    Description: str
+    Validity: int
+
+
+class EVDStock(ResponseModel):
+    __slots__ = ()
+
+    BrandId: int
+    BrandName: str
+    PinValue: float
+    Stock: int
+
+
+class ZesaToken(ResponseModel):
+    __slots__ = ()
+
+    Token: str
+    Units: float
+    NetAmount: float
+    Levy: float
+    Arrears: float
+    TaxAmount: float
+    ZesaReference: str
+
+
+class CustomerInfo(ResponseModel):
+    __slots__ = ()
+
+    CustomerName: str
+    Address: str
+    MeterNumber: str
+    Reference: str
+
+
+class ApiResponse(ResponseModel):
+    __slots__ = ()
+
+    AgentReference: str
+    ReplyCode: int
+    ReplyMsg: str
+
+
+class WalletBalanceResponse(ApiResponse):
+    __slots__ = ()
+
+    WalletBalance: float
+
+
+class RechargeResponse(ApiResponse):
+    __slots__ = ()
+
+    Amount: float
+    Discount: float
+    WalletBalance: float
+    RechargeID: int
+    InitialBalance: float
+    FinalBalance: float
+    Data: float
+    SMS: str
+    Window: str
+    Pins: list
+
+
+class BundlesResponse(ApiResponse):
+    __slots__ = ()
+
+    _children = {"Bundles": Bundle}
+
+    Bundles: list
+
+
+class EVDsResponse(ApiResponse):
+    __slots__ = ()
+
+    _children = {"InStock": EVDStock}
+
+    InStock: list
+
+
+class ZesaCustomerResponse(ApiResponse):
+    __slots__ = ()
+
+    _children = {"CustomerInfo": CustomerInfo}
+
+    Meter: str
+    CustomerInfo: CustomerInfo
+
+
+class ZesaRechargeResponse(RechargeResponse):
+    __slots__ = ()
+
+    _children = {"Tokens": ZesaToken, "CustomerInfo": CustomerInfo}
+
+    Meter: str
+    AccountName: str
+    Address: str
+    Tokens: list
+    CustomerInfo: CustomerInfo
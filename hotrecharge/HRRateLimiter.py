@@ -0,0 +1,177 @@
+"""
+    @author:    DonnC <https://github.com/DonnC>
+    @created:   Oct 2026
+
+    client side token bucket rate limiting, shareable between clients and threads
+"""
+
+import asyncio
+import threading
+import time
+
+from .HotRechargeException import RateLimitExceeded
+
+
+class TokenBucket:
+    """
+    token bucket refilled at `rate` tokens per second, holding at most `burst` tokens
+
+    tokens are reserved up front and the caller sleeps off the deficit, so waiters
+    are served in arrival order and no lock is held while sleeping
+    """
+
+    def __init__(self, rate: float, burst: float = None):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+
+        self.base_rate = float(rate)
+        self.rate = float(rate)
+        self.burst = float(burst if burst is not None else max(rate, 1))
+
+        self.__tokens = self.burst
+        self.__stamp = time.monotonic()
+        self.__lock = threading.Lock()
+
+    def __repr__(self):
+        return f"<TokenBucket: rate={self.rate:.2f}/s, burst={self.burst:.0f}>"
+
+    def reserve(self, tokens: float = 1, max_wait: float = None) -> float or None:
+        """
+        take `tokens`, returning the seconds to wait before using them,
+        or None (nothing taken) if that wait would exceed `max_wait`
+        """
+        with self.__lock:
+            now = time.monotonic()
+            self.__tokens = min(self.burst, self.__tokens + (now - self.__stamp) * self.rate)
+            self.__stamp = now
+
+            deficit = tokens - self.__tokens
+            wait = deficit / self.rate if deficit > 0 else 0.0
+
+            if max_wait is not None and wait > max_wait:
+                return None
+
+            self.__tokens -= tokens
+
+            return wait
+
+    def refund(self, tokens: float = 1) -> None:
+        with self.__lock:
+            self.__tokens = min(self.burst, self.__tokens + tokens)
+
+    def scale(self, factor: float, floor: float) -> None:
+        # multiply the current rate, kept within [floor, base_rate]
+        with self.__lock:
+            self.rate = min(self.base_rate, max(floor, self.rate * factor))
+
+    def recover(self, step: float) -> None:
+        with self.__lock:
+            if self.rate < self.base_rate:
+                self.rate = min(self.base_rate, self.rate + step)
+
+
+class RateLimiter:
+    """
+    client side rate limiter, one account wide bucket plus optional per endpoint buckets
+
+    share one limiter between every client (and thread) using the same account
+
+    `rate`: account wide requests per second. Defaults to 10
+    `burst`: requests allowed at once after idling. Defaults to `rate`
+    `per_endpoint`: endpoint method name -> rate or (rate, burst), e.g {'rechargePinless': 5, 'getDataBundles': (1, 2)}
+    `max_wait`: max seconds a call blocks for a slot before raising `RateLimitExceeded`, None -> wait as long as needed
+    `backoff`: rate multiplier applied when the api answers http 429, adapting the rate down. Defaults to 0.5
+    `min_rate_ratio`: the rate never drops below this fraction of the configured rate. Defaults to 0.1
+    `recovery`: fraction of the configured rate regained per successful response. Defaults to 0.02
+
+    >>> limiter = hotrecharge.RateLimiter(rate=20, per_endpoint={'rechargePinless': 10})
+
+    >>> live = hotrecharge.HotRecharge(config, rate_limiter=limiter)
+    >>> bulk = hotrecharge.HotRecharge(config, rate_limiter=limiter)
+    """
+
+    def __init__(
+        self,
+        rate: float = 10,
+        burst: float = None,
+        per_endpoint: dict = None,
+        max_wait: float = None,
+        backoff: float = 0.5,
+        min_rate_ratio: float = 0.1,
+        recovery: float = 0.02,
+    ):
+        self.max_wait = max_wait
+        self.backoff = backoff
+        self.min_rate_ratio = min_rate_ratio
+        self.recovery = recovery
+
+        self.bucket = TokenBucket(rate, burst)
+        self.endpoint_buckets = {}
+
+        for name, limit in (per_endpoint or {}).items():
+            endpoint_rate, endpoint_burst = limit if isinstance(limit, (tuple, list)) else (limit, None)
+            self.endpoint_buckets[name] = TokenBucket(endpoint_rate, endpoint_burst)
+
+    def __repr__(self):
+        return f"<RateLimiter: {self.bucket}, endpoints={self.endpoint_buckets}>"
+
+    def __buckets(self, endpoint: str) -> list:
+        endpoint_bucket = self.endpoint_buckets.get(endpoint)
+        return [self.bucket] if endpoint_bucket is None else [self.bucket, endpoint_bucket]
+
+    def __reserve(self, endpoint: str, max_wait: float = None) -> float:
+        # reserve on every bucket the call counts against, all or nothing
+        if max_wait is None or (self.max_wait is not None and self.max_wait < max_wait):
+            max_wait = self.max_wait
+
+        reserved = []
+        wait = 0.0
+
+        for bucket in self.__buckets(endpoint):
+            bucket_wait = bucket.reserve(1, max_wait)
+
+            if bucket_wait is None:
+                for taken in reserved:
+                    taken.refund(1)
+
+                raise RateLimitExceeded(f"rate limit for {endpoint} would need more than {max_wait:.2f}s wait")
+
+            reserved.append(bucket)
+            wait = max(wait, bucket_wait)
+
+        return wait
+
+    def acquire(self, endpoint: str = None, max_wait: float = None) -> float:
+        """
+        block until `endpoint` may be called
+        :param max_wait: tighter `max_wait` for this call only, e.g the time left before a call deadline
+        :return: seconds waited
+        """
+        wait = self.__reserve(endpoint, max_wait)
+
+        if wait > 0:
+            time.sleep(wait)
+
+        return wait
+
+    async def acquireAsync(self, endpoint: str = None, max_wait: float = None) -> float:
+        """
+        asyncio flavour of `acquire`, waits without blocking the event loop
+        """
+        wait = self.__reserve(endpoint, max_wait)
+
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+        return wait
+
+    def feedback(self, endpoint: str, throttled: bool) -> None:
+        """
+        adapt to the api, slow down on http 429 and creep back up on success
+        """
+        for bucket in self.__buckets(endpoint):
+            if throttled:
+                bucket.scale(self.backoff, bucket.base_rate * self.min_rate_ratio)
+
+            else:
+                bucket.recover(bucket.base_rate * self.recovery)
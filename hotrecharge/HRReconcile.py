@@ -0,0 +1,234 @@
+"""
+    @author:    DonnC <https://github.com/DonnC>
+    @created:   Oct 2026
+
+    concurrent, resumable bulk reconciliation streamed to jsonl / csv
+"""
+
+import csv
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from .HRModels import ResponseModel
+from .HRRateLimiter import RateLimiter
+from .HotRechargeException import HotRechargeException, TransactionNotFound
+
+
+class ReconciliationRunner:
+    """
+    re-query many past transactions concurrently and stream one row per transaction to disk
+
+    items are agent references (str, queried with `queryTransactionReference`) or zesa
+    RechargeIDs (int, queried with `queryZesaTransaction`), or dicts with a `reference` / `recharge_id` key.
+    rows are written as they complete, nothing but the in-flight window is held in memory
+
+    `api`: a `HotRecharge` client, give it a `RateLimiter` shared with live traffic
+    `output`: path of the jsonl / csv file results are written to
+    `format`: 'jsonl' or 'csv'. Defaults to 'jsonl'
+    `max_concurrency`: max queries in flight, keep the client `pool_maxsize` at least this big. Defaults to 8
+    `checkpoint`: path of a checkpoint file, an interrupted run given the same items,
+        output and checkpoint resumes where it stopped. Defaults to None, not resumable
+    `checkpoint_every`: rows between checkpoint saves. Defaults to 500
+    `rate_limiter`: extra limiter for this run only, on top of the client one. Defaults to None
+
+    each row has `key`, `kind`, `status` ('found', 'not_found' or 'error'), `reply_code` and `message` of the
+    original transaction, `query_reply_code` of the query itself and `response`.
+    rows written after the last checkpoint are written again on resume, dedupe on `key` if that matters
+
+    >>> runner = hotrecharge.ReconciliationRunner(api, 'recon.jsonl', checkpoint='recon.ckpt', max_concurrency=16)
+    >>> summary = runner.run(reference for reference in agent_references)
+    >>> {'found': 9985, 'not_found': 12, 'error': 3}
+    """
+
+    FIELDS = ("key", "kind", "status", "reply_code", "message", "query_reply_code", "response")
+
+    REFERENCE = "reference"
+    RECHARGE_ID = "recharge_id"
+
+    def __init__(
+        self,
+        api,
+        output: str,
+        format: str = "jsonl",
+        max_concurrency: int = 8,
+        checkpoint: str = None,
+        checkpoint_every: int = 500,
+        rate_limiter: RateLimiter = None,
+    ):
+        if format not in ("jsonl", "csv"):
+            raise ValueError("format must be 'jsonl' or 'csv'")
+
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+
+        self.api = api
+        self.output = output
+        self.format = format
+        self.max_concurrency = max_concurrency
+        self.checkpoint = checkpoint
+        self.checkpoint_every = checkpoint_every
+        self.rate_limiter = rate_limiter
+
+    def __repr__(self):
+        return f"<ReconciliationRunner: {self.output}, format={self.format}, max_concurrency={self.max_concurrency}>"
+
+    def __parse(self, item) -> tuple:
+        # item -> (kind, key)
+        if isinstance(item, dict):
+            if item.get(self.RECHARGE_ID) is not None:
+                return self.RECHARGE_ID, item[self.RECHARGE_ID]
+
+            return self.REFERENCE, item[self.REFERENCE]
+
+        if isinstance(item, int):
+            return self.RECHARGE_ID, item
+
+        return self.REFERENCE, item
+
+    def __query(self, item) -> dict:
+        kind, key = self.__parse(item)
+        row = dict.fromkeys(self.FIELDS)
+        row.update(key=key, kind=kind)
+
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire("reconcile")
+
+        try:
+            if kind == self.RECHARGE_ID:
+                response = self.api.queryZesaTransaction(key)
+
+            else:
+                response = self.api.queryTransactionReference(key)
+
+            response = response.toDict() if isinstance(response, ResponseModel) else response
+            original = response.get("OriginalAgentReference")
+
+            # a reference query wraps the original transaction, its own reply code is always 2
+            if not isinstance(original, dict) or "ReplyCode" not in original:
+                original = response
+
+            row.update(status="found", reply_code=original.get("ReplyCode"), message=original.get("ReplyMsg"))
+            row.update(query_reply_code=response.get("ReplyCode"), response=response)
+
+        except TransactionNotFound as err:
+            row.update(status="not_found", query_reply_code=800, message=err.message)
+
+        except HotRechargeException as err:
+            row.update(status="error", message=f"{type(err).__name__}: {err.message}")
+            row["response"] = err.response
+
+        except Exception as err:
+            row.update(status="error", message=f"{type(err).__name__}: {err}")
+
+        return row
+
+    def __loadCheckpoint(self) -> dict or None:
+        if not self.checkpoint or not os.path.exists(self.checkpoint):
+            return None
+
+        with open(self.checkpoint, "r") as fh:
+            return json.load(fh)
+
+    def __saveCheckpoint(self, watermark: int, done: set, counts: dict) -> None:
+        # write then rename, a crash mid save leaves the previous checkpoint intact
+        state = {"output": self.output, "watermark": watermark, "done": sorted(done), "counts": counts}
+        tmp = f"{self.checkpoint}.tmp"
+
+        with open(tmp, "w") as fh:
+            json.dump(state, fh)
+            fh.flush()
+            os.fsync(fh.fileno())
+
+        os.replace(tmp, self.checkpoint)
+
+    def __rowWriter(self, fh, header: bool):
+        if self.format == "jsonl":
+            dumps = self.api.codec.dumps
+
+            def write(row):
+                fh.write(dumps(row).decode("utf-8"))
+                fh.write("\n")
+
+            return write
+
+        writer = csv.DictWriter(fh, fieldnames=self.FIELDS)
+
+        if header:
+            writer.writeheader()
+
+        def writeCsv(row):
+            if row["response"] is not None:
+                row["response"] = self.api.codec.dumps(row["response"]).decode("utf-8")
+
+            writer.writerow(row)
+
+        return writeCsv
+
+    def run(self, items) -> dict:
+        """
+        reconcile `items` (any iterable, can be a lazy generator) and return row counts by status
+
+        the checkpoint keeps a watermark (every item before it is done) plus the few items
+        done past it, so memory stays bounded however many items are reconciled
+        """
+        state = self.__loadCheckpoint()
+        resuming = state is not None and state.get("output") == self.output and os.path.exists(self.output)
+
+        watermark = state["watermark"] if resuming else 0
+        done = set(state["done"]) if resuming else set()
+        counts = dict(state["counts"]) if resuming else {"found": 0, "not_found": 0, "error": 0}
+
+        unsaved = 0
+        todo = ((index, item) for index, item in enumerate(items) if index >= watermark and index not in done)
+
+        with open(self.output, "a" if resuming else "w", newline="", encoding="utf-8") as fh:
+            write = self.__rowWriter(fh, header=not resuming)
+
+            try:
+                with ThreadPoolExecutor(max_workers=self.max_concurrency) as pool:
+                    pending = {}
+
+                    def fill():
+                        for index, item in todo:
+                            pending[pool.submit(self.__query, item)] = index
+
+                            if len(pending) >= self.max_concurrency:
+                                return
+
+                    fill()
+
+                    while pending:
+                        completed, _ = wait(pending, return_when=FIRST_COMPLETED)
+
+                        for future in completed:
+                            index = pending.pop(future)
+                            row = future.result()
+
+                            write(row)
+                            counts[row["status"]] += 1
+                            unsaved += 1
+
+                            done.add(index)
+
+                            while watermark in done:
+                                done.discard(watermark)
+                                watermark += 1
+
+                        if self.checkpoint and unsaved >= self.checkpoint_every:
+                            # rows must be on disk before the checkpoint says they are done
+                            fh.flush()
+                            os.fsync(fh.fileno())
+                            self.__saveCheckpoint(watermark, done, counts)
+                            unsaved = 0
+
+                        fill()
+
+            finally:
+                # also on interruption, only rows already written are marked done
+                if self.checkpoint:
+                    fh.flush()
+                    os.fsync(fh.fileno())
+                    self.__saveCheckpoint(watermark, done, counts)
+
+        return counts
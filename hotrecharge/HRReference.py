@@ -0,0 +1,177 @@
+"""
+    @author:    DonnC <https://github.com/DonnC>
+    @created:   Oct 2026
+
+    agent reference generators, every api request needs a unique `x-agent-reference`
+"""
+
+import os
+import socket
+import threading
+import time
+from hashlib import blake2b
+from uuid import getnode, uuid4
+
+from .HotRechargeException import ReferenceExceedLimit
+
+# api limit on agent reference length, see `HRAuthConfig`
+REFERENCE_MAX_LENGTH = 50
+
+_BASE36 = "0123456789abcdefghijklmnopqrstuvwxyz"
+
+
+def _base36(value: int, width: int) -> str:
+    # fixed width base36 so references sort the same as strings and numbers
+    chars = []
+
+    for _ in range(width):
+        value, rem = divmod(value, 36)
+        chars.append(_BASE36[rem])
+
+    return "".join(reversed(chars))
+
+
+class ReferenceGenerator:
+    """
+    base class for agent reference generators
+
+    subclass and override `next()` to plug in your own scheme
+
+    >>> class MyGenerator(ReferenceGenerator):
+            def next(self) -> str:
+                return my_db_sequence()
+
+    >>> api = hotrecharge.HotRecharge(config, reference_generator=MyGenerator())
+    """
+
+    def next(self) -> str:
+        raise NotImplementedError
+
+
+class UUIDChunkReferenceGenerator(ReferenceGenerator):
+    """
+    legacy generator, first 8 hex chars of a uuid4
+
+    only 32 random bits, collisions become likely at high volumes
+    """
+
+    def next(self) -> str:
+        # uuid4() example := c1ce5f4a-0596-49a9-aa28-a118f2888122
+        return str(uuid4()).split("-")[0]
+
+
+class MonotonicReferenceGenerator(ReferenceGenerator):
+    """
+    monotonic, sortable and collision free agent references
+
+    `<prefix><time>-<node>-<pid>-<counter>` e.g `0lgx3k9zq-k2m1-01f3a-0000`
+
+    `time`: 9 base36 chars of epoch milliseconds, never goes backwards within a generator
+    `node`: 4 base36 chars identifying the host, derived from hostname and mac unless given
+    `pid`: 5 base36 chars of the process id, refreshed after `os.fork()`
+    `counter`: 4 base36 chars, distinguishes references made in the same millisecond
+
+    `prefix` (optional): short tag, whole reference must stay within 50 chars
+    `node` (optional): explicit node id, use it when hosts may hash to the same node
+    `state_file` (optional): file to persist a time high-water mark, so references never
+        repeat across restarts even if the system clock is stepped back
+    `lease_ms` (optional): how far ahead the persisted high-water mark is written,
+        the file is only rewritten once per lease. Defaults to 60 seconds
+    """
+
+    _COUNTER_MAX = 36 ** 4
+
+    def __init__(self, prefix: str = "", node: str = None, state_file: str = None, lease_ms: int = 60000):
+        self.prefix = prefix
+        self.node = node or self.__nodeId()
+        self.state_file = state_file
+        self.lease_ms = lease_ms
+
+        self.__lock = threading.Lock()
+        self.__last_ms = 0
+        self.__counter = 0
+        self.__ceiling_ms = 0
+        self.__pid = _base36(os.getpid(), 5)
+
+        # <prefix> + time(9) + node + pid(5) + counter(4) + 3 dashes
+        if len(prefix) + len(self.node) + 21 > REFERENCE_MAX_LENGTH:
+            raise ReferenceExceedLimit(f"reference must not exceed {REFERENCE_MAX_LENGTH} characters, use a shorter prefix")
+
+        if state_file:
+            self.__ceiling_ms = self.__loadCeiling()
+            self.__last_ms = max(self.__last_ms, self.__ceiling_ms)
+
+        if hasattr(os, "register_at_fork"):
+            os.register_at_fork(after_in_child=self.__afterFork)
+
+    def __nodeId(self) -> str:
+        digest = blake2b(f"{socket.gethostname()}:{getnode()}".encode(), digest_size=8).digest()
+        return _base36(int.from_bytes(digest, "big"), 4)
+
+    def __afterFork(self):
+        # child shares parent state, a new pid keeps their references apart
+        self.__lock = threading.Lock()
+        self.__pid = _base36(os.getpid(), 5)
+
+    def __loadCeiling(self) -> int:
+        try:
+            with open(self.state_file, "r") as fh:
+                return int(fh.read().strip() or 0)
+
+        except (OSError, ValueError):
+            return 0
+
+    def __persistCeiling(self, ceiling_ms: int):
+        # write then rename, a crash never leaves a half written file
+        tmp_file = f"{self.state_file}.{os.getpid()}.tmp"
+
+        with open(tmp_file, "w") as fh:
+            fh.write(str(ceiling_ms))
+            fh.flush()
+            os.fsync(fh.fileno())
+
+        os.replace(tmp_file, self.state_file)
+        self.__ceiling_ms = ceiling_ms
+
+    def next(self) -> str:
+        now_ms = int(time.time() * 1000)
+
+        with self.__lock:
+            if now_ms > self.__last_ms:
+                self.__last_ms = now_ms
+                self.__counter = 0
+
+            else:
+                # same millisecond or clock stepped back, keep counting on the last timestamp
+                self.__counter += 1
+
+                if self.__counter >= self._COUNTER_MAX:
+                    self.__last_ms += 1
+                    self.__counter = 0
+
+            last_ms = self.__last_ms
+            counter = self.__counter
+
+            if self.state_file and last_ms >= self.__ceiling_ms:
+                self.__persistCeiling(last_ms + self.lease_ms)
+
+        return f"{self.prefix}{_base36(last_ms, 9)}-{self.node}-{self.__pid}-{_base36(counter, 4)}"
+
+
+_default_generator = None
+_default_lock = threading.Lock()
+
+
+def defaultReferenceGenerator() -> ReferenceGenerator:
+    """
+    process wide `MonotonicReferenceGenerator` shared by all clients that are not given one,
+    sharing it keeps references unique across clients in the same process
+    """
+    global _default_generator
+
+    if _default_generator is None:
+        with _default_lock:
+            if _default_generator is None:
+                _default_generator = MonotonicReferenceGenerator()
+
+    return _default_generator
@@ -0,0 +1,76 @@
+"""
+    @author:    DonnC <https://github.com/DonnC>
+    @created:   Oct 2026
+
+    retry policy, safe automatic retries for reads and reconciled retries for recharges
+"""
+
+import asyncio
+import random
+import time
+
+
+class RetryPolicy:
+    """
+    how failed requests are retried
+
+    reads are resent after a backoff. recharges (writes) are never blindly resent:
+    when a recharge fails ambiguously (connection dropped or read timed out after sending),
+    the original agent reference is first looked up with `queryTransactionReference`.
+    the original outcome is returned (or its api exception raised) if the transaction exists,
+    and the recharge is only resent, with the same reference, when the api answers
+    `TransactionNotFound` (800). if the state cannot be established `TransactionStateUnknown` is raised
+
+    `max_attempts`: max sends per call, including the first. Defaults to 3
+    `backoff`: base delay in seconds, doubled per attempt. Defaults to 0.5
+    `max_backoff`: delay cap in seconds. Defaults to 10
+    `jitter`: random fraction of the delay to add or remove, spreading retries of many clients. Defaults to 0.5
+    `retry_reads`: retry read only endpoints. Defaults to True
+    `retry_writes`: reconcile and retry recharges. Defaults to True
+
+    >>> api = hotrecharge.HotRecharge(config, retry_policy=hotrecharge.RetryPolicy(max_attempts=4))
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        backoff: float = 0.5,
+        max_backoff: float = 10,
+        jitter: float = 0.5,
+        retry_reads: bool = True,
+        retry_writes: bool = True,
+    ):
+        if max_attempts < 1:
+            raise ValueError("max_attempts must be at least 1")
+
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.retry_reads = retry_reads
+        self.retry_writes = retry_writes
+
+    def __repr__(self):
+        return f"<RetryPolicy: max_attempts={self.max_attempts}, backoff={self.backoff}s>"
+
+    def attempts(self, is_read: bool) -> int:
+        enabled = self.retry_reads if is_read else self.retry_writes
+        return self.max_attempts if enabled else 1
+
+    def delay(self, attempt: int) -> float:
+        """
+        seconds to wait before attempt number `attempt + 1`, exponential with jitter
+        """
+        delay = min(self.max_backoff, self.backoff * (2 ** (attempt - 1)))
+        return max(0.0, delay * (1 + random.uniform(-self.jitter, self.jitter)))
+
+    def sleep(self, attempt: int, limit: float = None) -> None:
+        # `limit`: time left before the call deadline, the next attempt then fails fast with `RequestTimeout`
+        time.sleep(self.__capped(attempt, limit))
+
+    async def sleepAsync(self, attempt: int, limit: float = None) -> None:
+        await asyncio.sleep(self.__capped(attempt, limit))
+
+    def __capped(self, attempt: int, limit: float = None) -> float:
+        delay = self.delay(attempt)
+        return delay if limit is None else max(0.0, min(delay, limit))
@@ -0,0 +1,98 @@
+"""
+    @author:    DonnC <https://github.com/DonnC>
+    @created:   Oct 2026
+
+    single-flight, concurrent identical calls share one in-flight call
+"""
+
+import asyncio
+import threading
+
+from .HRTimeout import deadlineRemaining
+from .HotRechargeException import RequestTimeout
+
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    thread flavour, the first caller for a key runs `fn`, callers arriving
+    while it runs wait and get the same result (or exception)
+    """
+
+    def __init__(self):
+        self.__calls = {}
+        self.__lock = threading.Lock()
+
+    def do(self, key, fn):
+        with self.__lock:
+            call = self.__calls.get(key)
+            leader = call is None
+
+            if leader:
+                call = self.__calls[key] = _Call()
+
+        if not leader:
+            # a follower waits no longer than its own call deadline
+            if not call.done.wait(deadlineRemaining()):
+                raise RequestTimeout("call deadline exceeded waiting for a coalesced request")
+
+            if call.error is not None:
+                raise call.error
+
+            return call.result
+
+        try:
+            call.result = fn()
+
+        except BaseException as err:
+            call.error = err
+            raise
+
+        finally:
+            with self.__lock:
+                del self.__calls[key]
+
+            call.done.set()
+
+        return call.result
+
+
+class AsyncSingleFlight:
+    """
+    asyncio flavour of `SingleFlight`, `fn` returns an awaitable
+    """
+
+    def __init__(self):
+        self.__calls = {}
+
+    async def do(self, key, fn):
+        future = self.__calls.get(key)
+
+        if future is not None:
+            # a cancelled or timed out follower must not cancel the shared call
+            done, _ = await asyncio.wait({future}, timeout=deadlineRemaining())
+
+            if not done:
+                raise RequestTimeout("call deadline exceeded waiting for a coalesced request")
+
+            return future.result()
+
+        future = self.__calls[key] = asyncio.ensure_future(fn())
+
+        try:
+            return await asyncio.shield(future)
+
+        finally:
+            if future.done():
+                self.__calls.pop(key, None)
+
+            else:
+                future.add_done_callback(lambda _: self.__calls.pop(key, None))
@@ -0,0 +1,179 @@
+"""
+    @author:    DonnC <https://github.com/DonnC>
+    @created:   Oct 2026
+
+    local evd stock ledger, stops requests for empty denominations before they hit the api
+"""
+
+import threading
+import time
+
+from .HotRechargeException import OutOfPinStock
+
+
+def _stockKey(brand_id, pin_value) -> tuple:
+    # `BrandId` / `PinValue` come back as numbers, callers often pass strings
+    return str(brand_id), round(float(pin_value), 2)
+
+
+class EVDStockLedger:
+    """
+    in-memory evd stock per `BrandId` / `PinValue`, seeded from `getEVDs()` `InStock`
+
+    stock is reserved before `rechargeEVD` is sent, consumed on success and returned when the api rejects
+    the recharge, so concurrent voucher runs never oversubscribe a denomination the ledger knows is short.
+    pins of a recharge whose outcome is unknown (timeouts, transport errors) stay off stock until the next resync
+
+    `resync_interval`: seconds after which stock is reloaded from the api before the next evd recharge. Defaults to 300
+    `empty_resync_interval`: a request short on stock triggers a reload at most this often
+        before it is rejected. Defaults to 30
+    `wait_timeout`: seconds a short request waits (queues) for stock to be returned or resynced
+        before raising `OutOfPinStock`, 0 -> reject immediately. Defaults to 0
+
+    >>> api = hotrecharge.HotRecharge(config, stock_ledger=hotrecharge.EVDStockLedger())
+
+    denominations the ledger has never seen are passed through to the api
+    """
+
+    def __init__(self, resync_interval: float = 300, empty_resync_interval: float = 30, wait_timeout: float = 0):
+        self.resync_interval = resync_interval
+        self.empty_resync_interval = empty_resync_interval
+        self.wait_timeout = wait_timeout
+
+        self.__stock = {}
+        self.__reserved = {}
+        self.__seeded_at = None
+        self.__cond = threading.Condition()
+        self.__resync_lock = threading.Lock()
+
+    def __repr__(self):
+        return f"<EVDStockLedger: {len(self.__stock)} denominations>"
+
+    @property
+    def age(self) -> float or None:
+        """
+        seconds since stock was last seeded, None if never
+        """
+        if self.__seeded_at is None:
+            return None
+
+        return time.monotonic() - self.__seeded_at
+
+    def stale(self) -> bool:
+        age = self.age
+        return age is None or age >= self.resync_interval
+
+    def seed(self, response) -> None:
+        """
+        (re)load stock from a `getEVDs()` response, outstanding reservations are kept off the new stock
+        """
+        with self.__cond:
+            self.__stock = {}
+
+            for in_stock in response.get("InStock") or []:
+                key = _stockKey(in_stock["BrandId"], in_stock["PinValue"])
+                self.__stock[key] = int(in_stock["Stock"]) - self.__reserved.get(key, 0)
+
+            self.__seeded_at = time.monotonic()
+            self.__cond.notify_all()
+
+    def resync(self, loader, max_age: float = None) -> None:
+        """
+        seed from `loader()` unless another thread did within `max_age` seconds
+        """
+        with self.__resync_lock:
+            age = self.age
+
+            if max_age is not None and age is not None and age < max_age:
+                return
+
+            self.seed(loader())
+
+    def stock(self, brand_id, pin_value) -> int or None:
+        """
+        known available stock, None if the denomination is not in the ledger
+        """
+        return self.__stock.get(_stockKey(brand_id, pin_value))
+
+    def reserve(self, brand_id, pin_value, quantity: int = 1, loader=None, timeout: float = None) -> None:
+        """
+        hold `quantity` pins or raise `OutOfPinStock` locally
+
+        when short, reloads stock with `loader` (at most every `empty_resync_interval`) and waits up to
+        `timeout` (defaults to `wait_timeout`) for stock to come back
+        """
+        key = _stockKey(brand_id, pin_value)
+        quantity = int(quantity)
+        timeout = self.wait_timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+
+        while True:
+            with self.__cond:
+                available = self.__stock.get(key)
+
+                if available is None or available >= quantity:
+                    if available is not None:
+                        self.__stock[key] = available - quantity
+                        self.__reserved[key] = self.__reserved.get(key, 0) + quantity
+
+                    return
+
+                age = self.age
+
+            if loader is not None and (age is None or age >= self.empty_resync_interval):
+                self.resync(loader, max_age=self.empty_resync_interval)
+                continue
+
+            with self.__cond:
+                remaining = deadline - time.monotonic()
+
+                if remaining <= 0:
+                    raise OutOfPinStock(
+                        f"not enough evd stock for brand {brand_id} value {pin_value}: "
+                        f"{max(self.__stock.get(key, 0), 0)} available, {quantity} requested"
+                    )
+
+                self.__cond.wait(remaining)
+
+    def commit(self, brand_id, pin_value, quantity: int = 1) -> None:
+        """
+        pins were issued, drop the reservation
+        """
+        key = _stockKey(brand_id, pin_value)
+
+        with self.__cond:
+            if key in self.__reserved:
+                self.__reserved[key] = max(self.__reserved[key] - int(quantity), 0)
+
+    def hold(self, brand_id, pin_value, quantity: int = 1) -> None:
+        """
+        outcome unknown, drop the reservation but keep the pins off stock until the next resync reloads it
+        """
+        self.commit(brand_id, pin_value, quantity)
+
+    def release(self, brand_id, pin_value, quantity: int = 1) -> None:
+        """
+        request rejected or never sent, return the reserved pins to stock
+        """
+        key = _stockKey(brand_id, pin_value)
+
+        with self.__cond:
+            if key in self.__reserved:
+                self.__reserved[key] = max(self.__reserved[key] - int(quantity), 0)
+
+                if key in self.__stock:
+                    self.__stock[key] += int(quantity)
+
+                self.__cond.notify_all()
+
+    def markEmpty(self, brand_id, pin_value, quantity: int = 1) -> None:
+        """
+        api reported `OutOfPinStock`, drop the reservation and zero the denomination until the next resync
+        """
+        key = _stockKey(brand_id, pin_value)
+
+        with self.__cond:
+            if key in self.__reserved:
+                self.__reserved[key] = max(self.__reserved[key] - int(quantity), 0)
+
+            self.__stock[key] = 0
@@ -0,0 +1,97 @@
+"""
+    @author:    DonnC <https://github.com/DonnC>
+    @created:   Oct 2026
+
+    per call timeout and deadline overrides, scoped to the current thread / asyncio task
+"""
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+_CALL_LIMITS = ContextVar("hotrecharge_call_limits", default=None)
+
+
+def splitTimeout(timeout) -> tuple:
+    """
+    normalise a timeout to (connect, read), a single number is used for both like in `requests`
+    """
+    if isinstance(timeout, (tuple, list)):
+        connect, read = timeout
+        return connect, read
+
+    return timeout, timeout
+
+
+class CallLimits:
+    """
+    timeout and absolute deadline applying to api calls made inside a `api.timeouts()` block
+
+    `timeout`: (connect, read) seconds overriding the client timeouts, None -> client timeouts
+    `expires_at`: `time.monotonic()` value by which the whole call, retries and
+        rate limit waits included, must be done. None -> no deadline
+    """
+
+    __slots__ = ("timeout", "expires_at")
+
+    def __init__(self, timeout: tuple = None, expires_at: float = None):
+        self.timeout = timeout
+        self.expires_at = expires_at
+
+    def __repr__(self):
+        return f"<CallLimits: timeout={self.timeout}, remaining={self.remaining()}>"
+
+    def remaining(self) -> float or None:
+        if self.expires_at is None:
+            return None
+
+        return self.expires_at - time.monotonic()
+
+    def merged(self, timeout: tuple = None, expires_at: float = None):
+        # inner timeout wins, the earliest deadline wins
+        if expires_at is None or (self.expires_at is not None and self.expires_at < expires_at):
+            expires_at = self.expires_at
+
+        return CallLimits(timeout if timeout is not None else self.timeout, expires_at)
+
+
+def currentLimits() -> CallLimits or None:
+    return _CALL_LIMITS.get()
+
+
+def deadlineRemaining() -> float or None:
+    """
+    seconds left before the current call deadline, never negative, None -> no deadline
+    """
+    limits = _CALL_LIMITS.get()
+    remaining = None if limits is None else limits.remaining()
+
+    return None if remaining is None else max(0.0, remaining)
+
+
+@contextmanager
+def callLimits(timeout=None, deadline: float = None, expires_at: float = None):
+    """
+    apply `timeout` and a deadline to api calls made inside the block, nested blocks keep the earliest deadline
+
+    :param timeout: seconds, or (connect, read) seconds
+    :param deadline: seconds from now
+    :param expires_at: absolute `time.monotonic()` deadline, for propagating one deadline to many calls
+    """
+    if timeout is not None:
+        timeout = splitTimeout(timeout)
+
+    if deadline is not None:
+        relative = time.monotonic() + deadline
+        expires_at = relative if expires_at is None else min(expires_at, relative)
+
+    outer = _CALL_LIMITS.get()
+    limits = outer.merged(timeout, expires_at) if outer else CallLimits(timeout, expires_at)
+
+    token = _CALL_LIMITS.set(limits)
+
+    try:
+        yield limits
+
+    finally:
+        _CALL_LIMITS.reset(token)
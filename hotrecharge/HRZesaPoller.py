@@ -0,0 +1,286 @@
+"""
+    @author:    DonnC <https://github.com/DonnC>
+    @created:   Oct 2026
+
+    asyncio scheduler resolving pending zesa transactions
+"""
+
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+
+from .HotRechargeException import HotRechargeException, PendingZesaTransaction, RateLimitExceeded, RequestTimeout
+
+logger = logging.getLogger(__name__)
+
+
+class _Pending:
+    # one tracked recharge id
+    __slots__ = ("recharge_id", "future", "callbacks", "interval", "started_at", "polls")
+
+    def __init__(self, recharge_id, future: asyncio.Future, interval: float):
+        self.recharge_id = recharge_id
+        self.future = future
+        self.callbacks = []
+        self.interval = interval
+        self.started_at = time.monotonic()
+        self.polls = 0
+
+
+class PendingZesaPoller:
+    """
+    resolve many `PendingZesaTransaction` (reply code 4) zesa recharges from one event loop task
+
+    tracked RechargeIDs sit in a heap ordered by their next poll time, a single scheduler task
+    sleeps until the earliest one is due, so thousands of pending transactions cost no threads.
+    each transaction is polled with `queryZesaTransaction` on a backoff schedule, never more often
+    than `min_interval`, the api allows 4 requests / minute per transaction
+
+    `api`: `AsyncHotRecharge`, or `HotRecharge` whose blocking calls run in the default executor
+    `min_interval`: seconds before the first poll and between polls. Defaults to 15
+    `max_interval`: cap of the backed off poll interval. Defaults to 120
+    `backoff`: interval multiplier after every poll that is still pending. Defaults to 1.5
+    `max_in_flight`: max `queryZesaTransaction` calls in flight across all transactions. Defaults to 4
+    `max_wait`: seconds after which a still pending transaction fails with `PendingZesaTransaction`. Defaults to 3600
+
+    >>> async with hotrecharge.PendingZesaPoller(api) as poller:
+            try:
+                response = await api.rechargeZesa(amount, contact, meter)
+
+            except hotrecharge.PendingZesaTransaction as err:
+                response = await poller.track(err.response.RechargeID)
+
+            print(response.Tokens)
+
+    or get results through a callback, called with (recharge_id, response, error)
+
+    >>> poller.track(recharge_id, callback=lambda recharge_id, response, error: print(recharge_id, response, error))
+    """
+
+    def __init__(
+        self,
+        api,
+        min_interval: float = 15,
+        max_interval: float = 120,
+        backoff: float = 1.5,
+        max_in_flight: int = 4,
+        max_wait: float = 3600,
+    ):
+        if max_in_flight < 1:
+            raise ValueError("max_in_flight must be at least 1")
+
+        self.api = api
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.max_in_flight = max_in_flight
+        self.max_wait = max_wait
+
+        self.__heap = []
+        self.__seq = itertools.count()
+        self.__tracked = {}
+        self.__in_flight = set()
+        self.__task = None
+        self.__wakeup = None
+        self.__slots = None
+
+    def __repr__(self):
+        return f"<PendingZesaPoller: {len(self.__tracked)} pending, {len(self.__in_flight)} in flight>"
+
+    def __len__(self):
+        return len(self.__tracked)
+
+    async def __aenter__(self):
+        self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            await self.drain()
+
+        await self.close()
+
+    def start(self) -> None:
+        """
+        start the scheduler task on the running event loop, `track()` starts it too
+        """
+        if self.__task is None or self.__task.done():
+            self.__wakeup = asyncio.Event()
+            self.__slots = asyncio.Semaphore(self.max_in_flight)
+            self.__task = asyncio.get_running_loop().create_task(self.__run())
+
+    def track(self, recharge_id, callback=None) -> asyncio.Future:
+        """
+        poll `recharge_id` until it resolves
+        :param recharge_id: `RechargeID` of the pending zesa recharge
+        :param callback: Optional, called with (recharge_id, response, error) once resolved
+        :return: future resolving to the `queryZesaTransaction` response, or failing with its api exception.
+            tracking an id again returns the same future
+        """
+        self.start()
+
+        pending = self.__tracked.get(recharge_id)
+
+        if pending is None:
+            future = asyncio.get_running_loop().create_future()
+            pending = _Pending(recharge_id, future, self.min_interval)
+            self.__tracked[recharge_id] = pending
+            self.__schedule(pending)
+
+        if callback is not None:
+            pending.callbacks.append(callback)
+
+        return pending.future
+
+    def cancel(self, recharge_id) -> bool:
+        """
+        stop polling `recharge_id`, its future is cancelled
+        """
+        pending = self.__tracked.pop(recharge_id, None)
+
+        if pending is None:
+            return False
+
+        pending.future.cancel()
+
+        return True
+
+    async def drain(self) -> None:
+        """
+        wait until every tracked transaction is resolved
+        """
+        while self.__tracked:
+            await asyncio.wait([pending.future for pending in self.__tracked.values()])
+
+    async def close(self) -> None:
+        """
+        stop the scheduler, in-flight polls are cancelled and unresolved futures cancelled
+        """
+        if self.__task is not None:
+            self.__task.cancel()
+
+        for task in list(self.__in_flight):
+            task.cancel()
+
+        await asyncio.gather(*self.__in_flight, *([self.__task] if self.__task else []), return_exceptions=True)
+
+        for recharge_id in list(self.__tracked):
+            self.cancel(recharge_id)
+
+        self.__task = None
+
+    def __schedule(self, pending: _Pending) -> None:
+        heapq.heappush(self.__heap, (time.monotonic() + pending.interval, next(self.__seq), pending.recharge_id))
+        self.__wakeup.set()
+
+    async def __run(self) -> None:
+        while True:
+            self.__wakeup.clear()
+
+            while self.__heap and self.__heap[0][0] <= time.monotonic():
+                _, _, recharge_id = heapq.heappop(self.__heap)
+                pending = self.__tracked.get(recharge_id)
+
+                if pending is None or pending.future.done():
+                    # cancelled or resolved since it was scheduled
+                    continue
+
+                await self.__slots.acquire()
+
+                task = asyncio.ensure_future(self.__poll(pending))
+                self.__in_flight.add(task)
+                task.add_done_callback(self.__pollDone)
+
+            timeout = self.__heap[0][0] - time.monotonic() if self.__heap else None
+
+            try:
+                await asyncio.wait_for(self.__wakeup.wait(), timeout)
+
+            except asyncio.TimeoutError:
+                pass
+
+    def __pollDone(self, task: asyncio.Task) -> None:
+        self.__in_flight.discard(task)
+        self.__slots.release()
+
+    async def __query(self, recharge_id):
+        query = self.api.queryZesaTransaction
+
+        if asyncio.iscoroutinefunction(query):
+            return await query(recharge_id)
+
+        return await asyncio.get_running_loop().run_in_executor(None, query, recharge_id)
+
+    async def __poll(self, pending: _Pending) -> None:
+        pending.polls += 1
+
+        try:
+            response = await self.__query(pending.recharge_id)
+
+        except (PendingZesaTransaction, RequestTimeout, RateLimitExceeded) as err:
+            self.__retry(pending, err)
+
+        except HotRechargeException as err:
+            self.__resolve(pending, error=err)
+
+        except Exception as err:
+            # transport failure, the transaction is still pending as far as we know
+            self.__retry(pending, err)
+
+        else:
+            self.__resolve(pending, response=response)
+
+    def __retry(self, pending: _Pending, error: Exception) -> None:
+        if pending.recharge_id not in self.__tracked:
+            return
+
+        pending.interval = min(self.max_interval, pending.interval * self.backoff)
+        waited = time.monotonic() - pending.started_at
+
+        if self.max_wait is not None and waited + pending.interval > self.max_wait:
+            if not isinstance(error, PendingZesaTransaction):
+                error = PendingZesaTransaction(
+                    f"zesa transaction {pending.recharge_id} unresolved after {pending.polls} polls: {error}"
+                )
+
+            self.__resolve(pending, error=error)
+            return
+
+        self.__schedule(pending)
+
+    def __resolve(self, pending: _Pending, response=None, error: Exception = None) -> None:
+        if self.__tracked.pop(pending.recharge_id, None) is None:
+            return
+
+        if not pending.future.done():
+            if error is None:
+                pending.future.set_result(response)
+
+            else:
+                pending.future.set_exception(error)
+
+                if pending.callbacks:
+                    # delivered through the callbacks, keep asyncio from logging it as never retrieved
+                    pending.future.exception()
+
+        for callback in pending.callbacks:
+            try:
+                result = callback(pending.recharge_id, response, error)
+
+                if asyncio.iscoroutine(result):
+                    task = asyncio.ensure_future(result)
+                    task.add_done_callback(lambda task, callback=callback: self.__callbackDone(task, pending, callback))
+
+            except Exception:
+                # a failing callback must not stop the scheduler
+                logger.exception("hotrecharge zesa %s callback %r failed", pending.recharge_id, callback)
+
+    @staticmethod
+    def __callbackDone(task: asyncio.Future, pending: _Pending, callback) -> None:
+        # log a failed coroutine callback, nothing else awaits it
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(
+                "hotrecharge zesa %s callback %r failed", pending.recharge_id, callback, exc_info=task.exception()
+            )
@@ -6,16 +6,39 @@
     HotRecharge api main class
 """
 
-from uuid import uuid4
-from json import dumps, loads
-from munch import Munch, munchify
+import time
+from munch import Munch
 import requests as req
+from requests.adapters import HTTPAdapter
 
 from .HRConfig import HRAuthConfig
-from .HotRechargeExcHandler import ApiExceptionHandler
-
-
-class HotRecharge:
+from .HotRechargeBase import HotRechargeBase
+from .HRReference import ReferenceGenerator
+from .HRBulk import bulkRecharge
+from .HRCache import CatalogCache, LRUTTLCache
+from .HRCodec import JsonCodec
+from .HRRateLimiter import RateLimiter
+from .HRCatalog import BundleCatalog
+from .HRStock import EVDStockLedger
+from .HRBalance import CachedBalance
+from .HRSingleFlight import SingleFlight
+from .HRRetry import RetryPolicy
+from .HRMetrics import ClientMetrics
+from .HRHooks import RequestHooks
+from .HRJournal import TransactionJournal
+from .HRIdempotency import IdempotencyGuard
+from .HotRechargeException import (
+    DuplicateReference,
+    DuplicateRequestException,
+    HotRechargeException,
+    OutOfPinStock,
+    RequestTimeout,
+    TransactionNotFound,
+    TransactionStateUnknown,
+)
+
+
+class HotRecharge(HotRechargeBase):
     """
     Hot Recharge Python Api Library
     __author__  Donald Chinhuru
@@ -23,32 +46,30 @@ class HotRecharge:
     __name__    Hot Recharge Api
     """
 
-    __ROOT_ENDPOINT = "https://ssl.hot.co.zw"
-    __API_VERSION = "/api/v1/"
-    __MIME_TYPES = "application/json"
-
-    # endpoints definition
-    __RECHARGE_PINLESS = "agents/recharge-pinless"
-    __RECHARGE_DATA = "agents/recharge-data"
-    __WALLET_BALANCE = "agents/wallet-balance"
-    __GET_DATA_BUNDLE = "agents/get-data-bundles"
-    __ENDUSER_BALANCE = "agents/enduser-balance?targetmobile="
-    __QUERY_TRANSACTION = "agents/query-transaction?agentReference="
-    __QUERY_ZESA = "agents/query-zesa-transaction"
-    __RECHARGE_ZESA = "agents/recharge-zesa"
-    __ZESA_CUSTOMER = "agents/check-customer-zesa"
-    __ZESA_BALANCE = "agents/wallet-balance-zesa"
-    __QUERY_EVD = "agents/query-evd"
-    __RECHARGE_EVD = "agents/recharge-evd"
-
-    __base_url__ = __ROOT_ENDPOINT + __API_VERSION
-    __headers = {}
-
     def __init__(
         self,
         config: HRAuthConfig,
         use_random_ref: bool = True,
         return_model: bool = False,
+        reference_generator: ReferenceGenerator = None,
+        balance_max_age: float = 60,
+        coalesce_reads: bool = False,
+        codec: JsonCodec = None,
+        rate_limiter: RateLimiter = None,
+        retry_policy: RetryPolicy = None,
+        connect_timeout: float = 10,
+        read_timeout: float = 30,
+        base_url: str = None,
+        metrics: ClientMetrics = None,
+        hooks: RequestHooks = None,
+        journal: TransactionJournal = None,
+        idempotency: IdempotencyGuard = None,
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        pool_block: bool = False,
+        catalog_cache: CatalogCache = None,
+        stock_ledger: EVDStockLedger = None,
+        zesa_customer_cache: LRUTTLCache = None,
     ):
         """[HotRecharge]
 
@@ -85,55 +106,372 @@ class HotRecharge:
 
                 False -> returns a dict python object instead.
 
+                "typed" -> return a compact typed model (see `hotrecharge.HRModels`), e.g `RechargeResponse`,
+                `BundlesResponse` with `Bundle` items, `ZesaRechargeResponse` with `ZesaToken` items.
+                Models are read only views over the parsed response, nothing is copied until a field is read
+
+                >>> api = hotrecharge.HotRecharge(config, return_model="typed")
+
                 Defaults to False.
+
+            `reference_generator` (ReferenceGenerator, optional): generates the agent reference of each request
+                when `use_random_ref` is True. Defaults to a process wide `MonotonicReferenceGenerator`
+                which is sortable and unique across threads, processes and hosts
+
+                >>> generator = hotrecharge.MonotonicReferenceGenerator(prefix='shop1-', state_file='/var/lib/shop1/ref')
+
+                >>> api = hotrecharge.HotRecharge(config, reference_generator=generator)
+
+            `balance_max_age` (float, optional): seconds a wallet balance tracked from responses is served
+                by `cachedBalance()` before it calls the api again. Defaults to 60
+
+            `coalesce_reads` (bool, optional): True -> concurrent identical calls to read only endpoints
+                (balances, bundles, evds, queries, zesa customer check) share one in-flight request and its result.
+                Writes are never coalesced. Defaults to False
+
+            `codec` (JsonCodec, optional): json codec for payloads and responses.
+                Defaults to the fastest installed of orjson, ujson and the stdlib json module
+
+            `rate_limiter` (RateLimiter, optional): client side token bucket limiter, calls block until a slot
+                is free and the rate adapts down on http 429. Share one limiter between clients on the same account.
+                Defaults to None
+
+            `retry_policy` (RetryPolicy, optional): retry reads after transport failures, and reconcile recharges
+                that failed mid-flight with `queryTransactionReference` before resending them, see `RetryPolicy`.
+                Defaults to None, no retries
+
+            `connect_timeout` (float, optional): seconds to wait for a connection to the api, None -> wait forever.
+                Defaults to 10
+
+            `read_timeout` (float, optional): seconds to wait for the api to answer, None -> wait forever.
+                Defaults to 30. Override both per call, and set a call deadline, with `api.timeouts()`.
+                Timeouts raise `RequestTimeout`
+
+            `base_url` (str, optional): api root url, e.g a local `FakeHotServer` url for load tests.
+                Defaults to None, https://ssl.hot.co.zw
+
+            `metrics` (ClientMetrics, optional): record per endpoint latency histograms, reply code and
+                exception counters, in flight and retry gauges. Read them with `metrics.snapshot()`
+                or `metrics.prometheus()`. Defaults to None
+
+            `hooks` (RequestHooks, optional): `before_request`, `after_response`, `on_error` and `on_retry`
+                callbacks around every api call, use `OpenTelemetryHooks` for tracing spans. Defaults to None
+
+            `journal` (TransactionJournal, optional): write-ahead journal of recharges, a `FileJournal` or
+                `SQLiteJournal`. Every recharge is recorded before it is sent and its outcome after, settle
+                the ones a crash left unresolved with `journal.recover(api)`. Defaults to None
+
+            `idempotency` (IdempotencyGuard, optional): recharges sent with an `order_key` are only sent once per key,
+                repeats get the original response or wait for the one in flight. Defaults to None
+
+            `pool_connections` (int, optional): number of host connection pools to keep in the session. Defaults to 10.
+
+            `pool_maxsize` (int, optional): max number of keep-alive connections kept per host.
+                Set it to the number of threads sharing this client. Defaults to 10.
+
+            `pool_block` (bool, optional): True -> block when all `pool_maxsize` connections are busy
+                instead of opening extra throw-away connections. Defaults to False.
+
+            `catalog_cache` (CatalogCache, optional): serve `getDataBundles()` and `getEVDs()` from memory,
+                refreshing them in the background once stale. Defaults to None, no caching
+
+            `stock_ledger` (EVDStockLedger, optional): track evd stock locally, seeded from `getEVDs()`,
+                so `rechargeEVD()` raises `OutOfPinStock` without calling the api when stock is known to be short.
+                Defaults to None
+
+            `zesa_customer_cache` (LRUTTLCache, optional): cache `checkZesaCustomer()` results by meter number,
+                fresh entries are returned without calling the api. Defaults to None
+
+        The client owns a pooled keep-alive session, release it with `api.close()` or use the client as a context manager
+
+        >>> with hotrecharge.HotRecharge(config) as api:
+                api.walletBalance()
+        """
+        super().__init__(
+            config,
+            use_random_ref=use_random_ref,
+            return_model=return_model,
+            reference_generator=reference_generator,
+            balance_max_age=balance_max_age,
+            coalesce_reads=coalesce_reads,
+            codec=codec,
+            rate_limiter=rate_limiter,
+            retry_policy=retry_policy,
+            connect_timeout=connect_timeout,
+            read_timeout=read_timeout,
+            base_url=base_url,
+            metrics=metrics,
+            hooks=hooks,
+            journal=journal,
+            idempotency=idempotency,
+        )
+        self.__session = self.__setupSession(pool_connections, pool_maxsize, pool_block)
+        self.__catalog_cache = catalog_cache
+        self.__bundle_catalog = None
+        self.__stock_ledger = stock_ledger
+        self.__flights = SingleFlight()
+        self.__zesa_customer_cache = zesa_customer_cache
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self) -> None:
+        """
+        close the underlying http session and release all pooled connections
+        :return: None
+        """
+        self.__session.close()
+
+    def invalidateCatalog(self) -> None:
         """
-        self.use_random_ref = use_random_ref
-        self.config = config
-        self.return_model = return_model
-        self.__setupHeaders()
-        print('-- req --')
-
-    def __setupHeaders(self):
-        if self.config:
-            # print(self.config)
-
-            if self.use_random_ref:
-                self.__headers = {
-                    "x-access-code": self.config.access_code,
-                    "x-access-password": self.config.access_password,
-                    "x-agent-reference": self.__uuidChunkRef(),
-                    "content-type": self.__MIME_TYPES,
-                    "cache-control": "no-cache",
-                }
-
-            else:
-                self.__headers = {
-                    "x-access-code": self.config.access_code,
-                    "x-access-password": self.config.access_password,
-                    "x-agent-reference": self.config.reference,
-                    "content-type": self.__MIME_TYPES,
-                    "cache-control": "no-cache",
-                }
-
-    def __uuidChunkRef(self):
-        # simple tokenizer to get a random str as ref from uuid
-        # uuid4() example := c1ce5f4a-0596-49a9-aa28-a118f2888122
-        uuid_ref = str(uuid4())
-        chunk = uuid_ref.split("-")
-        return chunk[0]
-
-    def __autoUpdateRef(self):
-        if self.use_random_ref:
-            self.__headers.update({"x-agent-reference": self.__uuidChunkRef()})
-
-    def updateReference(self, reference: str) -> None:
-        """
-        update agent-reference field in headers.
-        Reference should not be the same for any request made to the web service
-        :param reference:
+        drop cached data bundles and evds, the next call fetches them from the api
         :return: None
         """
-        self.__headers.update({"x-agent-reference": reference})
+        if self.__catalog_cache:
+            self.__catalog_cache.invalidate()
+
+    def bundleCatalog(self) -> BundleCatalog:
+        """
+        indexed `BundleCatalog` of `getDataBundles()`, only rebuilt when the bundles response changes
+        so with a `catalog_cache` it is built once per refresh
+        :return: BundleCatalog
+        """
+        response = self.getDataBundles()
+        catalog = self.__bundle_catalog
+
+        if catalog is None or catalog.source is not response:
+            catalog = BundleCatalog.fromResponse(response)
+            self.__bundle_catalog = catalog
+
+        return catalog
+
+    def __setupSession(self, pool_connections: int, pool_maxsize: int, pool_block: bool) -> req.Session:
+        # a single session reuses warm tcp + tls connections across api calls
+        session = req.Session()
+
+        adapter = HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block,
+        )
+
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+
+        return session
+
+    # surfaced as `RequestTimeout`
+    __TIMEOUT_ERRORS = (req.exceptions.Timeout,)
+
+    # request never reached the api, safe to resend
+    __NOT_SENT_ERRORS = (req.exceptions.ConnectTimeout,)
+
+    # request may or may not have been processed by the api
+    __AMBIGUOUS_ERRORS = (
+        req.exceptions.ConnectionError,
+        req.exceptions.Timeout,
+        req.exceptions.ChunkedEncodingError,
+        ValueError,
+    )
+
+    # api errors that do not mean a recharge was rejected
+    __UNSETTLED_ERRORS = (
+        TransactionStateUnknown,
+        RequestTimeout,
+        DuplicateReference,
+        DuplicateRequestException,
+    )
+
+    def __request(
+        self, method: str, endpoint: str, payload: dict = None, reference: str = None, order_key: str = None, write=None
+    ) -> dict or Munch:
+        try:
+            return self.__dispatch(method, endpoint, payload, reference, order_key, write)
+
+        except self.__TIMEOUT_ERRORS as err:
+            raise RequestTimeout(f"{self._endpointName(endpoint)} timed out: {err}") from err
+
+    def __dispatch(
+        self, method: str, endpoint: str, payload: dict = None, reference: str = None, order_key: str = None, write=None
+    ) -> dict or Munch:
+        if not self._isRead(method, endpoint):
+            # `write(reference)` sends the recharge, endpoints with local bookkeeping pass their own
+            write = write or (lambda ref: self.__write(method, endpoint, payload, ref))
+
+            if order_key is not None:
+                return self.__writeOnce(endpoint, payload, reference, order_key, write)
+
+            return write(reference)
+
+        if self.coalesce_reads and reference is None:
+            return self.__flights.do(
+                self._flightKey(method, endpoint, payload),
+                lambda: self.__read(method, endpoint, payload),
+            )
+
+        return self.__read(method, endpoint, payload, reference)
+
+    def __read(self, method: str, endpoint: str, payload: dict = None, reference: str = None) -> dict or Munch:
+        # reads are safe to resend, each retry gets a fresh reference
+        attempts = self.retry_policy.attempts(True) if self.retry_policy else 1
+
+        for attempt in range(1, attempts + 1):
+            try:
+                return self.__send(method, endpoint, payload, reference if attempt == 1 else None)
+
+            except self.__AMBIGUOUS_ERRORS as err:
+                if attempt == attempts:
+                    raise
+
+                error = err
+
+            self.__backoff(endpoint, attempt, error)
+
+    def __writeOnce(self, endpoint: str, payload: dict, reference: str, order_key: str, write) -> dict or Munch:
+        # one recharge per order key, see `IdempotencyGuard`, replays never call `write`
+        if self.idempotency is None:
+            raise ValueError("order_key needs a client created with an `idempotency` guard")
+
+        def send(reference: str, resend: bool):
+            if resend:
+                # an earlier attempt of this order may have gone through
+                response = self.__reconcile(endpoint, reference)
+
+                if response is not None:
+                    return response
+
+            return write(reference)
+
+        return self.idempotency.do(
+            order_key,
+            send,
+            self._resolveReference(reference),
+            self._orderFingerprint(endpoint, payload),
+            lambda data: self._wrapResponse(endpoint, data),
+        )
+
+    def __write(self, method: str, endpoint: str, payload: dict = None, reference: str = None) -> dict or Munch:
+        # a journaled recharge is recorded before it is sent and its outcome after
+        if self.journal is None:
+            return self.__attempts(method, endpoint, payload, reference)
+
+        reference = self._resolveReference(reference)
+        self.journal.started(endpoint, reference, payload)
+
+        try:
+            response = self.__attempts(method, endpoint, payload, reference)
+
+        except Exception as err:
+            self._journalFinished(reference, error=err, sent=not isinstance(err, self.__NOT_SENT_ERRORS))
+            raise
+
+        self._journalFinished(reference, response)
+
+        return response
+
+    def __attempts(self, method: str, endpoint: str, payload: dict = None, reference: str = None) -> dict or Munch:
+        # recharges keep one reference across attempts, so an attempt that
+        # failed mid-flight can be looked up before anything is resent
+        if self.retry_policy is None:
+            return self.__send(method, endpoint, payload, reference)
+
+        reference = self._resolveReference(reference)
+        attempts = self.retry_policy.attempts(False)
+
+        for attempt in range(1, attempts + 1):
+            try:
+                return self.__send(method, endpoint, payload, reference)
+
+            except self.__NOT_SENT_ERRORS as err:
+                if attempt == attempts:
+                    raise
+
+                error = err
+
+            except self.__AMBIGUOUS_ERRORS + (DuplicateReference,) as err:
+                # a duplicate reference on a resend means an earlier attempt got through
+                if isinstance(err, DuplicateReference) and attempt == 1:
+                    raise
+
+                response = self.__reconcile(endpoint, reference, err)
+
+                if response is not None:
+                    return response
+
+                if attempt == attempts:
+                    raise
+
+                error = err
+
+            self.__backoff(endpoint, attempt, error, reference)
+
+    def __backoff(self, endpoint: str, attempt: int, error: Exception, reference: str = None) -> None:
+        name = self._endpointName(endpoint)
+        self._retryStarted(name, attempt, error, reference)
+
+        try:
+            self.retry_policy.sleep(attempt, self._deadlineRemaining())
+
+        finally:
+            self._retryFinished(name)
+
+    def __reconcile(self, endpoint: str, reference: str, error: Exception = None) -> dict or Munch or None:
+        # look up a recharge that failed mid-flight, None -> confirmed absent, safe to resend
+        try:
+            query = self.queryTransactionReference(reference)
+
+        except TransactionNotFound:
+            return None
+
+        except Exception as err:
+            after = "" if error is None else f" after `{error}`"
+            raise TransactionStateUnknown(
+                f"state of transaction {reference} is unknown{after}, lookup failed: {err}",
+                reference=reference,
+            ) from error
+
+        return self._reconciledResponse(endpoint, query)
+
+    def __send(self, method: str, endpoint: str, payload: dict = None, reference: str = None) -> dict or Munch:
+        # send request over the pooled session and process api response
+        name = self._endpointName(endpoint)
+        connect, read, remaining = self._requestTimeout()
+
+        if self.rate_limiter is not None:
+            if self.rate_limiter.acquire(name, remaining):
+                # waited for a slot, less of the deadline is left
+                connect, read, remaining = self._requestTimeout()
+
+        headers = self._requestHeaders(reference)
+
+        url = f"{self.__base_url__}{endpoint}"
+
+        data = self.codec.dumps(payload) if payload is not None else None
+
+        sent_at = time.monotonic()
+        status_code = None
+        reply = None
+        call = self._callStarted(name, method, endpoint, headers["x-agent-reference"], data)
+
+        try:
+            # the read timeout bounds each socket read, not the whole body
+            resp = self.__session.request(method, url=url, headers=headers, data=data, timeout=(connect, read))
+            status_code = resp.status_code
+
+            reply = self.codec.loads(resp.content)
+
+            response = self._processResponse(resp.status_code, reply, endpoint, sent_at)
+
+        except Exception as err:
+            self._callFinished(call, status_code, reply, err)
+            raise
+
+        self._callFinished(call, status_code, reply)
+
+        return response
 
     def walletBalance(self) -> Munch or dict:
         """
@@ -147,33 +485,26 @@ class HotRecharge:
             'WalletBalance': walletBalance,
         }
         """
-        self.__autoUpdateRef()
-
-        url = f"{self.__base_url__}{self.__WALLET_BALANCE}"
-
-        resp = req.request("GET", url=url, headers=self.__headers)
-
-        status_code = resp.status_code
-
-        _json_data = resp.json()
+        return self.__request("GET", self._WALLET_BALANCE)
 
-        _munch_obj = munchify(_json_data)
-
-        if hasattr(_munch_obj, "ReplyCode"):
-            if _munch_obj.ReplyCode == 2:
-
-                if self.return_model:
-                    return _munch_obj
-
-                return _json_data
-
-            else:
-                pass
+    def cachedBalance(self, zesa: bool = False, max_age: float = None) -> CachedBalance:
+        """
+        last known wallet balance, tracked from the `WalletBalance` of every successful response.
+        only calls `walletBalance()` / `zesaWalletBalance()` when the tracked balance is older than `max_age`
+        :param zesa: True -> zesa wallet, False -> airtime wallet
+        :param max_age: seconds, defaults to the client `balance_max_age`
+        :return: CachedBalance with `balance`, `updated_at` and `age`
+
+        >>> cached = api.cachedBalance(max_age=30)
+        >>> print(cached.balance, cached.age)
+        """
+        cached = self._cachedBalance(zesa, max_age)
 
-        if status_code == 401 or 429:
-            ApiExceptionHandler(response=_munch_obj, is_429_401=status_code)
+        if cached is None:
+            self.zesaWalletBalance() if zesa else self.walletBalance()
+            cached = self.balance_tracker.get(self.balance_tracker.ZESA if zesa else self.balance_tracker.AIRTIME)
 
-        ApiExceptionHandler(response=_munch_obj)
+        return cached
 
     def queryTransactionReference(self, agent_reference) -> dict or Munch:
         """
@@ -190,34 +521,9 @@ class HotRecharge:
                 'AgentReference': agentReference,
              }
         """
-        self.__autoUpdateRef()
-
-        url = f"{self.__base_url__}{self.__QUERY_TRANSACTION}{agent_reference}"
-
-        resp = req.request("GET", url=url, headers=self.__headers)
-
-        status_code = resp.status_code
-
-        _json_data = resp.json()
-
-        _munch_obj = munchify(_json_data)
-
-        if hasattr(_munch_obj, "ReplyCode"):
-            if _munch_obj.ReplyCode == 2:
-                if self.return_model:
-                    return _munch_obj
+        return self.__request("GET", f"{self._QUERY_TRANSACTION}{agent_reference}")
 
-                return _json_data
-
-            else:
-                pass
-
-        if status_code == 401 or 429:
-            ApiExceptionHandler(response=_munch_obj, is_429_401=status_code)
-
-        ApiExceptionHandler(response=_munch_obj)
-
-    def rechargePinless(self, amount, number, brandID=None, mesg=None) -> dict or Munch:
+    def rechargePinless(self, amount, number, brandID=None, mesg=None, reference=None, order_key=None) -> dict or Munch:
         """
         :param amount: a number
         :param number: target phone number in formart 07xx.. or 086xx..
@@ -231,6 +537,8 @@ class HotRecharge:
         %DATA% - xxx MB
         %COMPANYNAME% - as defined by Customer on the website www.hot.co.zw
         %ACCESSNAME% - defined by Customer on website – Teller or Trusted User or branch name
+        :param reference - Optional, agent reference to send this request with instead of the auto generated one
+        :param order_key - Optional, your order id, the order is recharged once however often it is sent, see `IdempotencyGuard`
         :return: response payload -> dict
 
         >>> {
@@ -248,8 +556,6 @@ class HotRecharge:
             'Window': window,
         }
         """
-        self.__autoUpdateRef()
-
         payload = dict()
         payload["amount"] = amount
 
@@ -270,33 +576,10 @@ class HotRecharge:
 
         payload["targetMobile"] = number
 
-        url = f"{self.__base_url__}{self.__RECHARGE_PINLESS}"
-
-        resp = req.request("POST", url=url, headers=self.__headers, data=dumps(payload))
-
-        status_code = resp.status_code
-
-        _json_data = resp.json()
-
-        _munch_obj = munchify(_json_data)
-
-        if hasattr(_munch_obj, "ReplyCode"):
-            if _munch_obj.ReplyCode == 2:
-                if self.return_model:
-                    return _munch_obj
-
-                return _json_data
-
-            else:
-                pass
-
-        if status_code == 401 or 429:
-            ApiExceptionHandler(response=_munch_obj, is_429_401=status_code)
-
-        ApiExceptionHandler(response=_munch_obj)
+        return self.__request("POST", self._RECHARGE_PINLESS, payload, reference, order_key)
 
     def dataBundleRecharge(
-        self, product_code, number, amount=None, mesg=None
+        self, product_code, number, amount=None, mesg=None, reference=None, catalog: BundleCatalog = None, order_key=None
     ) -> dict or Munch:
         """
         recharge data bundles to `number` target mobile
@@ -309,6 +592,10 @@ class HotRecharge:
         %BUNDLE% - name of data bundle
         %ACCESSNAME% - defined by Customer on website – Teller or Trusted User or branch name
         %COMPANYNAME% - as defined by customer on website
+        :param reference - Optional, agent reference to send this request with instead of the auto generated one
+        :param order_key - Optional, your order id, the order is recharged once however often it is sent, see `IdempotencyGuard`
+        :param catalog - Optional, `BundleCatalog` to check `product_code` against locally,
+            raises `InvalidProductCode` without calling the api e.g catalog=api.bundleCatalog()
         :return: response dict payload
 
         >>> {
@@ -327,7 +614,8 @@ class HotRecharge:
         }
         """
 
-        self.__autoUpdateRef()
+        if catalog is not None:
+            catalog.validate(product_code)
 
         payload = dict()
         payload["ProductCode"] = product_code
@@ -349,38 +637,17 @@ class HotRecharge:
 
         payload["TargetMobile"] = number
 
-        url = f"{self.__base_url__}{self.__RECHARGE_DATA}"
-
-        resp = req.request("POST", url=url, headers=self.__headers, data=dumps(payload))
-
-        status_code = resp.status_code
-
-        _json_data = resp.json()
-
-        _munch_obj = munchify(_json_data)
+        return self.__request("POST", self._RECHARGE_DATA, payload, reference, order_key)
 
-        if hasattr(_munch_obj, "ReplyCode"):
-            if _munch_obj.ReplyCode == 2:
-                if self.return_model:
-                    return _munch_obj
-
-                return _json_data
-
-            else:
-                pass
-
-        if status_code == 401 or 429:
-            ApiExceptionHandler(response=_munch_obj, is_429_401=status_code)
-
-        ApiExceptionHandler(response=_munch_obj)
-
-    def rechargeEVD(self, brand_id, pin_value, number, quantity=1) -> dict or Munch:
+    def rechargeEVD(self, brand_id, pin_value, number, quantity=1, reference=None, order_key=None) -> dict or Munch:
         """
         recharge evd to `number` target mobile, voucher pin will be send to `number`
         :param brand_id: brand id of evd as got from `api.getEVD()` e.g 24
         :param pin_value: evd value as float, (used to be Denomination)
         :param number: contact number to sent voucher pin, usually netone
         :param quantity: number of voucher pins to purchase
+        :param reference - Optional, agent reference to send this request with instead of the auto generated one
+        :param order_key - Optional, your order id, the order is recharged once however often it is sent, see `IdempotencyGuard`
 
         :return: response dict payload
         on successful, *Pins will be a list of string : PIN, SerialNumber, BrandID, Denomination (PinValue), Expiry
@@ -398,42 +665,58 @@ class HotRecharge:
         }
         """
 
-        self.__autoUpdateRef()
-
         payload = dict()
         payload["BrandID"] = str(brand_id)
         payload["Denomination"] = str(pin_value)
         payload["Quantity"] = str(quantity)
         payload["TargetNumber"] = number
 
-        url = f"{self.__base_url__}{self.__RECHARGE_EVD}"
+        if self.__stock_ledger is None:
+            return self.__request("POST", self._RECHARGE_EVD, payload, reference, order_key)
 
-        resp = req.request("POST", url=url, headers=self.__headers, data=dumps(payload))
+        # stock is only reserved for recharges actually sent, not for replayed orders
+        write = lambda ref: self.__ledgerRechargeEVD(payload, ref, brand_id, pin_value, quantity)
 
-        status_code = resp.status_code
+        return self.__request("POST", self._RECHARGE_EVD, payload, reference, order_key, write)
 
-        _json_data = resp.json()
+    def __ledgerRechargeEVD(self, payload: dict, reference: str, brand_id, pin_value, quantity) -> dict or Munch:
+        # evd recharge reserving its pins on the stock ledger
+        ledger = self.__stock_ledger
 
-        _munch_obj = munchify(_json_data)
+        if ledger.stale():
+            ledger.resync(self.__fetchEVDs, max_age=ledger.resync_interval)
 
-        if hasattr(_munch_obj, "ReplyCode"):
-            if _munch_obj.ReplyCode == 2:
-                if self.return_model:
-                    return _munch_obj
+        ledger.reserve(brand_id, pin_value, quantity, loader=self.__fetchEVDs)
 
-                return _json_data
+        try:
+            response = self.__write("POST", self._RECHARGE_EVD, payload, reference)
 
-            else:
-                pass
+        except OutOfPinStock:
+            ledger.markEmpty(brand_id, pin_value, quantity)
+            raise
 
-        if status_code == 401 or 429:
-            ApiExceptionHandler(response=_munch_obj, is_429_401=status_code)
+        except self.__UNSETTLED_ERRORS:
+            # pins may have been issued, keep them off stock until the next resync
+            ledger.hold(brand_id, pin_value, quantity)
+            raise
 
-        ApiExceptionHandler(response=_munch_obj)
+        except self.__NOT_SENT_ERRORS + (HotRechargeException,):
+            # never sent or rejected by the api
+            ledger.release(brand_id, pin_value, quantity)
+            raise
+
+        except Exception:
+            ledger.hold(brand_id, pin_value, quantity)
+            raise
+
+        ledger.commit(brand_id, pin_value, quantity)
+
+        return response
 
     def getDataBundles(self) -> dict or Munch:
         """
         get available data bundles
+        served from memory when the client has a `catalog_cache`
         :return: dict object containing bundles info and product-codes
 
         >>> {
@@ -454,36 +737,15 @@ class HotRecharge:
             'Validity': validity,
         }
         """
-        self.__autoUpdateRef()
-
-        url = f"{self.__base_url__}{self.__GET_DATA_BUNDLE}"
-
-        resp = req.request("GET", url=url, headers=self.__headers)
-
-        status_code = resp.status_code
-
-        _json_data = resp.json()
-
-        _munch_obj = munchify(_json_data)
-
-        if hasattr(_munch_obj, "ReplyCode"):
-            if _munch_obj.ReplyCode == 2:
-                if self.return_model:
-                    return _munch_obj
-
-                return _json_data
-
-            else:
-                pass
+        if self.__catalog_cache:
+            return self.__catalog_cache.get("bundles", lambda: self.__request("GET", self._GET_DATA_BUNDLE))
 
-        if status_code == 401 or 429:
-            ApiExceptionHandler(response=_munch_obj, is_429_401=status_code)
-
-        ApiExceptionHandler(response=_munch_obj)
+        return self.__request("GET", self._GET_DATA_BUNDLE)
 
     def getEVDs(self) -> dict or Munch:
         """
         query evds (electronic vouchers)
+        served from memory when the client has a `catalog_cache`
         *PinValue ==  Denomination in some context
         :return: dict object containing evds
 
@@ -502,35 +764,21 @@ class HotRecharge:
             'Stock': stock,
         }
         """
-        self.__autoUpdateRef()
-
-        url = f"{self.__base_url__}{self.__QUERY_EVD}"
-
-        resp = req.request("GET", url=url, headers=self.__headers)
-
-        status_code = resp.status_code
-
-        _json_data = resp.json()
-
-        _munch_obj = munchify(_json_data)
+        if self.__catalog_cache:
+            return self.__catalog_cache.get("evds", self.__fetchEVDs)
 
-        if hasattr(_munch_obj, "ReplyCode"):
-            if _munch_obj.ReplyCode == 2:
-                if self.return_model:
-                    return _munch_obj
+        return self.__fetchEVDs()
 
-                return _json_data
+    def __fetchEVDs(self) -> dict or Munch:
+        response = self.__request("GET", self._QUERY_EVD)
 
-            else:
-                pass
+        if self.__stock_ledger is not None:
+            self.__stock_ledger.seed(response)
 
-        if status_code == 401 or 429:
-            ApiExceptionHandler(response=_munch_obj, is_429_401=status_code)
-
-        ApiExceptionHandler(response=_munch_obj)
+        return response
 
     def rechargeZesa(
-        self, amount, notify_contact, meter_number, mesg=None
+        self, amount, notify_contact, meter_number, mesg=None, reference=None, order_key=None
     ) -> dict or Munch:
         """
         recharge zesa
@@ -538,6 +786,8 @@ class HotRecharge:
         notify_contact: contact to sent zesa token to
         meter_number: the 11 digit meter number to recharge
         mesg: (Optional) custom message to send to user
+        reference: (Optional) agent reference to send this request with instead of the auto generated one
+        order_key: (Optional) your order id, the order is recharged once however often it is sent, see `IdempotencyGuard`
 
         :return:
         >>> {
@@ -568,8 +818,6 @@ class HotRecharge:
         If it throws `ZesaPendingTransaction` excpetion, see ZesaPendingTransaction docstrings for more
         """
 
-        self.__autoUpdateRef()
-
         payload = dict()
 
         payload["Amount"] = amount
@@ -587,36 +835,14 @@ class HotRecharge:
 
         payload["TargetNumber"] = notify_contact
 
-        url = f"{self.__base_url__}{self.__RECHARGE_ZESA}"
-
-        resp = req.request("POST", url=url, headers=self.__headers, data=dumps(payload))
-
-        status_code = resp.status_code
-
-        _json_data = resp.json()
-
-        _munch_obj = munchify(_json_data)
+        return self.__request("POST", self._RECHARGE_ZESA, payload, reference, order_key)
 
-        if hasattr(_munch_obj, "ReplyCode"):
-            if _munch_obj.ReplyCode == 2:
-                if self.return_model:
-                    return _munch_obj
-
-                return _json_data
-
-            else:
-                pass
-
-        if status_code == 401 or 429:
-            ApiExceptionHandler(response=_munch_obj, is_429_401=status_code)
-
-        ApiExceptionHandler(response=_munch_obj)
-
-    def checkZesaCustomer(self, meter_number) -> dict or Munch:
+    def checkZesaCustomer(self, meter_number, use_cache: bool = True) -> dict or Munch:
         """
         check zesa customer. please note! You are advised to first check zesa customer before performing
         zesa recharge, i.e prompt the user to confirm their details first before proceeding
         meter_number: the 11 digit meter number of suer
+        use_cache: False -> always call the api even if the client has a fresh `zesa_customer_cache` entry
         :return: on successsful, it returns user information and address, print response for more
 
         >>> {
@@ -637,36 +863,24 @@ class HotRecharge:
 
         """
 
-        self.__autoUpdateRef()
+        cache = self.__zesa_customer_cache if use_cache else None
+
+        if cache is not None:
+            cached = cache.get(str(meter_number))
+
+            if cached is not None:
+                return cached
 
         payload = {
             "MeterNumber": meter_number,
         }
 
-        url = f"{self.__base_url__}{self.__ZESA_CUSTOMER}"
-
-        resp = req.request("POST", url=url, headers=self.__headers, data=dumps(payload))
-
-        status_code = resp.status_code
-
-        _json_data = resp.json()
-
-        _munch_obj = munchify(_json_data)
-
-        if hasattr(_munch_obj, "ReplyCode"):
-            if _munch_obj.ReplyCode == 2:
-                if self.return_model:
-                    return _munch_obj
+        response = self.__request("POST", self._ZESA_CUSTOMER, payload)
 
-                return _json_data
+        if self.__zesa_customer_cache is not None:
+            self.__zesa_customer_cache.set(str(meter_number), response)
 
-            else:
-                pass
-
-        if status_code == 401 or 429:
-            ApiExceptionHandler(response=_munch_obj, is_429_401=status_code)
-
-        ApiExceptionHandler(response=_munch_obj)
+        return response
 
     def zesaWalletBalance(self) -> dict or Munch:
         """
@@ -681,32 +895,7 @@ class HotRecharge:
         }
         """
 
-        self.__autoUpdateRef()
-
-        url = f"{self.__base_url__}{self.__ZESA_BALANCE}"
-
-        resp = req.request("GET", url=url, headers=self.__headers)
-
-        status_code = resp.status_code
-
-        _json_data = resp.json()
-
-        _munch_obj = munchify(_json_data)
-
-        if hasattr(_munch_obj, "ReplyCode"):
-            if _munch_obj.ReplyCode == 2:
-                if self.return_model:
-                    return _munch_obj
-
-                return _json_data
-
-            else:
-                pass
-
-        if status_code == 401 or 429:
-            ApiExceptionHandler(response=_munch_obj, is_429_401=status_code)
-
-        ApiExceptionHandler(response=_munch_obj)
+        return self.__request("GET", self._ZESA_BALANCE)
 
     def queryZesaTransaction(self, recharge_id) -> dict or Munch:
         """
@@ -748,31 +937,29 @@ class HotRecharge:
             'Reference': reference,
         }
         """
-        self.__autoUpdateRef()
-
         payload = {"RechargeId": str(recharge_id)}
 
-        url = f"{self.__base_url__}{self.__QUERY_ZESA}"
-
-        resp = req.request("POST", url=url, headers=self.__headers, data=dumps(payload))
-
-        status_code = resp.status_code
-
-        _json_data = resp.json()
-
-        _munch_obj = munchify(_json_data)
-
-        if hasattr(_munch_obj, "ReplyCode"):
-            if _munch_obj.ReplyCode == 2:
-                if self.return_model:
-                    return _munch_obj
+        return self.__request("POST", self._QUERY_ZESA, payload)
 
-                return _json_data
-
-            else:
-                pass
-
-        if status_code == 401 or 429:
-            ApiExceptionHandler(response=_munch_obj, is_429_401=status_code)
-
-        ApiExceptionHandler(response=_munch_obj)
+    def bulkRecharge(self, orders, max_concurrency: int = 8, deadline: float = None):
+        """
+        recharge many orders concurrently, yields a `BulkResult` per order as each one completes
+        :param orders: iterable (can be a lazy generator) of order dicts, `product_code` orders are data bundles
+        :param max_concurrency: max orders in flight, keep `pool_maxsize` at least this big
+        :param deadline: Optional, seconds the whole run must be done in, later orders fail with `RequestTimeout`
+
+        each order gets its own unique agent reference unless it carries a `reference` key.
+        failed orders do not stop the run, the mapped api exception is set on `result.error`
+
+        >>> orders = [
+                {'amount': 1.5, 'number': '077xxxxxxx'},
+                {'product_code': 'DWB15', 'number': '078xxxxxxx', 'mesg': customer_sms},
+            ]
+
+        >>> for result in api.bulkRecharge(orders, max_concurrency=16):
+                if result.ok:
+                    print(result.reference, result.response)
+                else:
+                    print(result.reference, result.error)
+        """
+        return bulkRecharge(self, orders, max_concurrency=max_concurrency, deadline=deadline)
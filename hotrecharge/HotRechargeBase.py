@@ -0,0 +1,348 @@
+"""
+    @author:    DonnC <https://github.com/DonnC>
+    @created:   Oct 2026
+
+    shared base for the sync and async hot recharge api clients
+"""
+
+import logging
+import time
+from json import dumps
+from types import MappingProxyType
+from munch import Munch, munchify
+
+from .HRConfig import HRAuthConfig
+from .HotRechargeExcHandler import ApiExceptionHandler
+from .HRReference import ReferenceGenerator, defaultReferenceGenerator
+from .HRBalance import BalanceTracker, CachedBalance
+from .HRCodec import JsonCodec, defaultCodec
+from .HRRateLimiter import RateLimiter
+from .HRRetry import RetryPolicy
+from .HRTimeout import callLimits, currentLimits
+from .HRMetrics import ClientMetrics
+from .HRHooks import RequestEvent, RequestHooks
+from .HRJournal import TransactionJournal
+from .HRIdempotency import IdempotencyGuard
+from .HotRechargeException import RequestTimeout
+from .HRModels import (
+    ResponseModel,
+    ApiResponse,
+    BundlesResponse,
+    EVDsResponse,
+    RechargeResponse,
+    WalletBalanceResponse,
+    ZesaCustomerResponse,
+    ZesaRechargeResponse,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class HotRechargeBase:
+    """
+    common auth, reference and response handling shared by
+    `HotRecharge` and `AsyncHotRecharge`
+    """
+
+    _ROOT_ENDPOINT = "https://ssl.hot.co.zw"
+    _API_VERSION = "/api/v1/"
+    _MIME_TYPES = "application/json"
+
+    # endpoints definition
+    _RECHARGE_PINLESS = "agents/recharge-pinless"
+    _RECHARGE_DATA = "agents/recharge-data"
+    _WALLET_BALANCE = "agents/wallet-balance"
+    _GET_DATA_BUNDLE = "agents/get-data-bundles"
+    _ENDUSER_BALANCE = "agents/enduser-balance?targetmobile="
+    _QUERY_TRANSACTION = "agents/query-transaction?agentReference="
+    _QUERY_ZESA = "agents/query-zesa-transaction"
+    _RECHARGE_ZESA = "agents/recharge-zesa"
+    _ZESA_CUSTOMER = "agents/check-customer-zesa"
+    _ZESA_BALANCE = "agents/wallet-balance-zesa"
+    _QUERY_EVD = "agents/query-evd"
+    _RECHARGE_EVD = "agents/recharge-evd"
+
+    __base_url__ = _ROOT_ENDPOINT + _API_VERSION
+
+    # endpoint path -> client method name, used to name endpoints in rate limits
+    _ENDPOINT_NAMES = {
+        "agents/recharge-pinless": "rechargePinless",
+        "agents/recharge-data": "dataBundleRecharge",
+        "agents/wallet-balance": "walletBalance",
+        "agents/get-data-bundles": "getDataBundles",
+        "agents/query-transaction": "queryTransactionReference",
+        "agents/query-zesa-transaction": "queryZesaTransaction",
+        "agents/recharge-zesa": "rechargeZesa",
+        "agents/check-customer-zesa": "checkZesaCustomer",
+        "agents/wallet-balance-zesa": "zesaWalletBalance",
+        "agents/query-evd": "getEVDs",
+        "agents/recharge-evd": "rechargeEVD",
+    }
+
+    # responses of these endpoints carry the current `WalletBalance` of a wallet,
+    # query endpoints are left out as they return the balance at the original transaction
+    _BALANCE_WALLETS = {
+        _RECHARGE_PINLESS: BalanceTracker.AIRTIME,
+        _RECHARGE_DATA: BalanceTracker.AIRTIME,
+        _RECHARGE_EVD: BalanceTracker.AIRTIME,
+        _WALLET_BALANCE: BalanceTracker.AIRTIME,
+        _RECHARGE_ZESA: BalanceTracker.ZESA,
+        _ZESA_BALANCE: BalanceTracker.ZESA,
+    }
+
+    # typed model per endpoint for `return_model="typed"`, anything else is an `ApiResponse`
+    _TYPED_MODELS = {
+        _RECHARGE_PINLESS: RechargeResponse,
+        _RECHARGE_DATA: RechargeResponse,
+        _RECHARGE_EVD: RechargeResponse,
+        _WALLET_BALANCE: WalletBalanceResponse,
+        _ZESA_BALANCE: WalletBalanceResponse,
+        _GET_DATA_BUNDLE: BundlesResponse,
+        _QUERY_EVD: EVDsResponse,
+        _ZESA_CUSTOMER: ZesaCustomerResponse,
+        _RECHARGE_ZESA: ZesaRechargeResponse,
+        _QUERY_ZESA: ZesaRechargeResponse,
+    }
+
+    # read only POST endpoints, every GET endpoint is read only too
+    _READ_POST_ENDPOINTS = (_ZESA_CUSTOMER, _QUERY_ZESA)
+
+    def __init__(
+        self,
+        config: HRAuthConfig,
+        use_random_ref: bool = True,
+        return_model: bool = False,
+        reference_generator: ReferenceGenerator = None,
+        balance_max_age: float = 60,
+        coalesce_reads: bool = False,
+        codec: JsonCodec = None,
+        rate_limiter: RateLimiter = None,
+        retry_policy: RetryPolicy = None,
+        connect_timeout: float = 10,
+        read_timeout: float = 30,
+        base_url: str = None,
+        metrics: ClientMetrics = None,
+        hooks: RequestHooks = None,
+        journal: TransactionJournal = None,
+        idempotency: IdempotencyGuard = None,
+    ):
+        self.use_random_ref = use_random_ref
+        self.config = config
+        self.return_model = return_model
+        self.reference_generator = reference_generator or defaultReferenceGenerator()
+        self.balance_max_age = balance_max_age
+        self.balance_tracker = BalanceTracker()
+        self.coalesce_reads = coalesce_reads
+        self.codec = codec or defaultCodec()
+        self.rate_limiter = rate_limiter
+        self.retry_policy = retry_policy
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.metrics = metrics
+        self.hooks = hooks
+        self.journal = journal
+        self.idempotency = idempotency
+
+        if base_url:
+            self.__base_url__ = base_url.rstrip("/") + self._API_VERSION
+
+        self._reference = config.reference if config else None
+        self._setupHeaders()
+
+    def _setupHeaders(self):
+        # auth part of the headers is fixed per client, the reference is added per request
+        # so one client can be shared between threads / coroutines without leaking references
+        self._authHeaders = MappingProxyType({})
+
+        if self.config:
+            self._authHeaders = MappingProxyType({
+                "x-access-code": self.config.access_code,
+                "x-access-password": self.config.access_password,
+                "content-type": self._MIME_TYPES,
+                "cache-control": "no-cache",
+            })
+
+    def _newReference(self) -> str:
+        # a fresh agent reference for a single request
+        return self.reference_generator.next()
+
+    def _resolveReference(self, reference: str = None) -> str:
+        # reference a request is sent with, explicit one first
+        if reference:
+            return reference
+
+        return self._newReference() if self.use_random_ref else self._reference
+
+    def _requestHeaders(self, reference: str = None) -> dict:
+        # a new headers dict for every request, nothing shared is mutated
+        headers = dict(self._authHeaders)
+        headers["x-agent-reference"] = self._resolveReference(reference)
+
+        return headers
+
+    def updateReference(self, reference: str) -> None:
+        """
+        update agent-reference used for the next requests when `use_random_ref` is False.
+        Reference should not be the same for any request made to the web service
+        :param reference:
+        :return: None
+        """
+        self._reference = reference
+
+    def _endpointName(self, endpoint: str) -> str:
+        path = endpoint.split("?", 1)[0]
+        return self._ENDPOINT_NAMES.get(path, path)
+
+    def _isRead(self, method: str, endpoint: str) -> bool:
+        return method == "GET" or endpoint in self._READ_POST_ENDPOINTS
+
+    def _flightKey(self, method: str, endpoint: str, payload: dict = None) -> tuple:
+        # identical read calls share one in flight request
+        return method, endpoint, dumps(payload, sort_keys=True) if payload is not None else None
+
+    @staticmethod
+    def _orderFingerprint(endpoint: str, payload: dict = None) -> str:
+        # identifies the recharge an order key was used for
+        return f"{endpoint} {dumps(payload, sort_keys=True)}"
+
+    def timeouts(self, timeout=None, deadline: float = None):
+        """
+        override the client timeouts and set a deadline for api calls made inside the block,
+        scoped to the current thread / asyncio task. the deadline covers the whole call,
+        rate limit waits and retries included, nested blocks keep the earliest deadline
+        :param timeout: seconds, or (connect, read) seconds
+        :param deadline: seconds from now the calls must be done in, else `RequestTimeout` is raised
+
+        >>> with api.timeouts(timeout=(2, 5), deadline=8):
+                api.rechargePinless(amount=1, number='0771111111')
+        """
+        return callLimits(timeout, deadline)
+
+    def _requestTimeout(self) -> tuple:
+        # (connect, read, remaining deadline) for the next send
+        connect, read, remaining = self.connect_timeout, self.read_timeout, None
+        limits = currentLimits()
+
+        if limits is not None:
+            if limits.timeout is not None:
+                connect, read = limits.timeout
+
+            remaining = limits.remaining()
+
+            if remaining is not None:
+                if remaining <= 0:
+                    raise RequestTimeout("call deadline exceeded before the request was sent")
+
+                connect = remaining if connect is None else min(connect, remaining)
+                read = remaining if read is None else min(read, remaining)
+
+        return connect, read, remaining
+
+    @staticmethod
+    def _deadlineRemaining() -> float or None:
+        limits = currentLimits()
+        return None if limits is None else limits.remaining()
+
+    def _callStarted(self, name: str, method: str, path: str, reference: str, data: bytes) -> RequestEvent or None:
+        # a request is about to be sent to endpoint method `name`, None -> nothing observes calls
+        if self.metrics is None and self.hooks is None:
+            return None
+
+        event = RequestEvent(name, method, path, reference, len(data) if data else 0, time.monotonic())
+
+        if self.metrics is not None:
+            self.metrics.started(name)
+
+        if self.hooks is not None:
+            self.hooks.emit("before_request", event)
+
+        return event
+
+    def _callFinished(self, event: RequestEvent, status_code: int = None, reply=None, error: Exception = None) -> None:
+        # the request was answered and processed, or failed with `error`
+        if event is None:
+            return
+
+        event.elapsed = time.monotonic() - event.sent_at
+        event.status_code = status_code
+        event.reply = reply
+        event.error = error
+
+        if self.metrics is not None:
+            reply_code = ClientMetrics.replyCode(reply, error, status_code)
+            self.metrics.finished(event.endpoint, event.elapsed, reply_code, error)
+
+        if self.hooks is not None:
+            self.hooks.emit("after_response" if error is None else "on_error", event)
+
+    def _journalFinished(self, reference: str, response=None, error: Exception = None, sent: bool = True) -> None:
+        # the recharge is done, failing to journal it must not turn its outcome into an error,
+        # the entry stays unresolved and `journal.recover()` settles it
+        try:
+            self.journal.finished(reference, response, error, sent)
+
+        except Exception:
+            logger.exception("hotrecharge could not journal the outcome of %s", reference)
+
+    def _retryStarted(self, name: str, attempt: int, error: Exception, reference: str = None) -> None:
+        # attempt number `attempt` failed with `error`, waiting out the backoff before the next one
+        if self.metrics is not None:
+            self.metrics.retryStarted(name)
+
+        if self.hooks is not None:
+            self.hooks.emit("on_retry", RequestEvent(name, reference=reference, attempt=attempt, error=error))
+
+    def _retryFinished(self, name: str) -> None:
+        if self.metrics is not None:
+            self.metrics.retryFinished(name)
+
+    def _reconciledResponse(self, endpoint: str, query) -> dict or Munch:
+        # outcome of a recharge found by `queryTransactionReference`, the original response
+        # is processed like a live one so a failed original raises its api exception.
+        # its wallet balance is historic and never tracked
+        raw = query.toDict() if isinstance(query, ResponseModel) else query
+        original = raw.get("OriginalAgentReference")
+
+        if isinstance(original, dict) and "ReplyCode" in original:
+            return self._processResponse(200, original, endpoint, track_balance=False)
+
+        return query
+
+    def _cachedBalance(self, zesa: bool = False, max_age: float = None) -> CachedBalance or None:
+        # tracked balance if fresh enough, else None so the caller fetches it
+        wallet = BalanceTracker.ZESA if zesa else BalanceTracker.AIRTIME
+        max_age = self.balance_max_age if max_age is None else max_age
+
+        return self.balance_tracker.fresh(wallet, max_age)
+
+    def _trackBalance(self, endpoint: str, sent_at: float, _json_data: dict) -> None:
+        wallet = self._BALANCE_WALLETS.get(endpoint)
+
+        if wallet is not None and _json_data.get("WalletBalance") is not None:
+            self.balance_tracker.update(wallet, _json_data["WalletBalance"], sent_at)
+
+    def _processResponse(
+        self, status_code: int, _json_data: dict, endpoint: str = None, sent_at: float = None, track_balance: bool = True
+    ) -> dict or Munch:
+        # return successful api response or raise the mapped api exception.
+        # the reply code is read straight from the parsed dict, models are only built when asked for
+        if self.rate_limiter is not None:
+            self.rate_limiter.feedback(self._endpointName(endpoint), status_code == 429)
+
+        if isinstance(_json_data, dict) and _json_data.get("ReplyCode") == 2:
+            if track_balance:
+                self._trackBalance(endpoint, sent_at, _json_data)
+
+            return self._wrapResponse(endpoint, _json_data)
+
+        raise ApiExceptionHandler.classify(munchify(_json_data), status_code)
+
+    def _wrapResponse(self, endpoint: str, _json_data: dict) -> dict or Munch:
+        # successful response in the configured `return_model` shape
+        if self.return_model == "typed":
+            return self._TYPED_MODELS.get(endpoint, ApiResponse)(_json_data)
+
+        if self.return_model:
+            return munchify(_json_data)
+
+        return _json_data
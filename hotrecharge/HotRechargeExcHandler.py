@@ -1,5 +1,6 @@
 # @author:  DonnC Lab
 # @created: Jun 2021
+# @updated: Oct 2026
 
 from munch import Munch
 
@@ -10,8 +11,31 @@ class ApiExceptionHandler:
     """ApiExceptionHandler
 
     Handles api request [ReplyCode] and throw appropriate exception
+
+    use `ApiExceptionHandler.classify(response)` to get the mapped exception without raising it
     """
 
+    # code -> exception class, only the matched class is ever instantiated
+    EXCEPTIONS = {
+        4: PendingZesaTransaction,
+        206: PrepaidPlatformFail,
+        208: InsufficientBalance,
+        209: OutOfPinStock,
+        210: PrepaidPlatformFail,
+        216: DuplicateRequestException,
+        217: InvalidContact,
+        218: AuthorizationError,
+        219: WebServiceException,
+        220: AuthorizationError,
+        221: BalanceRequestError,
+        222: RechargeAmountLimit,
+        # -------- http status code -----------
+        401: AuthorizationError,
+        429: DuplicateReference,
+        # -------------------------------------
+        800: TransactionNotFound,
+    }
+
     def __init__(self, response: Munch, is_429_401: int = None):
         self.response = response
         self.is_429_401 = is_429_401
@@ -22,55 +46,44 @@ class ApiExceptionHandler:
     def __process_response(self):
         # process api response for exceptions
         # raise exception if any is found
-        _msg = self.__message_getter()
-
-        if hasattr(self.response, "ReplyCode"):
-            if int(self.response.ReplyCode) != 2:
-                raise self.__switcher(_msg).get(
-                    int(self.response.ReplyCode), HotRechargeException(_msg, self.response)
-                )
-
-        if self.is_429_401:
-            raise self.__switcher(_msg).get(self.is_429_401, HotRechargeException(_msg, self.response))
-
-        else:
-            # raise default error
-            raise HotRechargeException(_msg, self.response)
-
-    def __switcher(self, message: str) -> dict:
-        api_exception_mapper = {
-            4: PendingZesaTransaction(message, self.response),
-            206: PrepaidPlatformFail(message, self.response),
-            208: InsufficientBalance(message, self.response),
-            209: OutOfPinStock(message, self.response),
-            210: PrepaidPlatformFail(message, self.response),
-            216: DuplicateRequestException(message, self.response),
-            217: InvalidContact(message, self.response),
-            218: AuthorizationError(message, self.response),
-            219: WebServiceException(message, self.response),
-            220: AuthorizationError(message, self.response),
-            221: BalanceRequestError(message, self.response),
-            222: RechargeAmountLimit(message, self.response),
-            # -------- http status code -----------
-            401: AuthorizationError(message, self.response),
-            429: DuplicateReference(message, self.response),
-            # -------------------------------------
-            800: TransactionNotFound(message, self.response),
-        }
-
-        return api_exception_mapper
-
-    def __message_getter(self) -> str:
-        # get appropriate message from api response
+        raise self.classify(self.response, self.is_429_401) or HotRechargeException(
+            self.message(self.response), self.response
+        )
+
+    @classmethod
+    def classify(cls, response, status_code: int = None) -> HotRechargeException or None:
+        """
+        map an api response to its exception without raising it, so bulk pipelines can record failures cheaply
+        :param response: api response, dict or Munch
+        :param status_code: http status code, 401 and 429 are mapped when the response has no reply code
+        :return: exception instance, or None when the response is successful
+
+        >>> error = ApiExceptionHandler.classify(response)
+        >>> if error is not None:
+                failures[type(error).__name__] += 1
+        """
+        reply_code = response.get("ReplyCode") if isinstance(response, dict) else None
 
-        if hasattr(self.response, "Message"):
-            return self.response.Message
+        if reply_code is not None:
+            reply_code = int(reply_code)
 
-        if hasattr(self.response, "ReplyMessage"):
-            return self.response.ReplyMessage
+            if reply_code == 2 and status_code not in (401, 429):
+                return None
 
-        if hasattr(self.response, "ReplyMsg"):
-            return self.response.ReplyMsg
+            if reply_code != 2:
+                return cls.EXCEPTIONS.get(reply_code, HotRechargeException)(cls.message(response), response)
+
+        if status_code in (401, 429):
+            return cls.EXCEPTIONS[status_code](cls.message(response), response)
+
+        return HotRechargeException(cls.message(response), response)
+
+    @staticmethod
+    def message(response) -> str:
+        # get appropriate message from api response
+        if isinstance(response, dict):
+            for key in ("Message", "ReplyMessage", "ReplyMsg"):
+                if key in response:
+                    return response[key]
 
-        else:
-            return self.response.toDict().__str__
+        return str(response)
@@ -159,3 +159,52 @@ class TransactionNotFound(HotRechargeException):
     """
 
     pass
+
+
+class InvalidProductCode(HotRechargeException):
+    """InvalidProductCode Exception
+
+    data bundle product code is not in the bundle catalog, raised locally before calling the api
+    """
+
+    pass
+
+
+class RateLimitExceeded(HotRechargeException):
+    """RateLimitExceeded Exception
+
+    client side rate limiter would have to wait longer than its `max_wait` for a free slot, request not sent
+    """
+
+    pass
+
+
+class TransactionStateUnknown(HotRechargeException):
+    """TransactionStateUnknown Exception
+
+    a recharge failed mid-flight and its outcome could not be established, the customer may or may not
+    have been recharged. reconcile later with `api.queryTransactionReference(err.reference)`, do not resend blindly
+    """
+
+    def __init__(self, message, response: Munch = None, reference: str = None):
+        super().__init__(message, response)
+        self.reference = reference
+
+
+class RequestTimeout(HotRechargeException):
+    """RequestTimeout Exception
+
+    the api did not connect or answer within the configured timeouts, or the call deadline ran out.
+    a timed out recharge may still have gone through, reconcile with `api.queryTransactionReference(reference)`
+    """
+
+    pass
+
+
+class IdempotencyConflict(HotRechargeException):
+    """IdempotencyConflict Exception
+
+    an order key was used again for a different recharge (endpoint or payload), raised locally before calling the api
+    """
+
+    pass
@@ -1,7 +1,39 @@
 #  __init__.py
 from hotrecharge import *
 from .HotRecharge import HotRecharge, HRAuthConfig
+from .AsyncHotRecharge import AsyncHotRecharge
+from .HRBulk import BulkResult
+from .HRCache import CatalogCache, LRUTTLCache
+from .HRCatalog import BundleCatalog
+from .HRStock import EVDStockLedger
+from .HRBalance import BalanceTracker, CachedBalance
+from .HRCodec import JsonCodec, StdlibJsonCodec, OrjsonCodec, UjsonCodec
+from .HRRateLimiter import RateLimiter, TokenBucket
+from .HRRetry import RetryPolicy
+from .HRMetrics import ClientMetrics
+from .HRHooks import RequestHooks, RequestEvent, OpenTelemetryHooks
+from .HRJournal import TransactionJournal, FileJournal, SQLiteJournal, JournalEntry
+from .HRIdempotency import IdempotencyGuard, IdempotencyStore, SQLiteIdempotencyStore
+from .HRReconcile import ReconciliationRunner
+from .HRZesaPoller import PendingZesaPoller
+from .HRFakeServer import FakeHotServer, fixedLatency, uniformLatency, lognormalLatency
+from .HRModels import (
+    ResponseModel,
+    ApiResponse,
+    WalletBalanceResponse,
+    RechargeResponse,
+    BundlesResponse,
+    Bundle,
+    EVDsResponse,
+    EVDStock,
+    ZesaRechargeResponse,
+    ZesaToken,
+    ZesaCustomerResponse,
+    CustomerInfo,
+)
+from .HRReference import ReferenceGenerator, MonotonicReferenceGenerator, UUIDChunkReferenceGenerator
 from .HotRechargeException import *
+from .HotRechargeExcHandler import ApiExceptionHandler
 
 __author__ = "Donald Chinhuru"
 __version__ = "4.0.0"
@@ -15,6 +15,11 @@ setuptools.setup(
     license="MIT",
     packages=setuptools.find_packages(),
     install_requires=["munch", "requests", "pyopenssl"],
+    extras_require={
+        "async": ["aiohttp"],
+        "speedups": ["orjson"],
+        "tracing": ["opentelemetry-api"],
+    },
     classifiers=[
         "License :: OSI Approved :: MIT License",
         "Programming Language :: Python :: 3",
@@ -0,0 +1,50 @@
+import threading
+import time
+
+import hotrecharge
+
+
+def test_invalidate_during_slow_load_drops_the_loaded_value():
+    cache = hotrecharge.CatalogCache(ttl=60)
+    started = threading.Event()
+    prices = ["old prices", "new prices"]
+
+    def slowLoader():
+        value = prices.pop(0)
+        started.set()
+        time.sleep(0.2)
+        return value
+
+    loaded = []
+    loading = threading.Thread(target=lambda: loaded.append(cache.get("bundles", slowLoader)))
+    loading.start()
+
+    started.wait()
+    cache.invalidate()
+    loading.join()
+
+    assert loaded == ["old prices"]
+    assert cache.get("bundles", slowLoader) == "new prices"
+
+
+def test_invalidate_during_background_refresh_drops_the_refreshed_value():
+    cache = hotrecharge.CatalogCache(ttl=0.05, stale_ttl=60)
+    started = threading.Event()
+    prices = ["old prices", "refreshed prices", "new prices"]
+
+    def slowLoader():
+        value = prices.pop(0)
+        started.set()
+        time.sleep(0.2)
+        return value
+
+    assert cache.get("bundles", lambda: prices.pop(0)) == "old prices"
+    time.sleep(0.1)
+
+    # stale, served while refreshed in the background
+    assert cache.get("bundles", slowLoader) == "old prices"
+    started.wait()
+    cache.invalidate()
+    time.sleep(0.3)
+
+    assert cache.get("bundles", slowLoader) == "new prices"
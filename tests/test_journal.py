@@ -0,0 +1,27 @@
+import hotrecharge
+
+
+CONFIG = hotrecharge.HRAuthConfig(access_code="agent", access_password="secret", reference="ref")
+
+
+def test_recover_keeps_entry_pending_when_query_fails(tmp_path):
+    with hotrecharge.FakeHotServer() as server:
+        api = hotrecharge.HotRecharge(CONFIG, base_url=server.url)
+        api.rechargePinless(amount=1, number="0771111111", reference="paid-ref")
+
+        # the process died after sending, before journaling the outcome
+        journal = hotrecharge.FileJournal(str(tmp_path / "recharges.journal"), fsync_interval=None)
+        journal.started(api._RECHARGE_PINLESS, "paid-ref", {"amount": 1, "targetMobile": "0771111111"})
+
+        server.injectError(219, endpoint="queryTransactionReference")
+        counts = journal.recover(api)
+
+        assert counts["unresolved"] == 1 and counts["failed"] == 0
+        assert [entry.reference for entry in journal.pending()] == ["paid-ref"]
+        assert journal.pending()[0].status == "sent"
+
+        # the next recovery settles it from the original transaction
+        assert journal.recover(api)["ok"] == 1
+        assert journal.pending() == []
+
+        journal.close()